@@ -0,0 +1,76 @@
+"""
+Concurrency benchmark: fires the same GET at increasing numbers of
+in-flight requests against a running server and reports throughput.
+
+    uvicorn main:app --port 8000
+    python bench/bench_concurrency.py --url "http://127.0.0.1:8000/search/?q=ram" --requests 400
+
+With blocking calls on the event loop throughput stays flat as concurrency
+grows; with them offloaded it should scale until the thread / DB pool is
+saturated.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run_level(client, url, total, concurrency):
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                r = await client.get(url)
+                if r.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def main(url, total, levels):
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        await client.get(url)  # warm up
+        print(f"{'in-flight':>9} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+        for level in levels:
+            r = await run_level(client, url, total, level)
+            print(
+                f"{r['concurrency']:>9} {r['rps']:>9.1f} {r['p50_ms']:>9.1f} "
+                f"{r['p95_ms']:>9.1f} {r['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput vs in-flight requests")
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--requests", type=int, default=200, help="requests per concurrency level")
+    parser.add_argument("--levels", default="1,2,4,8,16,32")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.requests, [int(x) for x in args.levels.split(",")]))
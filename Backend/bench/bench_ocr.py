@@ -0,0 +1,236 @@
+"""
+OCR benchmark: per-page latency and accuracy of the OCR fast path
+(rescale / binarize / crop) against plain full-resolution Tesseract, plus
+page-parallel vs sequential time for one multi-page TIFF.
+
+    python bench/bench_ocr.py --samples path/to/forms      # form.png + form.txt ground-truth pairs
+    python bench/bench_ocr.py --synthetic 8 --dpi 600       # generated FRA claim forms
+    python bench/bench_ocr.py --samples forms --save base.json
+    python bench/bench_ocr.py --samples forms --compare base.json   # exit 1 on an accuracy regression
+
+Accuracy is character similarity to the ground truth and the share of form
+fields fallback_extract() reads the same as from the ground truth.
+"""
+import argparse
+import difflib
+import io
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import ocr_utils  # noqa: E402
+from utils.llm_utils import fallback_extract  # noqa: E402
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp")
+
+SYNTHETIC_VALUES = {
+    "Claimant Name": ["Ram Kumar", "Sita Devi", "Budhu Oraon", "Lakhi Munda", "Mangal Soren"],
+    "Father Name": ["Shyam Lal", "Birsa Munda", "Hari Oraon", "Sukra Soren"],
+    "Age": ["34", "45", "52", "61", "67"],
+    "Gender": ["Male", "Female"],
+    "Village": ["Bhimganga", "Koraput", "Mandla", "Jashpur", "Simdega"],
+    "Block": ["Lamtaput", "Nainpur", "Bagicha", "Kolebira"],
+    "District": ["Koraput", "Mandla", "Jashpur", "Simdega"],
+    "State": ["Odisha", "Madhya Pradesh", "Chhattisgarh", "Jharkhand"],
+    "Total Area Claimed": ["1.5 acres", "2.5 acres", "0.8 ha", "3 acres"],
+    "Coordinates": ["18.8135, 82.7123", "22.5970, 80.3714", "22.8866, 84.1409"],
+    "Land Use": ["Agriculture", "Homestead", "Grazing", "Minor Forest Produce"],
+    "Claim ID": ["FRA-OD-00231", "FRA-MP-01877", "FRA-CG-00452", "FRA-JH-00919"],
+    "Date of Application": ["12/03/2021", "05/11/2022", "28/07/2020"],
+    "Type of Claim": ["Individual", "Community"],
+}
+
+
+# -------------------------
+# Samples
+# -------------------------
+def load_samples(directory):
+    samples = []
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        truth_path = os.path.join(directory, stem + ".txt")
+        if ext.lower() not in IMAGE_EXTENSIONS or not os.path.exists(truth_path):
+            continue
+        with open(os.path.join(directory, name), "rb") as f:
+            image_bytes = f.read()
+        with open(truth_path, encoding="utf-8") as f:
+            samples.append((name, image_bytes, f.read()))
+    return samples
+
+
+def _font(size, path=None):
+    for candidate in filter(None, [path, "DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf"]):
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    return None
+
+
+def synthetic_form(rng, dpi, font_path=None):
+    """An A4 scan-like claim form at dpi, with its ground-truth text."""
+    lines = ["FOREST RIGHTS ACT - CLAIM FORM"]
+    lines += [f"{field}: {rng.choice(values)}" for field, values in SYNTHETIC_VALUES.items()]
+    truth = "\n".join(lines)
+
+    width, height = int(8.27 * dpi), int(11.69 * dpi)
+    font = _font(int(12 / 72 * dpi), font_path)
+    if font is None:
+        # no TrueType font: draw with the bitmap font at 1/6 scale and blow it up
+        small = Image.new("L", (width // 6, height // 6), 240)
+        draw = ImageDraw.Draw(small)
+        for i, line in enumerate(lines):
+            draw.text((width // 60, height // 60 + i * 14), line, fill=25)
+        page = small.resize((width, height), Image.NEAREST)
+    else:
+        page = Image.new("L", (width, height), 240)
+        draw = ImageDraw.Draw(page)
+        step = int(0.3 * dpi)
+        for i, line in enumerate(lines):
+            draw.text((int(1.0 * dpi), int(1.2 * dpi) + i * step), line, fill=25, font=font)
+
+    # scanner shadow along one edge plus speckle noise
+    pixels = np.asarray(page).copy()
+    pixels[:, : max(1, dpi // 20)] = 10
+    noise = np.random.default_rng(rng.getrandbits(32)).random(pixels.shape) < 0.002
+    pixels[noise] = 60
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, "PNG", dpi=(dpi, dpi))
+    return buf.getvalue(), truth
+
+
+# -------------------------
+# Measurements
+# -------------------------
+def _normalize(text):
+    return " ".join(text.split()).lower()
+
+
+def char_accuracy(ocr_text, truth):
+    return difflib.SequenceMatcher(None, _normalize(ocr_text), _normalize(truth)).ratio()
+
+
+def field_accuracy(ocr_text, truth):
+    expected = {k: _normalize(v) for k, v in fallback_extract({}, truth).items() if v}
+    if not expected:
+        return None
+    got = {k: _normalize(v) for k, v in fallback_extract({}, ocr_text).items() if v}
+    return sum(got.get(k) == v for k, v in expected.items()) / len(expected)
+
+
+def run_mode(samples, preprocess):
+    latencies, chars, fields = [], [], []
+    for _, image_bytes, truth in samples:
+        for index in range(ocr_utils.page_count(image_bytes)):
+            started = time.perf_counter()
+            text = ocr_utils.ocr_pages(image_bytes, [index], preprocess=preprocess)[0]
+            latencies.append(time.perf_counter() - started)
+        text = ocr_utils.extract_text_from_file(image_bytes, preprocess=preprocess)
+        chars.append(char_accuracy(text, truth))
+        f = field_accuracy(text, truth)
+        if f is not None:
+            fields.append(f)
+
+    latencies.sort()
+    return {
+        "pages": len(latencies),
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[math.ceil(len(latencies) * 0.95) - 1] * 1000,
+        "char_accuracy": statistics.mean(chars),
+        "field_accuracy": statistics.mean(fields) if fields else None,
+    }
+
+
+def run_multipage(samples):
+    pages = [ocr_utils.load_page(image_bytes, 0).convert("L") for _, image_bytes, _ in samples]
+    buf = io.BytesIO()
+    pages[0].save(buf, "TIFF", save_all=True, append_images=pages[1:], compression="tiff_lzw")
+    tiff = buf.getvalue()
+
+    started = time.perf_counter()
+    ocr_utils.extract_text_from_file(tiff)
+    sequential = time.perf_counter() - started
+
+    ocr_utils.ocr_document(tiff)  # warm up the worker processes
+    started = time.perf_counter()
+    ocr_utils.ocr_document(tiff)
+    parallel = time.perf_counter() - started
+    return {"pages": len(pages), "workers": ocr_utils.OCR_WORKERS,
+            "sequential_s": sequential, "parallel_s": parallel}
+
+
+def main(args):
+    if not ocr_utils.TESSERACT_CMD:
+        sys.exit("Tesseract not found; install it or set TESSERACT_CMD")
+
+    if args.samples:
+        samples = load_samples(args.samples)
+    else:
+        rng = random.Random(args.seed)
+        samples = []
+        for i in range(args.synthetic):
+            image_bytes, truth = synthetic_form(rng, args.dpi, args.font)
+            samples.append((f"synthetic-{i}.png", image_bytes, truth))
+    if not samples:
+        sys.exit("no samples (need image + .txt ground-truth pairs)")
+
+    results = {}
+    print(f"{'mode':>5} {'pages':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'chars':>7} {'fields':>7}")
+    for mode, preprocess in (("raw", False), ("fast", True)):
+        r = results[mode] = run_mode(samples, preprocess)
+        fields = f"{r['field_accuracy']:.3f}" if r["field_accuracy"] is not None else "-"
+        print(
+            f"{mode:>5} {r['pages']:>6} {r['mean_ms']:>9.1f} {r['p50_ms']:>9.1f} "
+            f"{r['p95_ms']:>9.1f} {r['char_accuracy']:>7.3f} {fields:>7}"
+        )
+    print(f"fast path speedup: {results['raw']['mean_ms'] / results['fast']['mean_ms']:.2f}x per page")
+
+    if len(samples) > 1:
+        m = results["multipage"] = run_multipage(samples)
+        print(
+            f"{m['pages']}-page TIFF: sequential {m['sequential_s']:.2f}s, "
+            f"parallel {m['parallel_s']:.2f}s on {m['workers']} workers "
+            f"({m['sequential_s'] / m['parallel_s']:.2f}x)"
+        )
+    ocr_utils.shutdown_ocr_pool()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["fast"]
+        fast = results["fast"]
+        print(
+            f"vs baseline: mean {fast['mean_ms'] - baseline['mean_ms']:+.1f} ms, "
+            f"chars {fast['char_accuracy'] - baseline['char_accuracy']:+.3f}"
+        )
+        drops = [fast["char_accuracy"] < baseline["char_accuracy"] - args.max_accuracy_drop]
+        if fast["field_accuracy"] is not None and baseline.get("field_accuracy") is not None:
+            drops.append(fast["field_accuracy"] < baseline["field_accuracy"] - args.max_accuracy_drop)
+        if any(drops):
+            sys.exit("accuracy regression against baseline")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OCR per-page latency and accuracy")
+    parser.add_argument("--samples", help="directory of form images with .txt ground truth")
+    parser.add_argument("--synthetic", type=int, default=8, help="generated forms when --samples is not given")
+    parser.add_argument("--dpi", type=int, default=600, help="resolution of generated forms")
+    parser.add_argument("--font", help="TrueType font for generated forms")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", help="write results as JSON (a baseline for --compare)")
+    parser.add_argument("--compare", help="baseline JSON from --save")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.01)
+    main(parser.parse_args())
@@ -0,0 +1,99 @@
+"""
+Backfill typed age_years / area_acres columns for existing fra_documents rows.
+
+Resumable: progress is checkpointed in job_checkpoints after each batch,
+in the same transaction as the updates, so a killed run continues where
+it stopped. When done, schemes are flagged for re-materialization so
+claim_scheme_eligibility is recomputed from the typed columns.
+
+    python -m jobs.backfill_units [--batch-size 1000] [--restart]
+"""
+import argparse
+from sqlalchemy import text
+
+from db import engine
+from utils.units import unit_columns
+
+JOB_NAME = "backfill_units"
+
+
+def get_checkpoint(conn) -> int:
+    row = conn.execute(
+        text("SELECT last_id FROM job_checkpoints WHERE job_name = :job"),
+        {"job": JOB_NAME},
+    ).first()
+    return row[0] if row else 0
+
+
+def save_checkpoint(conn, last_id: int):
+    conn.execute(
+        text("""
+            INSERT INTO job_checkpoints (job_name, last_id, updated_at)
+            VALUES (:job, :last_id, now())
+            ON CONFLICT (job_name)
+            DO UPDATE SET last_id = EXCLUDED.last_id, updated_at = now()
+        """),
+        {"job": JOB_NAME, "last_id": last_id},
+    )
+
+
+def run(batch_size: int = 1000, restart: bool = False):
+    with engine.begin() as conn:
+        if restart:
+            save_checkpoint(conn, 0)
+        last_id = get_checkpoint(conn)
+
+    select_sql = text("""
+        SELECT id, age, total_area_claimed
+        FROM fra_documents
+        WHERE id > :last_id
+        ORDER BY id
+        LIMIT :batch_size
+    """)
+    update_sql = text("""
+        UPDATE fra_documents
+        SET age_years = :age_years, area_acres = :area_acres
+        WHERE id = :id
+          -- rows already right are left alone, so their change_txid (delta sync) is kept
+          AND (age_years, area_acres) IS DISTINCT FROM
+              (CAST(:age_years AS INTEGER), CAST(:area_acres AS DOUBLE PRECISION))
+    """)
+
+    scanned = with_age = with_area = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select_sql, {"last_id": last_id, "batch_size": batch_size}
+            ).all()
+            if not rows:
+                break
+
+            updates = []
+            for doc_id, age, total_area_claimed in rows:
+                cols = unit_columns(age, total_area_claimed)
+                cols["id"] = doc_id
+                updates.append(cols)
+                with_age += cols["age_years"] is not None
+                with_area += cols["area_acres"] is not None
+
+            conn.execute(update_sql, updates)
+            last_id = rows[-1][0]
+            save_checkpoint(conn, last_id)
+
+        scanned += len(rows)
+        print(f"… {scanned} rows scanned, {with_age} with age, {with_area} with area (last id {last_id})")
+
+    # eligibility was evaluated against the old text parsing; redo it lazily
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE schemes SET eligibility_materialized_at = NULL"))
+
+    print(f"✅ Unit backfill done: {scanned} scanned, {with_age} with age, {with_area} with area")
+    return scanned, with_age, with_area
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    args = parser.parse_args()
+    run(batch_size=args.batch_size, restart=args.restart)
@@ -0,0 +1,32 @@
+"""
+Run background ingestion workers outside the API process.
+
+Claims jobs queued by POST /upload/jobs from the ingest_jobs table, so
+any number of these can run next to (or instead of, with INGEST_WORKERS=0)
+the in-process workers. The API picks up documents stored here through
+its cache refresh loops (see INGEST_WORKERS).
+
+    python -m jobs.ingest_worker [--workers 4]
+"""
+import argparse
+import asyncio
+
+from services.ingest_job_service import INGEST_WORKERS, run_ingest_worker
+from utils.ocr_utils import shutdown_ocr_pool
+
+
+async def main(workers: int):
+    await asyncio.gather(*(run_ingest_worker() for _ in range(workers)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=max(INGEST_WORKERS, 1))
+    args = parser.parse_args()
+    print(f"✅ Ingest worker started ({args.workers} concurrent jobs)")
+    try:
+        asyncio.run(main(args.workers))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_ocr_pool()
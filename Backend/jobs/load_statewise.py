@@ -0,0 +1,22 @@
+"""
+Reload fra_statewise_claims from the state-wise FRA statistics CSV.
+
+NA/NR placeholders become NULL. Rows are COPYed into a staging table and
+swapped in (or upserted) in one transaction, so the dashboard never sees
+a half-loaded table.
+
+    python -m jobs.load_statewise [--file data/fra_all_states.csv] [--mode replace|upsert]
+"""
+import argparse
+
+from services.csv_loader import LOAD_MODES, STATEWISE_CSV, load_statewise_csv
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--file", default=STATEWISE_CSV)
+    parser.add_argument("--mode", choices=LOAD_MODES, default="replace")
+    args = parser.parse_args()
+    stats = load_statewise_csv(path=args.file, mode=args.mode)
+    print(f"✅ Loaded {stats['rows']} rows into {stats['table']} ({stats['mode']}, "
+          f"{stats['nulls']} NA/NR -> NULL) in {stats['seconds']}s")
@@ -0,0 +1,19 @@
+"""
+Rebuild claim_rollups from every fra_documents row.
+
+Run once after migration 006 to seed the rollups; afterwards uploads keep
+them current incrementally.
+
+    python -m jobs.rebuild_rollups
+"""
+import argparse
+
+from services.rollup_service import rebuild_rollups
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows read per round trip")
+    args = parser.parse_args()
+    n = rebuild_rollups(chunk_size=args.chunk_size)
+    print(f"✅ claim_rollups rebuilt: {n} rollup rows")
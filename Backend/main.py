@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
+import os
+from anyio import to_thread
 from routers.dashboard_router import router as dashboard_router
 
 
@@ -11,9 +13,23 @@ from routers.upload_router import router as upload_router
 # from routers.model_pred import router as model_pred
 from routers.Search_router import router as Search
 from routers.atlas_router import router as atlas_router
+from routers.metrics_router import router as metrics_router
+from routers.admin_router import router as admin_router
+from db import apply_migrations
+from services.suggest_service import load_suggest_index, run_suggest_refresh_loop
+from services.dss_log_service import flush_dss_logs, run_dss_log_writer
+from services.dss_cache_service import run_dss_cache_refresh_loop
+from services.scheme_registry import load_scheme_registry, run_scheme_registry_refresh_loop
+from services.gazetteer_service import load_gazetteer, run_gazetteer_refresh_loop
+from services.ingest_job_service import INGEST_WORKERS, run_ingest_worker
+from utils.ocr_utils import shutdown_ocr_pool
 
 app = FastAPI()
 
+# Sync (def) routes and streamed responses run on this bounded thread pool;
+# keep it in line with DB_POOL_SIZE + DB_MAX_OVERFLOW (see db.py).
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+
 # ✅ Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -31,13 +47,39 @@ app.include_router(upload_router)
 # app.include_router(model_pred)
 app.include_router(Search)
 app.include_router(atlas_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
+
+background_tasks = []
+
+
+# ✅ Bring the schema up to date and warm in-memory indexes before serving requests
+@app.on_event("startup")
+async def startup_event():
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    apply_migrations()
+    load_suggest_index()
+    load_scheme_registry()
+    load_gazetteer()
+    background_tasks.append(asyncio.create_task(run_suggest_refresh_loop()))
+    background_tasks.append(asyncio.create_task(run_scheme_registry_refresh_loop()))
+    background_tasks.append(asyncio.create_task(run_gazetteer_refresh_loop()))
+    background_tasks.append(asyncio.create_task(run_dss_log_writer()))
+    background_tasks.append(asyncio.create_task(run_dss_cache_refresh_loop()))
+    for _ in range(INGEST_WORKERS):
+        background_tasks.append(asyncio.create_task(run_ingest_worker()))
+
 
 # ✅ Graceful shutdown handler (prevents noisy CancelledError logs)
 @app.on_event("shutdown")
 async def shutdown_event():
     try:
-        # Example: close DB connections, flush cache, etc.
+        for task in background_tasks:
+            task.cancel()
         await asyncio.sleep(0)
+        # write out search logs still queued in memory
+        flush_dss_logs()
+        shutdown_ocr_pool()
     except asyncio.CancelledError:
         # Suppress cancellation errors during shutdown
         pass
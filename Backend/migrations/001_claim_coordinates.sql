@@ -0,0 +1,19 @@
+-- Typed coordinates parsed once at ingest (see utils/geo_utils.normalize_coordinates)
+ALTER TABLE fra_documents ADD COLUMN IF NOT EXISTS lat DOUBLE PRECISION;
+ALTER TABLE fra_documents ADD COLUMN IF NOT EXISTS lon DOUBLE PRECISION;
+ALTER TABLE fra_documents ADD COLUMN IF NOT EXISTS geohash VARCHAR(12);
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_lat_lon
+    ON fra_documents (lat, lon)
+    WHERE lat IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_geohash
+    ON fra_documents (geohash text_pattern_ops)
+    WHERE geohash IS NOT NULL;
+
+-- Progress of resumable batch jobs (jobs/*.py)
+CREATE TABLE IF NOT EXISTS job_checkpoints (
+    job_name   TEXT PRIMARY KEY,
+    last_id    BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
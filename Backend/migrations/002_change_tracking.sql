@@ -0,0 +1,64 @@
+-- Per-table change counter backing ETag / Last-Modified
+CREATE TABLE IF NOT EXISTS table_changes (
+    table_name TEXT PRIMARY KEY,
+    version    BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO table_changes (table_name) VALUES ('fra_documents')
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_changes (table_name, version, changed_at)
+    VALUES (TG_TABLE_NAME, 1, now())
+    ON CONFLICT (table_name)
+    DO UPDATE SET version = table_changes.version + 1, changed_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Row-level change stamps for delta sync. change_txid is the writing
+-- transaction id, so a "since" watermark taken from the snapshot xmin never
+-- skips rows committed out of order.
+ALTER TABLE fra_documents ADD COLUMN IF NOT EXISTS change_txid BIGINT;
+ALTER TABLE fra_documents ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+
+UPDATE fra_documents SET change_txid = txid_current() WHERE change_txid IS NULL;
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_change_txid
+    ON fra_documents (change_txid);
+
+CREATE TABLE IF NOT EXISTS fra_documents_tombstones (
+    id          BIGINT PRIMARY KEY,
+    change_txid BIGINT NOT NULL,
+    deleted_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_tombstones_change_txid
+    ON fra_documents_tombstones (change_txid);
+
+CREATE OR REPLACE FUNCTION fra_documents_track_row() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO fra_documents_tombstones (id, change_txid)
+        VALUES (OLD.id, txid_current())
+        ON CONFLICT (id)
+        DO UPDATE SET change_txid = EXCLUDED.change_txid, deleted_at = now();
+        RETURN OLD;
+    END IF;
+    NEW.change_txid := txid_current();
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS fra_documents_track_row ON fra_documents;
+CREATE TRIGGER fra_documents_track_row
+    BEFORE INSERT OR UPDATE OR DELETE ON fra_documents
+    FOR EACH ROW EXECUTE FUNCTION fra_documents_track_row();
+
+DROP TRIGGER IF EXISTS fra_documents_bump_version ON fra_documents;
+CREATE TRIGGER fra_documents_bump_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON fra_documents
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
@@ -0,0 +1,3 @@
+-- Keyset pagination of /upload/all (ORDER BY created_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS ix_fra_documents_created_at_id
+    ON fra_documents (created_at, id);
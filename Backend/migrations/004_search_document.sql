@@ -0,0 +1,28 @@
+-- Maintained search document per claim for /search (trigram + full-text)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE fra_documents ADD COLUMN IF NOT EXISTS search_text TEXT
+    GENERATED ALWAYS AS (
+        lower(
+            coalesce(patta_holder_name, '') || ' ' ||
+            coalesce(village_name, '') || ' ' ||
+            coalesce(district, '') || ' ' ||
+            coalesce(state, '') || ' ' ||
+            coalesce(claim_id, '')
+        )
+    ) STORED;
+
+ALTER TABLE fra_documents ADD COLUMN IF NOT EXISTS search_tsv TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(claim_id, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(patta_holder_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(village_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(district, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(state, '')), 'D')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_search_trgm
+    ON fra_documents USING gin (search_text gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_search_tsv
+    ON fra_documents USING gin (search_tsv);
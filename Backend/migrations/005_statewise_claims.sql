@@ -0,0 +1,17 @@
+-- State-wise FRA statistics (data/fra_all_states.csv), reloaded by services/csv_loader.py
+CREATE TABLE IF NOT EXISTS fra_statewise_claims (
+    state_name            TEXT,
+    claims_individual     BIGINT,
+    claims_community      BIGINT,
+    claims_total          BIGINT,
+    titles_individual     BIGINT,
+    titles_community      BIGINT,
+    titles_total          BIGINT,
+    land_individual_acres NUMERIC,
+    land_community_acres  NUMERIC,
+    land_total_acres      NUMERIC
+);
+
+-- Upsert loads match staged rows on state_name
+CREATE INDEX IF NOT EXISTS ix_fra_statewise_claims_state_name
+    ON fra_statewise_claims (state_name);
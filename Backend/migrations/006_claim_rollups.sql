@@ -0,0 +1,18 @@
+-- Claim counts / acres per state, district, village and day, broken down by
+-- status, claim_type and land_use. Maintained on insert by services/rollup_service.py;
+-- seed or rebuild with `python -m jobs.rebuild_rollups`.
+CREATE TABLE IF NOT EXISTS claim_rollups (
+    state        TEXT    NOT NULL DEFAULT '',
+    district     TEXT    NOT NULL DEFAULT '',
+    village_name TEXT    NOT NULL DEFAULT '',
+    day          DATE    NOT NULL,
+    status       TEXT    NOT NULL DEFAULT '',
+    claim_type   TEXT    NOT NULL DEFAULT '',
+    land_use     TEXT    NOT NULL DEFAULT '',
+    claims       BIGINT  NOT NULL DEFAULT 0,
+    total_acres  NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (state, district, village_name, day, status, claim_type, land_use)
+);
+
+-- Date-range queries across all locations
+CREATE INDEX IF NOT EXISTS ix_claim_rollups_day ON claim_rollups (day);
@@ -0,0 +1,29 @@
+-- Expression indexes for eligibility predicates compiled by
+-- services/scheme_service.compile_eligibility, matching the SQL it emitted
+-- when this migration was written. The gender index still matches
+-- GENDER_SQL there. 010 replaces the age and acreage indexes with indexes
+-- on the typed age_years / area_acres columns.
+CREATE INDEX IF NOT EXISTS ix_fra_documents_elig_state
+    ON fra_documents (lower(state));
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_elig_age
+    ON fra_documents (((substring(age::text from '[0-9]+'))::numeric));
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_elig_gender
+    ON fra_documents ((CASE
+        WHEN lower(btrim(coalesce(gender, ''), E' \t\r\n')) LIKE 'm%' THEN 'male'
+        WHEN lower(btrim(coalesce(gender, ''), E' \t\r\n')) LIKE 'f%' THEN 'female'
+        WHEN lower(btrim(coalesce(gender, ''), E' \t\r\n')) LIKE 'o%' THEN 'other'
+        ELSE lower(btrim(coalesce(gender, ''), E' \t\r\n'))
+    END));
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_elig_acres
+    ON fra_documents ((CASE
+        WHEN substring(total_area_claimed from '[0-9.]+') ~ '^([0-9]+\.?[0-9]*|\.[0-9]+)$'
+        THEN substring(total_area_claimed from '[0-9.]+')::numeric
+        ELSE 0
+    END));
+
+-- land_use ILIKE '%...%'
+CREATE INDEX IF NOT EXISTS ix_fra_documents_elig_land_use_trgm
+    ON fra_documents USING gin (land_use gin_trgm_ops);
@@ -0,0 +1,12 @@
+-- Which claims each scheme applies to, maintained by services/eligibility_service.py
+CREATE TABLE IF NOT EXISTS claim_scheme_eligibility (
+    scheme_id INT NOT NULL REFERENCES schemes (id) ON DELETE CASCADE,
+    doc_id    INT NOT NULL REFERENCES fra_documents (id) ON DELETE CASCADE,
+    PRIMARY KEY (scheme_id, doc_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_claim_scheme_eligibility_doc
+    ON claim_scheme_eligibility (doc_id);
+
+-- NULL until the scheme has been evaluated against every claim
+ALTER TABLE schemes ADD COLUMN IF NOT EXISTS eligibility_materialized_at TIMESTAMPTZ;
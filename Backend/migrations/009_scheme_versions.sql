@@ -0,0 +1,8 @@
+-- Version counter for schemes, polled by the in-process scheme registry
+INSERT INTO table_changes (table_name) VALUES ('schemes')
+ON CONFLICT (table_name) DO NOTHING;
+
+DROP TRIGGER IF EXISTS schemes_bump_version ON schemes;
+CREATE TRIGGER schemes_bump_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON schemes
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
@@ -0,0 +1,14 @@
+-- Typed age / area parsed once at ingest (see utils/units.unit_columns).
+-- Existing rows: run python -m jobs.backfill_units after this migration.
+ALTER TABLE fra_documents ADD COLUMN IF NOT EXISTS age_years INTEGER;
+ALTER TABLE fra_documents ADD COLUMN IF NOT EXISTS area_acres DOUBLE PRECISION;
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_age_years
+    ON fra_documents (age_years);
+
+CREATE INDEX IF NOT EXISTS ix_fra_documents_area_acres
+    ON fra_documents (area_acres);
+
+-- the eligibility compiler no longer re-parses the text columns
+DROP INDEX IF EXISTS ix_fra_documents_elig_age;
+DROP INDEX IF EXISTS ix_fra_documents_elig_acres;
@@ -0,0 +1,20 @@
+-- Background ingestion queue (services/ingest_job_service.py). Uploaded
+-- files wait in the spool directory; workers claim rows with SKIP LOCKED.
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id          BIGSERIAL PRIMARY KEY,
+    filename    TEXT        NOT NULL,
+    spool_path  TEXT        NOT NULL,
+    status      TEXT        NOT NULL DEFAULT 'queued',   -- queued | running | done | duplicate | failed (see 014)
+    attempts    INTEGER     NOT NULL DEFAULT 0,
+    run_after   TIMESTAMPTZ NOT NULL DEFAULT now(),      -- retry backoff
+    doc_id      INTEGER     REFERENCES fra_documents (id) ON DELETE SET NULL,
+    error       TEXT,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at  TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+-- claim / queue-depth lookups only ever touch unfinished jobs
+CREATE INDEX IF NOT EXISTS ix_ingest_jobs_pending
+    ON ingest_jobs (status, run_after)
+    WHERE status IN ('queued', 'running');
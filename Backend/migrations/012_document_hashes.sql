@@ -0,0 +1,14 @@
+-- Content-hash cache of uploaded scans (services/ingest_service.py): a
+-- re-upload of the same bytes skips OCR, extraction and geocoding.
+CREATE TABLE IF NOT EXISTS document_hashes (
+    content_hash TEXT        PRIMARY KEY,              -- xxh3-128 hex of the uploaded bytes
+    ocr_text     TEXT        NOT NULL,
+    fields       JSONB       NOT NULL,                 -- clean_with_llm output
+    doc_id       INTEGER     REFERENCES fra_documents (id) ON DELETE SET NULL,
+    hits         INTEGER     NOT NULL DEFAULT 0,
+    created_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+    last_seen_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_document_hashes_doc_id
+    ON document_hashes (doc_id);
@@ -0,0 +1,43 @@
+-- Bump table_changes once per writing transaction, at commit time.
+-- The statement-level triggers from 002/009 updated the table_changes row
+-- mid-transaction and held its row lock until commit, so every concurrent
+-- writer of fra_documents (uploads, batch chunks, backfills, ingest jobs)
+-- queued behind the others. Deferred constraint triggers run at commit, and
+-- a transaction-local flag keeps it to one UPDATE per table per transaction.
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('table_changes.bumped_' || TG_TABLE_NAME, true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    PERFORM set_config('table_changes.bumped_' || TG_TABLE_NAME, 'on', true);
+
+    INSERT INTO table_changes (table_name, version, changed_at)
+    VALUES (TG_TABLE_NAME, 1, now())
+    ON CONFLICT (table_name)
+    DO UPDATE SET version = table_changes.version + 1, changed_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS fra_documents_bump_version ON fra_documents;
+CREATE CONSTRAINT TRIGGER fra_documents_bump_version
+    AFTER INSERT OR UPDATE OR DELETE ON fra_documents
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION bump_table_version();
+
+-- constraint triggers cannot fire on TRUNCATE
+DROP TRIGGER IF EXISTS fra_documents_bump_version_truncate ON fra_documents;
+CREATE TRIGGER fra_documents_bump_version_truncate
+    AFTER TRUNCATE ON fra_documents
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS schemes_bump_version ON schemes;
+CREATE CONSTRAINT TRIGGER schemes_bump_version
+    AFTER INSERT OR UPDATE OR DELETE ON schemes
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS schemes_bump_version_truncate ON schemes;
+CREATE TRIGGER schemes_bump_version_truncate
+    AFTER TRUNCATE ON schemes
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
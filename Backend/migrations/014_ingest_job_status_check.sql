@@ -0,0 +1,5 @@
+-- The statuses services/ingest_job_service.py writes; 'duplicate' means
+-- doc_id already held the uploaded file.
+ALTER TABLE ingest_jobs DROP CONSTRAINT IF EXISTS ingest_jobs_status_check;
+ALTER TABLE ingest_jobs ADD CONSTRAINT ingest_jobs_status_check
+    CHECK (status IN ('queued', 'running', 'done', 'duplicate', 'failed'));
@@ -1,44 +1,111 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
-import psycopg2
-import os
-from dotenv import load_dotenv
-from routers.dss_helpers import write_dss_log  # ✅ FIXED
-
-load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL")
+from db import get_db_connection
+from services.dss_log_service import enqueue_dss_log
+from services.suggest_service import (
+    DEFAULT_SUGGESTIONS,
+    MAX_SUGGESTIONS,
+    SUGGEST_FIELDS,
+    suggest,
+)
+from services.search_service import (
+    DEFAULT_SEARCH_RESULTS,
+    MAX_SEARCH_RESULTS,
+    SEARCH_COLUMNS,
+    search_documents,
+)
+from utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    STREAM_CHUNK_SIZE,
+    decode_cursor,
+    ndjson_line,
+    ndjson_response,
+    split_page,
+)
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
 
-def get_db_connection():
-    return psycopg2.connect(DATABASE_URL)
+def stream_rows(query, params, on_done=None):
+    """
+    Yield NDJSON lines from a server-side (named) cursor, STREAM_CHUNK_SIZE
+    rows per round trip. on_done(count, sample) runs after the last row.
+    """
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(name="search_stream")
+        cur.itersize = STREAM_CHUNK_SIZE
+        cur.execute(query, params)
+        columns = None
+        count = 0
+        sample = []
+        for row in cur:
+            if columns is None:
+                columns = [desc[0] for desc in cur.description]
+            record = dict(zip(columns, row))
+            if len(sample) < 3:
+                sample.append(record)
+            count += 1
+            yield ndjson_line(record)
+        cur.close()
+        if on_done:
+            on_done(count, sample)
+    finally:
+        conn.close()
+
+
+def _log_search(q, status, state, district, count, sample):
+    # queued; the background writer inserts it in bulk
+    enqueue_dss_log(
+        user_query=q or "",
+        parsed={"status": status, "state": state, "district": district},
+        scheme_id=None,
+        count=count,
+        sample=sample,
+    )
+
+
+@router.get("/suggest")
+def suggest_names(
+    q: str = Query(..., min_length=1, description="What the user has typed so far"),
+    field: Optional[str] = Query(None, description="state | district | village | holder (default: all)"),
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+):
+    """Typeahead from the in-memory prefix index; never touches the database."""
+    if field and field not in SUGGEST_FIELDS:
+        raise HTTPException(status_code=400, detail=f"field must be one of {', '.join(SUGGEST_FIELDS)}")
+    return {"query": q, "suggestions": suggest(q, field, limit)}
 
 
+# Plain def: FastAPI runs it on the bounded worker thread pool, so the
+# blocking psycopg2 calls never stall the event loop.
 @router.get("/")
-async def search_claims(
+def search_claims(
     q: Optional[str] = Query(None, description="General search query"),
     status: Optional[str] = Query(None, description="Filter by claim status"),
     state: Optional[str] = Query(None, description="Filter by state"),
     district: Optional[str] = Query(None, description="Filter by district"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (keyset pagination)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    stream: bool = Query(False, description="Stream matches as NDJSON"),
 ):
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    base_query = "SELECT * FROM fra_documents WHERE 1=1"
+    """
+    With q: relevance-ranked, typo-tolerant search over name, village,
+    district, state and claim id, capped at MAX_SEARCH_RESULTS.
+    Without q: filtered listing with keyset pagination / NDJSON streaming.
+    """
+    if q and q.strip():
+        if cursor or stream:
+            raise HTTPException(status_code=400, detail="cursor and stream apply only to listings without q")
+        limit = min(limit or DEFAULT_SEARCH_RESULTS, MAX_SEARCH_RESULTS)
+        results = search_documents(q, status=status, state=state, district=district, limit=limit)
+        _log_search(q, status, state, district, len(results), results[:3])
+        return {"count": len(results), "results": results}
+
+    base_query = f"SELECT {SEARCH_COLUMNS} FROM fra_documents WHERE 1=1"
     params = []
 
-    if q:
-        base_query += """ AND (
-            patta_holder_name ILIKE %s OR
-            village_name ILIKE %s OR
-            district ILIKE %s OR
-            state ILIKE %s OR
-            claim_id ILIKE %s
-        )"""
-        like_q = f"%{q}%"
-        params += [like_q] * 5
-
     if status:
         base_query += " AND status ILIKE %s"
         params.append(f"%{status}%")
@@ -51,44 +118,97 @@ async def search_claims(
         base_query += " AND district ILIKE %s"
         params.append(f"%{district}%")
 
-    cur.execute(base_query, params)
-    rows = cur.fetchall()
-    columns = [desc[0] for desc in cur.description]
+    # Keyset on id
+    if cursor:
+        try:
+            after_id = int(decode_cursor(cursor, 1)[0])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        base_query += " AND id > %s"
+        params.append(after_id)
+
+    if stream:
+        return ndjson_response(stream_rows(
+            base_query + " ORDER BY id",
+            params,
+            on_done=lambda count, sample: _log_search(q, status, state, district, count, sample),
+        ))
+
+    paginate = bool(limit or cursor)
+    if paginate:
+        limit = limit or DEFAULT_PAGE_SIZE
+        base_query += " ORDER BY id LIMIT %s"
+        params.append(limit + 1)
+
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(base_query, params)
+        rows = cur.fetchall()
+        columns = [desc[0] for desc in cur.description]
+        cur.close()
+    finally:
+        conn.close()  # back to the pool
 
     results = [dict(zip(columns, row)) for row in rows]
 
+    next_cursor = None
+    if paginate:
+        results, next_cursor = split_page(results, limit, key=lambda r: (r["id"],))
+
     # log DSS usage
-    try:
-        write_dss_log(
-            user_query=q or "",
-            parsed={"status": status, "state": state, "district": district},
-            scheme_id=None,
-            count=len(results),
-            sample=results[:3],
-        )
-    except Exception as e:
-        print("⚠️ DSS log failed:", e)
-
-    cur.close()
-    conn.close()
+    _log_search(q, status, state, district, len(results), results[:3])
+
+    if paginate:
+        return {"count": len(results), "results": results, "next_cursor": next_cursor}
     return {"count": len(results), "results": results}
 
 
     
 
 @router.get("/statewise")
-def get_statewise_claims():
-    conn = get_db_connection()
-    cur = conn.cursor()
+def get_statewise_claims(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (keyset pagination)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    stream: bool = Query(False, description="Stream rows as NDJSON"),
+):
+    query = "SELECT * FROM fra_statewise_claims"
+    params = []
+
+    # Keyset on state_name
+    if cursor:
+        try:
+            after_state = str(decode_cursor(cursor, 1)[0])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        query += " WHERE state_name > %s"
+        params.append(after_state)
 
-    cur.execute("SELECT * FROM fra_statewise_claims;")
-    rows = cur.fetchall()
-    columns = [desc[0] for desc in cur.description]
+    if stream:
+        return ndjson_response(stream_rows(query + " ORDER BY state_name", params))
 
-    cur.close()
-    conn.close()
+    paginate = bool(limit or cursor)
+    if paginate:
+        limit = limit or DEFAULT_PAGE_SIZE
+        query += " ORDER BY state_name LIMIT %s"
+        params.append(limit + 1)
+
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(query + ";", params)
+        rows = cur.fetchall()
+        columns = [desc[0] for desc in cur.description]
+        cur.close()
+    finally:
+        conn.close()
+
+    results = [dict(zip(columns, row)) for row in rows]
+    if paginate:
+        results, next_cursor = split_page(results, limit, key=lambda r: (r["state_name"],))
+        return {"count": len(results), "results": results, "next_cursor": next_cursor}
 
     return {
         "count": len(rows),
-        "results": [dict(zip(columns, row)) for row in rows]
+        "results": results
     }
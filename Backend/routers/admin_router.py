@@ -0,0 +1,40 @@
+import io
+import os
+from typing import Optional
+
+from fastapi import APIRouter, File, Header, HTTPException, Query, UploadFile
+
+from services.csv_loader import LOAD_MODES, load_statewise_csv
+
+# Admin endpoints are disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin(token: Optional[str]):
+    if not ADMIN_TOKEN or token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="admin token required")
+
+
+@router.post("/load/statewise")
+def load_statewise(
+    file: Optional[UploadFile] = File(None, description="CSV to load (default: data/fra_all_states.csv)"),
+    mode: str = Query("replace", description="replace | upsert"),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """Reload fra_statewise_claims through COPY + staging table."""
+    require_admin(x_admin_token)
+    if mode not in LOAD_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(LOAD_MODES)}")
+
+    try:
+        if file is not None:
+            text_file = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+            stats = load_statewise_csv(fileobj=text_file, mode=mode)
+        else:
+            stats = load_statewise_csv(mode=mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"status": "ok", **stats}
@@ -1,37 +1,125 @@
-from fastapi import APIRouter
-from sqlalchemy import text
-from db import engine
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional
+import xxhash
+from services.atlas_service import (
+    ATLAS_COLUMNS,
+    fetch_all_claims,
+    fetch_claims_page,
+    fetch_nearby,
+    get_viewport,
+    parse_bbox,
+    stream_claims,
+)
+from services.change_service import fetch_changes, get_table_version
+from services.tile_service import get_tile, MAX_TILE_ZOOM
+from utils.http_cache import validator_headers, is_not_modified, not_modified_response
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, ndjson_response
+
+TILE_MAX_AGE = 60  # seconds browsers may reuse a tile before revalidating
 
 router = APIRouter(prefix="/atlas", tags=["Atlas"])
 
 @router.get("/claims")
-def get_all_claims_for_atlas():
+def get_all_claims_for_atlas(
+    request: Request,
+    response: Response,
+    bbox: Optional[str] = Query(None, description="Viewport as min_lon,min_lat,max_lon,max_lat"),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom level"),
+    since: Optional[int] = Query(None, ge=0, description="Watermark from a previous response; returns only changes"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (keyset pagination)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    stream: bool = Query(False, description="Stream every claim as NDJSON"),
+):
     """
-    Returns all FRA claims with coordinates for map visualization
+    Returns FRA claims with coordinates for map visualization.
+
+    Without bbox/zoom every geocoded claim is returned. With them, the
+    response is limited to the viewport: grid clusters at low zoom and
+    individual claims (capped) at high zoom.
+
+    With since, only claims written after that watermark are returned,
+    plus the ids of claims deleted (or no longer geocoded) since then.
+    limit / cursor page the full listing by id; stream=true emits it as NDJSON.
+    Every response carries ETag / Last-Modified and honours conditional GETs.
     """
-    query = text("""
-    SELECT
-        id,
-        patta_holder_name,
-        father_or_husband_name,
-        village_name,
-        district,
-        state,
-        total_area_claimed,
-        coordinates,
-        claim_id,
-        claim_type,
-        'verified' AS status,
-        land_use,
-        date_of_application,
-        created_at
-       FROM fra_documents
-    WHERE coordinates IS NOT NULL
-      AND coordinates <> ''
-""")
-
-
-    with engine.connect() as conn:
-        rows = conn.execute(query).mappings().all()
-        return {"results": [dict(row) for row in rows]}
+    version, changed_at = get_table_version("fra_documents")
+    headers = validator_headers(request, version, changed_at)
+    if is_not_modified(request, headers, changed_at):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+
+    if since is not None:
+        rows, deleted, watermark = fetch_changes(ATLAS_COLUMNS, since)
+        results = [r for r in rows if r["lat"] is not None]
+        deleted += [r["id"] for r in rows if r["lat"] is None]
+        return {
+            "since": since,
+            "watermark": watermark,
+            "count": len(results),
+            "results": results,
+            "deleted": sorted(deleted),
+        }
+
+    if bbox is None and zoom is None and (limit or cursor or stream):
+        after_id = 0
+        if cursor:
+            try:
+                after_id = int(decode_cursor(cursor, 1)[0])
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="invalid cursor")
+
+        if stream:
+            stream_response = ndjson_response(stream_claims(after_id))
+            stream_response.headers.update(headers)
+            return stream_response
+
+        page, next_cursor = fetch_claims_page(limit or DEFAULT_PAGE_SIZE, after_id)
+        return {"count": len(page), "results": page, "next_cursor": next_cursor}
+
+    if bbox is None and zoom is None:
+        results, watermark = fetch_all_claims()
+        return {"watermark": watermark, "results": results}
+
+    try:
+        bounds = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return get_viewport(bounds, zoom)
+
+
+@router.get("/nearby")
+def get_nearby_claims(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0, le=200),
+):
+    """Claims within radius_km of a point, nearest first."""
+    results = fetch_nearby(lat, lon, radius_km)
+    return {"count": len(results), "results": results}
+
+
+@router.get("/tiles/{z}/{x}/{y}.pbf")
+def get_claims_tile(z: int, x: int, y: int, request: Request):
+    """
+    Mapbox Vector Tile of claim points (layer "claims") and, from zoom 12,
+    claim squares (layer "claim_polygons").
+    """
+    if not 0 <= z <= MAX_TILE_ZOOM:
+        raise HTTPException(status_code=400, detail=f"zoom must be between 0 and {MAX_TILE_ZOOM}")
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=404, detail="tile out of range")
+
+    data = get_tile(z, x, y)
+    headers = {
+        "ETag": f'"{xxhash.xxh64_hexdigest(data)}"',
+        "Cache-Control": f"public, max-age={TILE_MAX_AGE}",
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
 
+    return Response(
+        content=data,
+        media_type="application/vnd.mapbox-vector-tile",
+        headers=headers,
+    )
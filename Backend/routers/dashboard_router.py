@@ -1,40 +1,30 @@
-from fastapi import APIRouter
-from sqlalchemy import text
-from db import engine
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from services.dashboard_service import get_dashboard_summary as cached_dashboard_summary
+from services.rollup_service import ROLLUP_LEVELS, fetch_rollups
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/summary")
 def get_dashboard_summary():
-    with engine.connect() as conn:
-        kpi_query = text("""
-            SELECT
-                SUM(claims_total) AS total_claims,
-                SUM(titles_total) AS verified_claims,
-                COUNT(state_name) AS states
-            FROM fra_statewise_claims;
-        """)
-        kpi = conn.execute(kpi_query).mappings().first()
+    # KPIs + per-state progress, served from the in-process summary cache
+    return cached_dashboard_summary()
 
-        state_query = text("""
-            SELECT
-                state_name,
-                claims_total,
-                titles_total,
-                ROUND(
-                    (titles_total::numeric / NULLIF(claims_total, 0)) * 100,
-                    2
-                ) AS progress
-            FROM fra_statewise_claims
-            ORDER BY claims_total DESC;
-        """)
-        states = conn.execute(state_query).mappings().all()
 
-    return {
-        "kpis": [
-            {"title": "Total Claims", "value": kpi["total_claims"]},
-            {"title": "Verified Claims", "value": kpi["verified_claims"]},
-            {"title": "States Covered", "value": kpi["states"]}
-        ],
-        "statewise": states
-    }
+@router.get("/rollups")
+def get_claim_rollups(
+    level: str = Query("state", description="state | district | village"),
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    village: Optional[str] = None,
+    since: Optional[date] = Query(None, description="First upload day (YYYY-MM-DD)"),
+    until: Optional[date] = Query(None, description="Last upload day (YYYY-MM-DD)"),
+    by_day: bool = Query(False, description="One row per level and day"),
+):
+    """Drill-down over uploaded claims, read from the claim_rollups table."""
+    if level not in ROLLUP_LEVELS:
+        raise HTTPException(status_code=400, detail=f"level must be one of {', '.join(ROLLUP_LEVELS)}")
+    results = fetch_rollups(level, state, district, village, since, until, by_day)
+    return {"level": level, "count": len(results), "results": results}
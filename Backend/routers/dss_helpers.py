@@ -1,16 +1,9 @@
-import psycopg2
-import os
 import json
 from datetime import datetime, date
-from dotenv import load_dotenv
 
-load_dotenv()
+from psycopg2.extras import execute_values
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-
-def get_db_connection():
-    return psycopg2.connect(DATABASE_URL)
+from db import get_db_connection
 
 
 def insert_scheme(name: str, description: str, eligibility: dict):
@@ -61,22 +54,28 @@ def _json_serializer(obj):
     return str(obj)
 
 
-def write_dss_log(user_query: str, parsed: dict, scheme_id: int, count: int, sample: list):
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO dss_logs (user_query, parsed, scheme_id, result_count, sample)
-        VALUES (%s, %s, %s, %s, %s)
-        """,
+def write_dss_logs(entries: list):
+    """Bulk insert of (user_query, parsed, scheme_id, count, sample) tuples."""
+    rows = [
         (
             user_query,
             json.dumps(parsed, default=_json_serializer),
             scheme_id,
             count,
             json.dumps(sample, default=_json_serializer),
-        ),
-    )
-    conn.commit()
-    cur.close()
-    conn.close()
+        )
+        for user_query, parsed, scheme_id, count, sample in entries
+    ]
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        execute_values(
+            cur,
+            "INSERT INTO dss_logs (user_query, parsed, scheme_id, result_count, sample) VALUES %s",
+            rows,
+            page_size=len(rows) or 1,
+        )
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
@@ -1,6 +1,11 @@
+import os
+
 from fastapi import APIRouter, HTTPException, Query
-from db import insert_scheme, get_scheme_by_name, fetch_schemes, write_dss_log
-from services.scheme_service import find_eligible_people_by_scheme
+from typing import Optional
+from services.scheme_registry import get_scheme, get_scheme_registry, load_scheme_registry
+from services.eligibility_service import save_scheme
+from services.dss_cache_service import get_eligible_claims, get_eligible_claims_many, invalidate_scheme
+from services.eligibility_matrix import get_eligibility_matrix
 from utils.llm_utils import parse_dss_query  # your LLM query parser
 
 
@@ -17,6 +22,9 @@ SCHEME_KEYWORDS = {
 }
 
 
+DSS_BATCH_MAX_QUESTIONS = int(os.getenv("DSS_BATCH_MAX_QUESTIONS", "500"))
+
+
 router = APIRouter(prefix="/dss", tags=["dss"])
 
 
@@ -27,32 +35,60 @@ def create_scheme(payload: dict):
     if not name or not eligibility:
         raise HTTPException(status_code=400, detail="name and eligibility required")
 
-    scheme_id = insert_scheme(name, payload.get("description", ""), eligibility)
+    scheme_id = save_scheme(name, payload.get("description", ""), eligibility)
+    load_scheme_registry()
+    return {"id": scheme_id, "name": name}
+
+
+@router.put("/schemes/{scheme_id}")
+def change_scheme(scheme_id: int, payload: dict):
+    name = payload.get("name")
+    eligibility = payload.get("eligibility")
+    if not name or not eligibility:
+        raise HTTPException(status_code=400, detail="name and eligibility required")
+
+    if save_scheme(name, payload.get("description", ""), eligibility, scheme_id) is None:
+        raise HTTPException(status_code=404, detail="scheme not found")
+    load_scheme_registry()
+    invalidate_scheme(scheme_id)
     return {"id": scheme_id, "name": name}
 
 
 @router.get("/schemes")
 def list_schemes():
-    return fetch_schemes()
-
+    return get_scheme_registry().all()
 
-@router.get("/check")
 
-def dss_check(
-    q: str = Query(
-        ...,
-        title="Eligibility Question",
-        description="Ask in natural language, e.g. Who is eligible for Farm Support Scheme in Koraput, Odisha?",
-        example="Who is eligible for Farm Support Scheme in Koraput, Odisha?"
-    )
+@router.get("/matrix")
+def eligibility_matrix(
+    by: Optional[str] = Query(None, description="state: split each scheme's count by state")
 ):
+    """Every scheme evaluated against every claimant (vectorized, in memory)."""
+    if by not in (None, "state"):
+        raise HTTPException(status_code=400, detail="by must be 'state'")
+    matrix = get_eligibility_matrix()
+    return {
+        "claimants": len(matrix),
+        "built_at": matrix.built_at,
+        "schemes": matrix.counts(by),
+    }
+
+
+@router.get("/claimants/{doc_id}/schemes")
+def claimant_schemes(doc_id: int):
+    """Which schemes apply to one claimant."""
+    schemes = get_eligibility_matrix().schemes_for(doc_id)
+    if schemes is None:
+        raise HTTPException(status_code=404, detail="claimant not found")
+    return {"doc_id": doc_id, "count": len(schemes), "schemes": schemes}
+
+
+def _resolve_question(q: str):
+    """Parse one question into (parsed filters, scheme, error response)."""
     # 1️⃣ Run LLM parser
     parsed = parse_dss_query(q)
 
     scheme_name = parsed.get("scheme")
-    village = parsed.get("village")
-    district = parsed.get("district")
-    state = parsed.get("state")
 
     # 2️⃣ 🔁 FALLBACK: keyword-based scheme detection
     if not scheme_name:
@@ -65,38 +101,99 @@ def dss_check(
 
     # 3️⃣ Still not found → error
     if not scheme_name:
-        return {
+        return parsed, None, {
             "status": "error",
             "message": "Could not extract scheme name from query"
         }
 
-    # 4️⃣ Fetch scheme from DB
-    scheme = get_scheme_by_name(scheme_name)
+    # 4️⃣ Resolve scheme from the in-memory registry
+    scheme = get_scheme(scheme_name)
     if not scheme:
-        return {
+        return parsed, None, {
             "status": "error",
             "message": f"Scheme '{scheme_name}' not found"
         }
 
-    # 5️⃣ Find eligible people
-    try:
-        results = find_eligible_people_by_scheme(
-    scheme=scheme,
-    village=parsed.get("village"),
-    district=parsed.get("district"),
-    state=parsed.get("state")
-)
+    return parsed, scheme, None
 
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": f"Database error: {str(e)}"
-        }
 
+def _answer(parsed: dict, results: list):
     return {
         "status": "ok",
-        "scheme": scheme_name,
+        "scheme": parsed["scheme"],
         "filters": parsed,
         "count": len(results),
         "results": results
     }
+
+
+@router.get("/check")
+
+def dss_check(
+    q: str = Query(
+        ...,
+        title="Eligibility Question",
+        description="Ask in natural language, e.g. Who is eligible for Farm Support Scheme in Koraput, Odisha?",
+        example="Who is eligible for Farm Support Scheme in Koraput, Odisha?"
+    )
+):
+    parsed, scheme, error = _resolve_question(q)
+    if error:
+        return error
+
+    # 5️⃣ Find eligible people (repeated questions are answered from the cache)
+    try:
+        results = get_eligible_claims(
+            scheme=scheme,
+            village=parsed.get("village"),
+            district=parsed.get("district"),
+            state=parsed.get("state")
+        )
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Database error: {str(e)}"
+        }
+
+    return _answer(parsed, results)
+
+
+@router.post("/check/batch")
+def dss_check_batch(payload: dict):
+    """
+    Many questions in one request: identical filters are answered once and
+    uncached ones with a single grouped query. Answers keep question order.
+    """
+    questions = payload.get("questions")
+    if not isinstance(questions, list) or not questions:
+        raise HTTPException(status_code=400, detail="questions must be a non-empty list")
+    if len(questions) > DSS_BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"at most {DSS_BATCH_MAX_QUESTIONS} questions per batch"
+        )
+
+    # 1️⃣ Parse every question
+    resolved = [_resolve_question(str(q)) for q in questions]
+
+    # 2️⃣ Look up all answerable questions together
+    lookups = [
+        (scheme, parsed.get("village"), parsed.get("district"), parsed.get("state"))
+        for parsed, scheme, error in resolved
+        if not error
+    ]
+    try:
+        answers = iter(get_eligible_claims_many(lookups))
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Database error: {str(e)}"
+        }
+
+    # 3️⃣ Stitch answers back in question order
+    results = []
+    for q, (parsed, scheme, error) in zip(questions, resolved):
+        answer = error or _answer(parsed, next(answers))
+        results.append({"question": q, **answer})
+
+    return {"status": "ok", "count": len(results), "results": results}
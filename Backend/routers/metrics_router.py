@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from utils.metrics import collect_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+# ✅ Process-local counters (connection pool, caches, queues)
+@router.get("/metrics")
+def get_metrics():
+    return collect_metrics()
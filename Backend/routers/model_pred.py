@@ -10,6 +10,8 @@ import math
 import tensorflow as tf
 from shapely.geometry import Polygon, Point
 from typing import Optional
+from utils.geo_utils import parse_coordinate, make_square_polygon
+from utils.units import parse_area_to_m2
 
 router = APIRouter(prefix="/model", tags=["model"])
 
@@ -71,76 +73,6 @@ class Claim(BaseModel):
     date_of_application: Optional[str] = None
 
 # ---------------- Utility functions ----------------
-def parse_coordinate(coord_str: str):
-    """Parse 'lat, lon' or 'lon, lat' string into floats and detect order.
-       Returns (lat, lon)."""
-    try:
-        parts = [p.strip() for p in coord_str.replace(',', ' ').split()]
-        if len(parts) < 2:
-            raise ValueError("coordinate string must have two numeric values")
-        a, b = float(parts[0]), float(parts[1])
-        # Heuristic: lat in [-90, 90], lon in [-180, 180]; if first value outside [-90,90], treat as lon,lat
-        if -90 <= a <= 90 and -180 <= b <= 180:
-            # assume a is lat, b is lon
-            lat, lon = a, b
-        elif -90 <= b <= 90 and -180 <= a <= 180:
-            # swapped
-            lat, lon = b, a
-        else:
-            # fallback: assume first is lat
-            lat, lon = a, b
-        return lat, lon
-    except Exception as e:
-        raise ValueError(f"Could not parse coordinates: {e}")
-
-def parse_area_to_m2(area_str: str):
-    """Parse area strings like '1.00 acres', '0.5 ha', '4000 m2' into square meters."""
-    if not area_str:
-        return None
-    s = area_str.strip().lower()
-    try:
-        # detect numeric and unit
-        # examples: "1.00 acres", "1 acres", "0.5 ha", "1.2 hectare", "4000 m2"
-        tokens = s.split()
-        num = float(tokens[0])
-        unit = tokens[1] if len(tokens) > 1 else "acres"
-    except Exception:
-        # try to strip trailing unit characters
-        import re
-        m = re.match(r"([\d\.]+)", s)
-        if not m:
-            return None
-        num = float(m.group(1))
-        unit = s[m.end():].strip() or "acres"
-
-    if unit.startswith("acre"):
-        return num * 4046.8564224
-    if unit.startswith("ha") or "hect" in unit:
-        return num * 10000.0
-    if unit.startswith("m") or "sq" in unit:
-        return num  # assume already m2
-    # fallback assume acres
-    return num * 4046.8564224
-
-def make_square_polygon(lat, lon, area_m2):
-    """Create a simple axis-aligned square polygon (lon,lat order) around (lat,lon) with given area in m2."""
-    if area_m2 is None or area_m2 <= 0:
-        # default small square (100m)
-        half_side = 50.0
-    else:
-        side = math.sqrt(area_m2)
-        half_side = side / 2.0  # meters
-    # degrees per meter approx (lat)
-    delta_lat = half_side / 111000.0
-    # degrees per meter for lon depends on latitude
-    delta_lon = half_side / (111000.0 * math.cos(math.radians(lat)) + 1e-9)
-    # corners in lon, lat order for EE / shapely polygon
-    p1 = (lon - delta_lon, lat - delta_lat)
-    p2 = (lon + delta_lon, lat - delta_lat)
-    p3 = (lon + delta_lon, lat + delta_lat)
-    p4 = (lon - delta_lon, lat + delta_lat)
-    return [p1, p2, p3, p4, p1]
-
 def ee_polygon_from_coords(coords_list):
     """Convert list of (lon,lat,...,lon,lat) to ee.Geometry.Polygon form."""
     return ee.Geometry.Polygon([coords_list])
@@ -1,14 +1,39 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Request, Response
+from typing import List, Optional
+import os
+import zipfile
+from functools import partial
 import requests
 from db import engine
 from sqlalchemy import text
 from datetime import datetime
 
-from utils.ocr_utils import extract_text_from_file
+from utils.ocr_utils import ocr_document
 from utils.llm_utils import clean_with_llm  # with regex fallback
+from services.change_service import current_watermark, fetch_changes, get_table_version
+from services.ingest_service import (
+    DUPLICATE_ACTION,
+    document_params,
+    find_duplicate,
+    ingest_files,
+    store_documents,
+)
+from services.ingest_job_service import enqueue_ingest_jobs, get_ingest_job
+from utils.http_cache import validator_headers, is_not_modified, not_modified_response
+from utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    ndjson_response,
+    split_page,
+    stream_query,
+)
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", "5000"))
+UPLOAD_MAX_FILE_BYTES = int(os.getenv("UPLOAD_MAX_FILE_BYTES", str(25 * 1024 * 1024)))
+
 
 def get_coordinates_from_address(address: str):
     """
@@ -31,89 +56,50 @@ def get_coordinates_from_address(address: str):
         print(f"Coordinate fetch error: {e}")
     return ""
 
+# Upload and listing are plain def: OCR, geocoding and the SQLAlchemy calls
+# all block, so FastAPI runs them on the bounded worker thread pool instead
+# of the event loop.
 @router.post("/")
-async def upload_document(file: UploadFile = File(...)):
+def upload_document(file: UploadFile = File(...)):
     try:
-        # 1️⃣ Read file
-        file_bytes = await file.read()
-
-        # 2️⃣ OCR
-        ocr_text = extract_text_from_file(file_bytes)
-
-        # 3️⃣ Clean text
-        data = clean_with_llm(ocr_text)
-         
-        insert_sql = text("""
-INSERT INTO fra_documents (
-  patta_holder_name,
-  father_or_husband_name,
-  age,
-  gender,
-  address,
-  village_name,
-  block,
-  district,
-  state,
-  total_area_claimed,
-  coordinates,
-  land_use,
-  claim_id,
-  claim_type,
-  date_of_application,
-  water_bodies,
-  forest_cover,
-  homestead,
-  status
-)
-VALUES (
-  :patta_holder_name,
-  :father_or_husband_name,
-  :age,
-  :gender,
-  :address,
-  :village_name,
-  :block,
-  :district,
-  :state,
-  :total_area_claimed,
-  :coordinates,
-  :land_use,
-  :claim_id,
-  :claim_type,
-  :date_of_application,
-  :water_bodies,
-  :forest_cover,
-  :homestead,
-  'pending'
-)
-RETURNING id;
-""")
-
-
-        params = {
-            "patta_holder_name": data.get("Patta-Holder Name", ""),
-            "father_or_husband_name": data.get("Father/Husband Name", ""),
-            "age": int(data.get("Age")) if data.get("Age") else None,
-            "gender": data.get("Gender", ""),
-            "address": data.get("Address", ""),
-            "village_name": data.get("Village Name", ""),
-            "block": data.get("Block", ""),
-            "district": data.get("District", ""),
-            "state": data.get("State", ""),
-            "total_area_claimed": data.get("Total Area Claimed", ""),
-            "coordinates": data.get("Coordinates", ""),
-            "land_use": data.get("Land Use", ""),
-            "claim_id": data.get("Claim ID", ""),
-            "claim_type": data.get("Type of Claim", ""),
-            "date_of_application": data.get("Date of Application", ""),
-            "water_bodies": data.get("Water bodies", ""),
-            "forest_cover": data.get("Forest cover", ""),
-            "homestead": data.get("Homestead", "")
-        }
+        # 1️⃣ Read file (spooled temp file, read synchronously in the worker thread)
+        _check_upload_size(file, file.filename or "upload")
+        file_bytes = file.file.read()
+
+        # 2️⃣ Same scan uploaded before? (content hash → cached OCR / fields)
+        digest, action, cached = find_duplicate(file_bytes)
+        if action == "existing":
+            return {
+                "status": "duplicate",
+                "doc_id": cached["doc_id"],
+                "data": cached["fields"]
+            }
+        if action == "reject":
+            raise HTTPException(status_code=409, detail=f"duplicate of document {cached['doc_id']}")
+
+        if action == "reuse":
+            data = cached["fields"]
+            source = (digest, cached["ocr_text"], data)
+        else:
+            # 3️⃣ OCR (pages of multi-page scans run in parallel worker processes)
+            ocr_text = ocr_document(file_bytes)
 
-        with engine.begin() as conn:
-            result = conn.execute(insert_sql, params)
-            doc_id = result.scalar()
+            # 4️⃣ Clean text
+            data = clean_with_llm(ocr_text)
+            source = (digest, ocr_text, data)
+
+        # 5️⃣ Store it (rollups, eligibility, tile / typeahead / DSS caches)
+        duplicates = {}
+        doc_id = store_documents([document_params(data)], [source], duplicates)[0]
+        if duplicates:
+            # a concurrent upload of the same bytes was stored first
+            if DUPLICATE_ACTION == "reject":
+                raise HTTPException(status_code=409, detail=f"duplicate of document {doc_id}")
+            return {
+                "status": "duplicate",
+                "doc_id": doc_id,
+                "data": data
+            }
 
         return {
             "status": "success",
@@ -121,16 +107,90 @@ RETURNING id;
             "data": data
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _check_upload_size(upload: UploadFile, name: str):
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    if size > UPLOAD_MAX_FILE_BYTES:
+        raise HTTPException(status_code=400, detail=f"{name}: file too large")
 
-@router.get("/all")
-async def get_all_documents():
-    try:
-        query = text("""
-        SELECT
+
+def _expand_uploads(files: List[UploadFile]):
+    """(filename, load) pairs for every upload, with ZIP archives unpacked."""
+    entries = []
+    for upload in files:
+        name = upload.filename or "upload"
+        if not (name.lower().endswith(".zip") or zipfile.is_zipfile(upload.file)):
+            _check_upload_size(upload, name)
+            entries.append((name, upload.file.read))
+            continue
+
+        upload.file.seek(0)
+        try:
+            archive = zipfile.ZipFile(upload.file)
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail=f"{name}: not a valid ZIP archive")
+        for info in archive.infolist():
+            base = info.filename.rsplit("/", 1)[-1]
+            if info.is_dir() or not base or base.startswith(".") or info.filename.startswith("__MACOSX/"):
+                continue
+            if info.file_size > UPLOAD_MAX_FILE_BYTES:
+                raise HTTPException(status_code=400, detail=f"{name}/{info.filename}: file too large")
+            entries.append((f"{name}/{info.filename}", partial(archive.read, info)))
+
+    if len(entries) > UPLOAD_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"at most {UPLOAD_BATCH_MAX_FILES} files per batch"
+        )
+    return entries
+
+
+@router.post("/batch")
+def upload_documents(files: List[UploadFile] = File(...)):
+    """
+    Many scanned forms (or ZIP archives of them) in one request. OCR runs
+    in parallel worker processes and documents are inserted in chunks;
+    returns a per-file report in upload order.
+    """
+    entries = _expand_uploads(files)
+    report = ingest_files(entries)
+    return {
+        "status": "success",
+        "files": len(report),
+        "stored": sum(1 for r in report if r["status"] == "success"),
+        "failed": sum(1 for r in report if r["status"] == "error"),
+        "results": report
+    }
+
+
+@router.post("/jobs", status_code=202)
+def queue_documents(files: List[UploadFile] = File(...)):
+    """
+    Store the files (ZIP archives are unpacked) and return job ids at once;
+    background workers OCR and insert them. Poll /upload/jobs/{id}.
+    """
+    entries = _expand_uploads(files)
+    jobs = enqueue_ingest_jobs(entries)
+    return {"status": "queued", "count": len(jobs), "jobs": jobs}
+
+
+@router.get("/jobs/{job_id}")
+def ingest_job_status(job_id: int):
+    job = get_ingest_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
+
+
+
+DOCUMENT_LIST_COLUMNS = """
           id,
           patta_holder_name,
           father_or_husband_name,
@@ -145,18 +205,98 @@ async def get_all_documents():
           land_use,
           date_of_application,
           created_at
+"""
+
+
+@router.get("/all")
+def get_all_documents(
+    request: Request,
+    response: Response,
+    since: Optional[int] = Query(None, ge=0, description="Watermark from a previous response; returns only changes"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (keyset pagination)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    stream: bool = Query(False, description="Stream every row as NDJSON"),
+):
+    version, changed_at = get_table_version("fra_documents")
+    headers = validator_headers(request, version, changed_at)
+    if is_not_modified(request, headers, changed_at):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+
+    # Keyset on (created_at, id) DESC, backed by ix_fra_documents_created_at_id
+    where = ""
+    params = {}
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor, 2)
+            params = {
+                "cursor_created_at": datetime.fromisoformat(cursor_created_at),
+                "cursor_id": int(cursor_id),
+            }
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        where = "WHERE (created_at, id) < (:cursor_created_at, :cursor_id)"
+
+    order_by = "ORDER BY created_at DESC, id DESC"
+
+    try:
+        if since is not None:
+            rows, deleted, watermark = fetch_changes(DOCUMENT_LIST_COLUMNS, since)
+            return {
+                "status": "success",
+                "since": since,
+                "watermark": watermark,
+                "count": len(rows),
+                "results": rows,
+                "deleted": deleted
+            }
+
+        if stream:
+            query = f"SELECT {DOCUMENT_LIST_COLUMNS} FROM fra_documents {where} {order_by}"
+            stream_response = ndjson_response(stream_query(query, params))
+            stream_response.headers.update(headers)
+            return stream_response
+
+        if limit or cursor:
+            limit = limit or DEFAULT_PAGE_SIZE
+            query = text(f"""
+            SELECT {DOCUMENT_LIST_COLUMNS}
+            FROM fra_documents
+            {where}
+            {order_by}
+            LIMIT :limit;
+            """)
+            params["limit"] = limit + 1
+
+            with engine.connect() as conn:
+                rows = conn.execute(query, params).mappings().all()
+
+            page, next_cursor = split_page(
+                rows, limit, key=lambda r: (r["created_at"], r["id"])
+            )
+            return {
+                "status": "success",
+                "count": len(page),
+                "results": page,
+                "next_cursor": next_cursor
+            }
+
+        query = text(f"""
+        SELECT {DOCUMENT_LIST_COLUMNS}
         FROM fra_documents
-        ORDER BY created_at DESC;
+        {order_by};
         """)
 
         with engine.connect() as conn:
+            watermark = current_watermark(conn)
             rows = conn.execute(query).mappings().all()
 
         return {
             "status": "success",
+            "watermark": watermark,
             "count": len(rows),
             "results": rows
         }
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
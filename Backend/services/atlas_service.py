@@ -0,0 +1,283 @@
+import math
+from sqlalchemy import text
+from db import engine
+from services.change_service import current_watermark
+from utils.pagination import split_page, stream_query
+
+
+# -------------------------
+# Clustering config
+# -------------------------
+CLUSTER_MAX_ZOOM = 11          # zoom <= this returns clusters, above it returns claims
+CLUSTER_CELLS_PER_TILE = 8     # grid cells per 256px tile edge (~32px per cell)
+MAX_POINTS_PER_VIEW = 2000     # hard cap on individual claims in one response
+
+WORLD_BBOX = (-180.0, -90.0, 180.0, 90.0)
+
+# same status label for points, tiles and cluster status mixes
+STATUS_SQL = "COALESCE(NULLIF(status, ''), 'unknown')"
+
+ATLAS_COLUMNS = f"""
+        id,
+        patta_holder_name,
+        father_or_husband_name,
+        village_name,
+        district,
+        state,
+        total_area_claimed,
+        coordinates,
+        claim_id,
+        claim_type,
+        {STATUS_SQL} AS status,
+        land_use,
+        date_of_application,
+        created_at,
+        lat,
+        lon
+"""
+
+BBOX_FILTER = """
+    lat BETWEEN :min_lat AND :max_lat
+    AND lon BETWEEN :min_lon AND :max_lon
+"""
+
+
+# -------------------------
+# Helpers
+# -------------------------
+
+def parse_bbox(bbox: str):
+    """Parse 'min_lon,min_lat,max_lon,max_lat' into a tuple of floats."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = [float(p) for p in bbox.split(",")]
+    except Exception:
+        raise ValueError("bbox must be 'min_lon,min_lat,max_lon,max_lat'")
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("bbox min values must not exceed max values")
+    return (
+        max(min_lon, -180.0), max(min_lat, -90.0),
+        min(max_lon, 180.0), min(max_lat, 90.0),
+    )
+
+
+def cluster_cell_size(zoom: int) -> float:
+    """Grid cell edge in degrees for a web-mercator zoom level."""
+    return 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+
+
+def _bbox_params(bbox):
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return {
+        "min_lon": min_lon,
+        "min_lat": min_lat,
+        "max_lon": max_lon,
+        "max_lat": max_lat,
+    }
+
+
+# -------------------------
+# Queries
+# -------------------------
+
+def fetch_all_claims():
+    """
+    Every geocoded claim (unbounded legacy listing), plus the delta-sync
+    watermark to pass as since= on the next poll.
+    """
+    query = text(f"""
+        SELECT {ATLAS_COLUMNS}
+        FROM fra_documents
+        WHERE lat IS NOT NULL
+    """)
+    with engine.connect() as conn:
+        watermark = current_watermark(conn)
+        rows = conn.execute(query).mappings().all()
+    return [dict(row) for row in rows], watermark
+
+
+def fetch_claims_page(limit: int, after_id: int = 0):
+    """One keyset page of geocoded claims ordered by id."""
+    query = text(f"""
+        SELECT {ATLAS_COLUMNS}
+        FROM fra_documents
+        WHERE lat IS NOT NULL
+          AND id > :after_id
+        ORDER BY id
+        LIMIT :limit
+    """)
+    with engine.connect() as conn:
+        rows = conn.execute(query, {"after_id": after_id, "limit": limit + 1}).mappings().all()
+    return split_page([dict(r) for r in rows], limit, key=lambda r: (r["id"],))
+
+
+def stream_claims(after_id: int = 0):
+    """NDJSON lines for every geocoded claim after after_id, read in chunks."""
+    return stream_query(
+        f"""
+        SELECT {ATLAS_COLUMNS}
+        FROM fra_documents
+        WHERE lat IS NOT NULL
+          AND id > :after_id
+        ORDER BY id
+        """,
+        {"after_id": after_id},
+    )
+
+
+def fetch_clusters(bbox, zoom: int):
+    """
+    Aggregate the claims inside bbox into a zoom-dependent grid.
+    Each cell returns count, centroid, summed acres and a status mix.
+    """
+    cell = cluster_cell_size(zoom)
+    query = text(f"""
+    WITH cells AS (
+        SELECT
+            floor(lon / :cell)::bigint AS cx,
+            floor(lat / :cell)::bigint AS cy,
+            {STATUS_SQL} AS status,
+            COUNT(*) AS n,
+            SUM(lat) AS sum_lat,
+            SUM(lon) AS sum_lon,
+            SUM(area_acres) AS sum_acres
+        FROM fra_documents
+        WHERE {BBOX_FILTER}
+        GROUP BY 1, 2, 3
+    )
+    SELECT
+        cx,
+        cy,
+        SUM(n)::bigint AS count,
+        SUM(sum_lat) / SUM(n) AS lat,
+        SUM(sum_lon) / SUM(n) AS lon,
+        COALESCE(SUM(sum_acres), 0) AS area_acres,
+        jsonb_object_agg(status, n) AS status_mix
+    FROM cells
+    GROUP BY cx, cy
+    """)
+
+    params = _bbox_params(bbox)
+    params["cell"] = cell
+
+    with engine.connect() as conn:
+        rows = conn.execute(query, params).mappings().all()
+
+    clusters = [
+        {
+            "id": f"{zoom}/{r['cx']}/{r['cy']}",
+            "count": r["count"],
+            "lat": r["lat"],
+            "lon": r["lon"],
+            "area_acres": float(r["area_acres"]),
+            "status_mix": r["status_mix"],
+        }
+        for r in rows
+    ]
+    return clusters, cell
+
+
+def fetch_points(bbox, limit: int = MAX_POINTS_PER_VIEW):
+    """Individual claims inside bbox, capped at limit (+1 to detect truncation)."""
+    query = text(f"""
+    SELECT {ATLAS_COLUMNS}
+    FROM fra_documents
+    WHERE {BBOX_FILTER}
+    ORDER BY id
+    LIMIT :limit
+    """)
+
+    params = _bbox_params(bbox)
+    params["limit"] = limit + 1
+
+    with engine.connect() as conn:
+        rows = conn.execute(query, params).mappings().all()
+
+    results = [dict(r) for r in rows[:limit]]
+    return results, len(rows) > limit
+
+
+def fetch_tile_claims(bbox, limit: int):
+    """Claims inside bbox with the fields vector tiles carry, capped at limit."""
+    query = text(f"""
+    SELECT
+        id,
+        claim_id,
+        patta_holder_name,
+        village_name,
+        district,
+        state,
+        {STATUS_SQL} AS status,
+        land_use,
+        total_area_claimed,
+        lat,
+        lon
+    FROM fra_documents
+    WHERE {BBOX_FILTER}
+    ORDER BY id
+    LIMIT :limit
+    """)
+
+    params = _bbox_params(bbox)
+    params["limit"] = limit
+
+    with engine.connect() as conn:
+        return conn.execute(query, params).mappings().all()
+
+
+def fetch_nearby(lat: float, lon: float, radius_km: float, limit: int = MAX_POINTS_PER_VIEW):
+    """Claims within radius_km of a point, nearest first."""
+    d_lat = radius_km / 111.32
+    d_lon = radius_km / (111.32 * max(math.cos(math.radians(lat)), 1e-6))
+    bbox = (lon - d_lon, lat - d_lat, lon + d_lon, lat + d_lat)
+
+    # bbox prefilter hits ix_fra_documents_lat_lon, haversine trims the corners
+    query = text(f"""
+    SELECT * FROM (
+        SELECT {ATLAS_COLUMNS},
+            2 * 6371.0088 * asin(sqrt(
+                power(sin(radians(lat - :lat) / 2), 2)
+                + cos(radians(:lat)) * cos(radians(lat))
+                * power(sin(radians(lon - :lon) / 2), 2)
+            )) AS distance_km
+        FROM fra_documents
+        WHERE {BBOX_FILTER}
+    ) nearby
+    WHERE distance_km <= :radius_km
+    ORDER BY distance_km
+    LIMIT :limit
+    """)
+
+    params = _bbox_params(bbox)
+    params.update({"lat": lat, "lon": lon, "radius_km": radius_km, "limit": limit})
+
+    with engine.connect() as conn:
+        rows = conn.execute(query, params).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def get_viewport(bbox=None, zoom=None):
+    """Clusters at low zoom, individual claims at high zoom."""
+    bbox = bbox or WORLD_BBOX
+    zoom = CLUSTER_MAX_ZOOM + 1 if zoom is None else zoom
+
+    if zoom <= CLUSTER_MAX_ZOOM:
+        clusters, cell = fetch_clusters(bbox, zoom)
+        return {
+            "mode": "clusters",
+            "zoom": zoom,
+            "bbox": list(bbox),
+            "cell_size": cell,
+            "count": len(clusters),
+            "total": sum(c["count"] for c in clusters),
+            "clusters": clusters,
+        }
+
+    results, truncated = fetch_points(bbox)
+    return {
+        "mode": "points",
+        "zoom": zoom,
+        "bbox": list(bbox),
+        "count": len(results),
+        "truncated": truncated,
+        "results": results,
+    }
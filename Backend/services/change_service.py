@@ -0,0 +1,62 @@
+from sqlalchemy import text
+from db import engine
+
+
+# -------------------------
+# Table change counters (see migrations/002_change_tracking.sql, 013)
+# -------------------------
+
+def get_table_version(table_name: str):
+    """(version, changed_at) of a tracked table; (0, None) if never changed."""
+    query = text("""
+        SELECT version, changed_at
+        FROM table_changes
+        WHERE table_name = :table_name
+    """)
+    with engine.connect() as conn:
+        row = conn.execute(query, {"table_name": table_name}).first()
+    if not row:
+        return 0, None
+    return row[0], row[1]
+
+
+# -------------------------
+# Delta sync
+# -------------------------
+
+def current_watermark(conn) -> int:
+    """
+    Oldest transaction still running. Every row stamped with a smaller
+    change_txid is already visible, so "since=<watermark>" never misses a
+    late-committing write (it may resend a few rows, which clients upsert).
+    """
+    return conn.execute(
+        text("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+    ).scalar()
+
+
+def fetch_changes(columns: str, since: int, where: str = ""):
+    """
+    Rows of fra_documents written since the watermark plus ids deleted since.
+    Returns (rows, deleted_ids, new_watermark).
+    """
+    rows_query = text(f"""
+        SELECT {columns}
+        FROM fra_documents
+        WHERE change_txid >= :since
+        {where}
+        ORDER BY id
+    """)
+    tombstones_query = text("""
+        SELECT id
+        FROM fra_documents_tombstones
+        WHERE change_txid >= :since
+        ORDER BY id
+    """)
+
+    with engine.connect() as conn:
+        watermark = current_watermark(conn)
+        rows = conn.execute(rows_query, {"since": since}).mappings().all()
+        deleted = [r[0] for r in conn.execute(tombstones_query, {"since": since})]
+
+    return [dict(r) for r in rows], deleted, watermark
@@ -0,0 +1,224 @@
+import csv
+import io
+import os
+import time
+from decimal import Decimal, InvalidOperation
+
+import psycopg2
+
+from db import get_db_connection
+from services.dashboard_service import invalidate_dashboard_summary
+
+
+# -------------------------
+# Table specs
+# -------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATEWISE_CSV = os.getenv(
+    "STATEWISE_CSV", os.path.join(BASE_DIR, "..", "..", "data", "fra_all_states.csv")
+)
+
+# table -> key columns (for upserts) and column -> type ("text" | "int" | "numeric")
+STATEWISE_SPEC = {
+    "table": "fra_statewise_claims",
+    "key": ["state_name"],
+    "columns": {
+        "state_name": "text",
+        "claims_individual": "int",
+        "claims_community": "int",
+        "claims_total": "int",
+        "titles_individual": "int",
+        "titles_community": "int",
+        "titles_total": "int",
+        "land_individual_acres": "numeric",
+        "land_community_acres": "numeric",
+        "land_total_acres": "numeric",
+    },
+}
+
+LOAD_MODES = ("replace", "upsert")
+
+# placeholders published in place of a number
+NULL_TOKENS = {"", "na", "nr", "na/nr", "n/a", "-", "--", "nil"}
+
+
+# -------------------------
+# Row normalization
+# -------------------------
+def normalize_value(raw, kind: str):
+    """CSV cell -> typed value (None for NA/NR style placeholders)."""
+    if raw is None:
+        return None
+    value = raw.strip()
+    if value.lower() in NULL_TOKENS:
+        return None
+    if kind == "text":
+        return value
+
+    number = value.replace(",", "")
+    try:
+        parsed = Decimal(number)
+    except InvalidOperation:
+        raise ValueError(f"not a number: {raw!r}")
+    if not parsed.is_finite():
+        raise ValueError(f"not a number: {raw!r}")
+    if kind == "int":
+        if parsed != parsed.to_integral_value():
+            raise ValueError(f"not an integer: {raw!r}")
+        return int(parsed)
+    return parsed
+
+
+def _copy_lines(reader, spec: dict, stats: dict):
+    """Yield normalized CSV lines for COPY, validating one row at a time."""
+    columns = spec["columns"]
+    missing = [c for c in columns if c not in (reader.fieldnames or [])]
+    if missing:
+        stats["error"] = f"CSV is missing columns: {', '.join(missing)}"
+        raise ValueError(stats["error"])
+
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    for line_no, row in enumerate(reader, start=2):
+        values = []
+        for column, kind in columns.items():
+            try:
+                value = normalize_value(row.get(column), kind)
+            except ValueError as e:
+                stats["error"] = f"line {line_no}, {column}: {e}"
+                raise ValueError(stats["error"])
+            if value is None and (row.get(column) or "").strip():
+                stats["nulls"] += 1
+            values.append(value)
+
+        writer.writerow(values)  # None -> unquoted empty field -> NULL in COPY
+        stats["rows"] += 1
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+
+
+class _CopyStream:
+    """Minimal file object over a line generator, so COPY pulls rows lazily."""
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        have = len(self._buffer)
+        while size < 0 or have < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            have += len(line)
+        data = "".join(chunks)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+# -------------------------
+# Load
+# -------------------------
+def load_csv(fileobj, spec: dict, mode: str = "replace") -> dict:
+    """
+    Stream a CSV into spec["table"] atomically.
+
+    Rows are COPYed into a temporary staging table, then in the same
+    transaction either replace the table contents (mode="replace") or are
+    upserted on spec["key"] (mode="upsert"). Readers keep seeing the old
+    rows until the commit; a bad row aborts the whole load.
+    """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"mode must be one of {', '.join(LOAD_MODES)}")
+
+    table = spec["table"]
+    staging = f"{table}_staging"
+    columns = list(spec["columns"])
+    column_list = ", ".join(columns)
+    key = spec["key"]
+    key_match = " AND ".join(f"t.{k} = s.{k}" for k in key)
+
+    stats = {"table": table, "mode": mode, "rows": 0, "nulls": 0}
+    started = time.perf_counter()
+
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SET LOCAL statement_timeout = 0")
+        cur.execute(
+            f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+
+        reader = csv.DictReader(fileobj)
+        try:
+            cur.copy_expert(
+                f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)",
+                _CopyStream(_copy_lines(reader, spec, stats)),
+            )
+        except psycopg2.Error:
+            # psycopg2 wraps errors raised while reading the stream
+            if "error" in stats:
+                raise ValueError(stats["error"])
+            raise
+        cur.execute(f"ANALYZE {staging}")
+
+        if mode == "replace":
+            # one loader at a time, or two replaces could both delete then both insert;
+            # DELETE (not TRUNCATE) so dashboard reads are never blocked by the load
+            cur.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+            cur.execute(f"DELETE FROM {table}")
+            cur.execute(
+                f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging}"
+            )
+        else:
+            key_list = ", ".join(key)
+            cur.execute(
+                f"SELECT {key_list} FROM {staging} GROUP BY {key_list} HAVING COUNT(*) > 1 LIMIT 1"
+            )
+            duplicate = cur.fetchone()
+            if duplicate:
+                raise ValueError(f"duplicate key in CSV: {duplicate}")
+
+            # one loader at a time; readers are not blocked
+            cur.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+            assignments = ", ".join(f"{c} = s.{c}" for c in columns if c not in key)
+            cur.execute(f"UPDATE {table} t SET {assignments} FROM {staging} s WHERE {key_match}")
+            stats["updated"] = cur.rowcount
+            cur.execute(f"""
+                INSERT INTO {table} ({column_list})
+                SELECT {column_list} FROM {staging} s
+                WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {key_match})
+            """)
+            stats["inserted"] = cur.rowcount
+
+        conn.commit()
+        cur.close()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def load_statewise_csv(path: str = None, fileobj=None, mode: str = "replace") -> dict:
+    """Reload fra_statewise_claims from a CSV path or open text file and refresh the dashboard."""
+    if fileobj is not None:
+        stats = load_csv(fileobj, STATEWISE_SPEC, mode)
+    else:
+        with open(path or STATEWISE_CSV, newline="", encoding="utf-8-sig") as f:
+            stats = load_csv(f, STATEWISE_SPEC, mode)
+
+    invalidate_dashboard_summary()
+    return stats
@@ -0,0 +1,234 @@
+import json
+import os
+import threading
+import time
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from db import engine
+from utils.metrics import register_metrics
+
+try:
+    import redis
+except ImportError:  # optional shared cache
+    redis = None
+
+
+# -------------------------
+# Summary cache config
+# -------------------------
+SUMMARY_TTL_SECONDS = float(os.getenv("DASHBOARD_SUMMARY_TTL", "300"))
+# past the TTL an entry is still served (and refreshed in the background) for this long
+SUMMARY_STALE_SECONDS = float(os.getenv("DASHBOARD_SUMMARY_STALE", "3600"))
+
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_SUMMARY_KEY = "fra:dashboard:summary"
+
+_redis = redis.Redis.from_url(REDIS_URL) if redis is not None and REDIS_URL else None
+
+_entry = None                     # (summary, fetched_at)
+_generation = 0                   # bumped by invalidation; stale loads are discarded
+_entry_lock = threading.Lock()
+_load_lock = threading.Lock()     # single flight for synchronous loads
+_refreshing = False
+
+_stats = {
+    "hits": 0,
+    "stale_hits": 0,
+    "misses": 0,
+    "redis_hits": 0,
+    "refreshes": 0,
+    "refresh_errors": 0,
+    "invalidations": 0,
+}
+
+
+def _count(name):
+    with _entry_lock:
+        _stats[name] += 1
+
+
+def _plain(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+# -------------------------
+# Query
+# -------------------------
+def compute_dashboard_summary():
+    with engine.connect() as conn:
+        kpi_query = text("""
+            SELECT
+                SUM(claims_total) AS total_claims,
+                SUM(titles_total) AS verified_claims,
+                COUNT(state_name) AS states
+            FROM fra_statewise_claims;
+        """)
+        kpi = conn.execute(kpi_query).mappings().first()
+
+        state_query = text("""
+            SELECT
+                state_name,
+                claims_total,
+                titles_total,
+                ROUND(
+                    (titles_total::numeric / NULLIF(claims_total, 0)) * 100,
+                    2
+                ) AS progress
+            FROM fra_statewise_claims
+            ORDER BY claims_total DESC;
+        """)
+        states = conn.execute(state_query).mappings().all()
+
+    return {
+        "kpis": [
+            {"title": "Total Claims", "value": _plain(kpi["total_claims"])},
+            {"title": "Verified Claims", "value": _plain(kpi["verified_claims"])},
+            {"title": "States Covered", "value": kpi["states"]}
+        ],
+        "statewise": [{k: _plain(v) for k, v in row.items()} for row in states]
+    }
+
+
+# -------------------------
+# Loading (Redis first, then Postgres)
+# -------------------------
+def _read_redis():
+    if _redis is None:
+        return None
+    try:
+        raw = _redis.get(REDIS_SUMMARY_KEY)
+    except Exception as e:
+        print("⚠️ Redis read failed:", e)
+        return None
+    if not raw:
+        return None
+    payload = json.loads(raw)
+    return payload["summary"], payload["fetched_at"]
+
+
+def _write_redis(summary, fetched_at):
+    if _redis is None:
+        return
+    try:
+        _redis.set(
+            REDIS_SUMMARY_KEY,
+            json.dumps({"summary": summary, "fetched_at": fetched_at}),
+            ex=int(SUMMARY_TTL_SECONDS + SUMMARY_STALE_SECONDS),
+        )
+    except Exception as e:
+        print("⚠️ Redis write failed:", e)
+
+
+def _load(use_redis=True):
+    """Fresh-enough summary from Redis, or recompute it from Postgres."""
+    if use_redis:
+        shared = _read_redis()
+        if shared and time.time() - shared[1] < SUMMARY_TTL_SECONDS:
+            _count("redis_hits")
+            return shared
+
+    summary = compute_dashboard_summary()
+    fetched_at = time.time()
+    _write_redis(summary, fetched_at)
+    _count("refreshes")
+    return summary, fetched_at
+
+
+def _current_generation():
+    with _entry_lock:
+        return _generation
+
+
+def _store(entry, generation):
+    """Keep entry unless the cache was invalidated while it was loading."""
+    global _entry
+    with _entry_lock:
+        if generation == _generation:
+            _entry = entry
+
+
+def _refresh_in_background():
+    global _refreshing
+    try:
+        generation = _current_generation()
+        _store(_load(), generation)
+    except Exception as e:
+        _count("refresh_errors")
+        print("⚠️ Dashboard summary refresh failed:", e)
+    finally:
+        with _entry_lock:
+            _refreshing = False
+
+
+# -------------------------
+# Public API
+# -------------------------
+def get_dashboard_summary():
+    """
+    Cached dashboard summary. Fresh entries are served from memory; entries
+    past the TTL are served stale while one background refresh runs.
+    """
+    global _refreshing
+    now = time.time()
+    with _entry_lock:
+        entry = _entry
+        if entry is not None:
+            age = now - entry[1]
+            if age < SUMMARY_TTL_SECONDS:
+                _stats["hits"] += 1
+                return entry[0]
+            if age < SUMMARY_TTL_SECONDS + SUMMARY_STALE_SECONDS:
+                _stats["stale_hits"] += 1
+                start_refresh = not _refreshing
+                _refreshing = True
+            else:
+                entry = None
+
+    if entry is not None:
+        if start_refresh:
+            threading.Thread(target=_refresh_in_background, daemon=True).start()
+        return entry[0]
+
+    _count("misses")
+    with _load_lock:
+        with _entry_lock:
+            entry = _entry
+        if entry is None or time.time() - entry[1] >= SUMMARY_TTL_SECONDS:
+            generation = _current_generation()
+            entry = _load()
+            _store(entry, generation)
+    return entry[0]
+
+
+def invalidate_dashboard_summary(reload: bool = False):
+    """
+    Drop the cached summary after fra_statewise_claims changes (here and in
+    Redis). Other workers without Redis catch up within the TTL.
+    """
+    global _entry, _generation
+    with _entry_lock:
+        _entry = None
+        _generation += 1
+        _stats["invalidations"] += 1
+    if _redis is not None:
+        try:
+            _redis.delete(REDIS_SUMMARY_KEY)
+        except Exception as e:
+            print("⚠️ Redis invalidation failed:", e)
+    if reload:
+        generation = _current_generation()
+        _store(_load(use_redis=False), generation)
+
+
+def dashboard_cache_metrics():
+    with _entry_lock:
+        stats = dict(_stats)
+        stats["cached"] = _entry is not None
+        stats["age_seconds"] = round(time.time() - _entry[1], 1) if _entry else None
+    stats["redis"] = _redis is not None
+    return stats
+
+
+register_metrics("dashboard_summary", dashboard_cache_metrics)
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import threading
+import time
+
+from cachetools import TTLCache
+from fastapi.concurrency import run_in_threadpool
+
+from db import engine
+from services.change_service import current_watermark, fetch_changes, get_table_version
+from services.eligibility_service import find_eligible_claims, find_eligible_claims_many
+from services.scheme_registry import get_scheme_registry
+from utils.metrics import register_metrics
+
+
+# -------------------------
+# /dss/check result cache config
+# -------------------------
+DSS_CACHE_SIZE = int(os.getenv("DSS_CACHE_SIZE", "1024"))
+DSS_CACHE_TTL = float(os.getenv("DSS_CACHE_TTL", "300"))
+# catch-up with claims written by other processes (jobs.ingest_worker, other API workers)
+DSS_CACHE_REFRESH_SECONDS = float(os.getenv("DSS_CACHE_REFRESH_SECONDS", "10"))
+
+# (schemes version, scheme id, village, district, state) -> eligible claims
+_cache = TTLCache(maxsize=DSS_CACHE_SIZE, ttl=DSS_CACHE_TTL)
+_generation = 0                   # bumped by invalidation; results computed before it are dropped
+_cache_lock = threading.Lock()
+_version = None                   # fra_documents version at the last refresh
+_watermark = None
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "invalidations": 0,
+    "hit_seconds": 0.0,
+    "miss_seconds": 0.0,
+}
+
+
+def _norm(value) -> str:
+    return (value or "").strip().lower()
+
+
+def cache_key(scheme, village=None, district=None, state=None):
+    # a scheme change bumps the registry version, so old results are never reused
+    return (
+        get_scheme_registry().version,
+        scheme["id"],
+        _norm(village),
+        _norm(district),
+        _norm(state),
+    )
+
+
+# -------------------------
+# Lookup
+# -------------------------
+def get_eligible_claims(scheme, village=None, district=None, state=None):
+    """find_eligible_claims() through the LRU + TTL cache."""
+    started = time.perf_counter()
+    key = cache_key(scheme, village, district, state)
+
+    with _cache_lock:
+        results = _cache.get(key)
+        generation = _generation
+    if results is not None:
+        _record("hits", 1, started)
+        return results
+
+    results = find_eligible_claims(scheme, village=village, district=district, state=state)
+    with _cache_lock:
+        if generation == _generation:
+            _cache[key] = results
+    _record("misses", 1, started)
+    return results
+
+
+def get_eligible_claims_many(lookups):
+    """
+    get_eligible_claims() for a list of (scheme, village, district, state)
+    lookups. Identical filters are answered once and every cache miss is
+    fetched in one grouped query. Results come back in lookup order.
+    """
+    started = time.perf_counter()
+    keys = [cache_key(*lookup) for lookup in lookups]
+
+    with _cache_lock:
+        found = {key: _cache.get(key) for key in keys}
+        generation = _generation
+    missing = {}
+    for key, lookup in zip(keys, lookups):
+        if found[key] is None and key not in missing:
+            missing[key] = lookup
+    hits = sum(1 for r in found.values() if r is not None)
+    _record("hits", hits, started)
+
+    if missing:
+        started = time.perf_counter()
+        fetched = find_eligible_claims_many(list(missing.values()))
+        with _cache_lock:
+            for key, results in zip(missing, fetched):
+                found[key] = results
+                if generation == _generation:
+                    _cache[key] = results
+        _record("misses", len(missing), started)
+
+    return [found[key] for key in keys]
+
+
+def _record(outcome, count, started):
+    if not count:
+        return
+    elapsed = time.perf_counter() - started
+    with _cache_lock:
+        _stats[outcome] += count
+        _stats["hit_seconds" if outcome == "hits" else "miss_seconds"] += elapsed
+
+
+# -------------------------
+# Invalidation
+# -------------------------
+def _location_matches(key, village, district, state) -> bool:
+    """Would a claim at this location show up under the cached filters?"""
+    _, _, k_village, k_district, k_state = key
+    # same substring semantics as the LIKE filters in find_eligible_claims
+    return (
+        k_village in _norm(village)
+        and k_district in _norm(district)
+        and k_state in _norm(state)
+    )
+
+
+def invalidate_claim_location(village=None, district=None, state=None):
+    """Drop cached results a new claim at this location could change."""
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        stale = [k for k in list(_cache.keys()) if _location_matches(k, village, district, state)]
+        for key in stale:
+            _cache.pop(key, None)
+        _stats["invalidations"] += len(stale)
+
+
+def invalidate_scheme(scheme_id: int):
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        stale = [k for k in list(_cache.keys()) if k[1] == scheme_id]
+        for key in stale:
+            _cache.pop(key, None)
+        _stats["invalidations"] += len(stale)
+
+
+def clear_dss_cache():
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        _stats["invalidations"] += len(_cache)
+        _cache.clear()
+
+
+def refresh_dss_cache():
+    """
+    Invalidate cached answers that claims written by other processes could
+    change. publish_documents() only reaches this process's cache. Tombstones
+    carry no location, so a deletion clears the whole cache.
+    """
+    global _version, _watermark
+    version = get_table_version("fra_documents")[0]
+    if _watermark is None:
+        with engine.connect() as conn:
+            _watermark = current_watermark(conn)
+        _version = version
+        return
+    if version == _version:
+        return
+
+    rows, deleted, watermark = fetch_changes("village_name, district, state", _watermark)
+    if deleted:
+        clear_dss_cache()
+    else:
+        for village, district, state in {(r["village_name"], r["district"], r["state"]) for r in rows}:
+            invalidate_claim_location(village, district, state)
+    _version = version
+    _watermark = watermark
+
+
+async def run_dss_cache_refresh_loop():
+    while True:
+        try:
+            await run_in_threadpool(refresh_dss_cache)
+        except Exception as e:
+            print("⚠️ DSS cache refresh failed:", e)
+        await asyncio.sleep(DSS_CACHE_REFRESH_SECONDS)
+
+
+# -------------------------
+# Metrics
+# -------------------------
+def dss_cache_metrics():
+    with _cache_lock:
+        stats = dict(_stats)
+        size = len(_cache)
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "size": size,
+        "max_size": DSS_CACHE_SIZE,
+        "ttl_seconds": DSS_CACHE_TTL,
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else None,
+        "invalidations": stats["invalidations"],
+        "avg_hit_ms": round(stats["hit_seconds"] * 1000 / stats["hits"], 3) if stats["hits"] else None,
+        # a grouped batch query is amortized over the lookups it answered
+        "avg_miss_ms": round(stats["miss_seconds"] * 1000 / stats["misses"], 3) if stats["misses"] else None,
+    }
+
+
+register_metrics("dss_cache", dss_cache_metrics)
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import threading
+from collections import deque
+
+from fastapi.concurrency import run_in_threadpool
+
+from routers.dss_helpers import write_dss_logs
+from utils.metrics import register_metrics
+
+
+# -------------------------
+# Writer config
+# -------------------------
+DSS_LOG_BUFFER_SIZE = int(os.getenv("DSS_LOG_BUFFER_SIZE", "10000"))   # entries held before dropping
+DSS_LOG_BATCH_SIZE = int(os.getenv("DSS_LOG_BATCH_SIZE", "500"))       # rows per INSERT
+DSS_LOG_FLUSH_SECONDS = float(os.getenv("DSS_LOG_FLUSH_SECONDS", "2"))
+
+_buffer = deque()
+_buffer_lock = threading.Lock()
+_flush_lock = threading.Lock()   # one flush at a time (timer, size trigger, shutdown)
+
+_loop = None
+_wake = None
+
+_stats = {
+    "enqueued": 0,
+    "written": 0,
+    "dropped_overflow": 0,   # buffer full when the entry arrived
+    "dropped_errors": 0,     # lost in a failed INSERT
+    "flushes": 0,
+}
+
+
+# -------------------------
+# Producer side (request threads)
+# -------------------------
+def enqueue_dss_log(user_query: str, parsed: dict, scheme_id, count: int, sample: list):
+    """
+    Queue one dss_logs row; never blocks and never touches the database.
+    Serialization happens in the writer, off the request path.
+    """
+    with _buffer_lock:
+        if len(_buffer) >= DSS_LOG_BUFFER_SIZE:
+            _stats["dropped_overflow"] += 1
+            return
+        _buffer.append((user_query, parsed, scheme_id, count, sample))
+        _stats["enqueued"] += 1
+        full_batch = len(_buffer) % DSS_LOG_BATCH_SIZE == 0
+
+    if full_batch and _loop is not None:
+        _loop.call_soon_threadsafe(_wake.set)
+
+
+# -------------------------
+# Writer side
+# -------------------------
+def _take_batch():
+    with _buffer_lock:
+        n = min(len(_buffer), DSS_LOG_BATCH_SIZE)
+        return [_buffer.popleft() for _ in range(n)]
+
+
+def flush_dss_logs() -> int:
+    """Write everything buffered so far in multi-row INSERTs; returns rows written."""
+    written = 0
+    with _flush_lock:
+        while True:
+            batch = _take_batch()
+            if not batch:
+                break
+            try:
+                write_dss_logs(batch)
+                written += len(batch)
+                with _buffer_lock:
+                    _stats["written"] += len(batch)
+                    _stats["flushes"] += 1
+            except Exception as e:
+                with _buffer_lock:
+                    _stats["dropped_errors"] += len(batch)
+                print(f"⚠️ DSS log flush failed ({len(batch)} rows dropped):", e)
+                break
+    return written
+
+
+async def run_dss_log_writer():
+    """Flush every DSS_LOG_FLUSH_SECONDS, or as soon as a full batch is queued."""
+    global _loop, _wake
+    _loop = asyncio.get_running_loop()
+    _wake = asyncio.Event()
+    while True:
+        try:
+            await asyncio.wait_for(_wake.wait(), DSS_LOG_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+        await run_in_threadpool(flush_dss_logs)
+
+
+def dss_log_metrics():
+    with _buffer_lock:
+        stats = dict(_stats)
+        stats["buffered"] = len(_buffer)
+    stats["buffer_size"] = DSS_LOG_BUFFER_SIZE
+    return stats
+
+
+register_metrics("dss_log_writer", dss_log_metrics)
@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from db import engine
+from services.change_service import get_table_version
+from services.scheme_registry import get_scheme_registry
+from services.scheme_service import GENDER_SQL, normalize_gender
+
+
+# -------------------------
+# Matrix config
+# -------------------------
+MATRIX_CHECK_SECONDS = float(os.getenv("ELIGIBILITY_MATRIX_CHECK_SECONDS", "30"))
+MATRIX_CHUNK_SIZE = 50000   # claimant rows pulled per round trip while loading
+
+# Same columns / expressions the eligibility compiler uses, so the matrix
+# and /dss/check agree row for row (unknown area counts as 0 acres).
+CLAIMANT_QUERY = f"""
+    SELECT
+        id,
+        age_years::float8 AS age,
+        {GENDER_SQL} AS gender,
+        lower(coalesce(state, '')) AS state,
+        lower(coalesce(land_use, '')) AS land_use,
+        coalesce(area_acres, 0)::float8 AS acres
+    FROM fra_documents
+    ORDER BY id
+"""
+
+
+class _Categories:
+    """String column as int codes plus the list of distinct values."""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def code(self, value: str) -> int:
+        c = self._codes.get(value)
+        if c is None:
+            c = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return c
+
+    def codes_where(self, predicate) -> np.ndarray:
+        """Lookup table: code -> predicate(value)."""
+        return np.fromiter((predicate(v) for v in self.values), dtype=bool, count=len(self.values))
+
+
+class EligibilityMatrix:
+    """
+    Claimant attributes as columnar NumPy arrays and a boolean
+    (schemes x claimants) matrix, evaluated with vectorized masks.
+    """
+
+    def __init__(self, schemes, ids, age, acres, gender, state, land_use, categories):
+        self.schemes = schemes
+        self.ids = ids                  # sorted claim ids
+        self.age = age                  # float, NaN when unknown
+        self.acres = acres
+        self.gender = gender            # int codes into categories["gender"]
+        self.state = state
+        self.land_use = land_use
+        self.categories = categories
+        self.matrix = np.vstack([self.mask(s["criteria"]) for s in schemes]) if schemes \
+            else np.zeros((0, len(ids)), dtype=bool)
+        self.built_at = time.time()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def mask(self, criteria: dict) -> np.ndarray:
+        """Vectorized matches_criteria over every claimant."""
+        m = np.ones(len(self.ids), dtype=bool)
+
+        if criteria.get("land_use"):
+            needle = criteria["land_use"].lower()
+            table = self.categories["land_use"].codes_where(lambda v: bool(v) and needle in v)
+            m &= table[self.land_use]
+
+        with np.errstate(invalid="ignore"):  # NaN ages compare False, as "unknown age" does
+            if criteria.get("min_age") is not None:
+                m &= self.age >= int(criteria["min_age"])
+            if criteria.get("max_age") is not None:
+                m &= self.age <= int(criteria["max_age"])
+
+        if criteria.get("state"):
+            wanted = criteria["state"].lower()
+            m &= self.categories["state"].codes_where(lambda v: v == wanted)[self.state]
+
+        if criteria.get("gender"):
+            wanted = normalize_gender(criteria["gender"])
+            m &= self.categories["gender"].codes_where(lambda v: v == wanted)[self.gender]
+
+        if criteria.get("min_land_acres") is not None:
+            m &= self.acres >= float(criteria["min_land_acres"])
+        if criteria.get("max_land_acres") is not None:
+            m &= self.acres <= float(criteria["max_land_acres"])
+
+        return m
+
+    def counts(self, by: str = None):
+        """Eligible claimants per scheme, optionally split by state."""
+        totals = self.matrix.sum(axis=1)
+        results = []
+        for i, scheme in enumerate(self.schemes):
+            entry = {"scheme_id": scheme["id"], "name": scheme["name"], "eligible": int(totals[i])}
+            if by == "state":
+                per_code = np.bincount(self.state[self.matrix[i]], minlength=len(self.categories["state"].values))
+                entry["by_state"] = {
+                    state: int(n)
+                    for state, n in zip(self.categories["state"].values, per_code)
+                    if n
+                }
+            results.append(entry)
+        return results
+
+    def schemes_for(self, doc_id: int):
+        """Schemes one claimant is eligible for, or None for an unknown id."""
+        pos = np.searchsorted(self.ids, doc_id)
+        if pos >= len(self.ids) or self.ids[pos] != doc_id:
+            return None
+        return [
+            {"scheme_id": s["id"], "name": s["name"]}
+            for i, s in enumerate(self.schemes)
+            if self.matrix[i, pos]
+        ]
+
+
+# -------------------------
+# Build / refresh
+# -------------------------
+def load_schemes():
+    return [
+        {"id": s["id"], "name": s["name"], "criteria": s["eligibility"]}
+        for s in get_scheme_registry().all()
+    ]
+
+
+def build_eligibility_matrix(schemes=None) -> EligibilityMatrix:
+    schemes = load_schemes() if schemes is None else schemes
+    categories = {name: _Categories() for name in ("gender", "state", "land_use")}
+    ids, age, acres, gender, state, land_use = [], [], [], [], [], []
+
+    with engine.connect() as conn:
+        result = conn.execute(
+            text(CLAIMANT_QUERY),
+            execution_options={"stream_results": True, "yield_per": MATRIX_CHUNK_SIZE},
+        )
+        for row in result:
+            ids.append(row[0])
+            age.append(row[1])
+            gender.append(categories["gender"].code(row[2]))
+            state.append(categories["state"].code(row[3]))
+            land_use.append(categories["land_use"].code(row[4]))
+            acres.append(row[5])
+
+    return EligibilityMatrix(
+        schemes,
+        ids=np.array(ids, dtype=np.int64),
+        age=np.array(age, dtype=np.float64),   # None -> NaN
+        acres=np.array(acres, dtype=np.float64),
+        gender=np.array(gender, dtype=np.int32),
+        state=np.array(state, dtype=np.int32),
+        land_use=np.array(land_use, dtype=np.int32),
+        categories=categories,
+    )
+
+
+_matrix = None
+_matrix_key = None          # (fra_documents version, scheme fingerprint) it was built from
+_matrix_checked_at = 0.0
+_matrix_lock = threading.Lock()     # guards the three globals above; held only to read / swap them
+_rebuild_lock = threading.Lock()    # one check / rebuild at a time
+
+
+def _scheme_fingerprint(schemes):
+    return tuple((s["id"], s["name"], repr(sorted(s["criteria"].items()))) for s in schemes)
+
+
+def get_eligibility_matrix() -> EligibilityMatrix:
+    """
+    Shared matrix, rebuilt when claims or schemes have changed. Changes are
+    checked at most every MATRIX_CHECK_SECONDS. The rebuild runs outside
+    _matrix_lock: readers keep getting the previous matrix until the new
+    one is swapped in.
+    """
+    global _matrix, _matrix_key, _matrix_checked_at
+    with _matrix_lock:
+        matrix = _matrix
+        if matrix is not None and time.time() - _matrix_checked_at < MATRIX_CHECK_SECONDS:
+            return matrix
+
+    # someone else is already checking: serve the current matrix (wait only for the first)
+    if not _rebuild_lock.acquire(blocking=matrix is None):
+        return matrix
+    try:
+        with _matrix_lock:
+            if _matrix is not None and time.time() - _matrix_checked_at < MATRIX_CHECK_SECONDS:
+                return _matrix
+            matrix, matrix_key = _matrix, _matrix_key
+
+        schemes = load_schemes()
+        key = (get_table_version("fra_documents")[0], _scheme_fingerprint(schemes))
+        if matrix is None or key != matrix_key:
+            matrix = build_eligibility_matrix(schemes)
+
+        with _matrix_lock:
+            _matrix, _matrix_key = matrix, key
+            _matrix_checked_at = time.time()
+        return matrix
+    finally:
+        _rebuild_lock.release()
@@ -0,0 +1,189 @@
+from sqlalchemy import text
+
+from db import engine, insert_scheme, update_scheme
+from services.scheme_registry import mark_scheme_materialized
+from services.scheme_service import compile_eligibility, parse_eligibility
+from services.search_service import SEARCH_COLUMNS, like_pattern
+
+
+# -------------------------
+# Maintenance
+# -------------------------
+def materialize_scheme(conn, scheme_id: int, eligibility):
+    """
+    (Re)evaluate one scheme against every claim. Run inside the transaction
+    that creates / changes the scheme.
+    """
+    where, params = compile_eligibility(parse_eligibility(eligibility))
+    params["scheme_id"] = scheme_id
+
+    # uploads evaluating new claims wait, so none is judged against old criteria
+    conn.execute(text("LOCK TABLE claim_scheme_eligibility IN SHARE ROW EXCLUSIVE MODE"))
+    conn.execute(
+        text("DELETE FROM claim_scheme_eligibility WHERE scheme_id = :scheme_id"),
+        {"scheme_id": scheme_id},
+    )
+    conn.execute(text(f"""
+        INSERT INTO claim_scheme_eligibility (scheme_id, doc_id)
+        SELECT :scheme_id, id FROM fra_documents WHERE {where}
+    """), params)
+    return conn.execute(
+        text("""
+            UPDATE schemes SET eligibility_materialized_at = now()
+            WHERE id = :scheme_id
+            RETURNING eligibility_materialized_at
+        """),
+        {"scheme_id": scheme_id},
+    ).scalar()
+
+
+def materialize_scheme_now(scheme_id: int, eligibility):
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        return materialize_scheme(conn, scheme_id, eligibility)
+
+
+def save_scheme(name: str, description: str, eligibility, scheme_id: int = None):
+    """
+    Insert (scheme_id None) or update a scheme and re-materialize it in the
+    same transaction. Returns the scheme id, or None if scheme_id does not
+    exist. If materialization fails the scheme is still saved, unmaterialized,
+    and the first lookup retries it.
+    """
+    with engine.begin() as conn:
+        if scheme_id is None:
+            scheme_id = insert_scheme(name, description, eligibility, conn)
+        elif not update_scheme(scheme_id, name, description, eligibility, conn):
+            return None
+        try:
+            with conn.begin_nested():
+                conn.execute(text("SET LOCAL statement_timeout = 0"))
+                materialize_scheme(conn, scheme_id, eligibility)
+        except Exception as e:
+            print("⚠️ Eligibility materialization failed:", e)
+    return scheme_id
+
+
+def add_claim_eligibility(conn, doc_ids: list):
+    """
+    Evaluate just-inserted claims against every scheme, in a single
+    statement. Run inside the inserting transaction.
+    """
+    # taken before reading the criteria: a concurrent materialize_scheme()
+    # (SHARE ROW EXCLUSIVE) either finished first, so its criteria are read
+    # here, or waits for this commit and then re-evaluates these claims too
+    conn.execute(text("LOCK TABLE claim_scheme_eligibility IN ROW EXCLUSIVE MODE"))
+    schemes = conn.execute(text("SELECT id, eligibility FROM schemes")).all()
+    if not schemes or not doc_ids:
+        return
+
+    selects = []
+    params = {"doc_ids": list(doc_ids)}
+    for i, (scheme_id, eligibility) in enumerate(schemes):
+        where, scheme_params = compile_eligibility(parse_eligibility(eligibility), prefix=f"s{i}_")
+        selects.append(
+            f"SELECT {int(scheme_id)}, id FROM fra_documents WHERE id = ANY(:doc_ids) AND {where}"
+        )
+        params.update(scheme_params)
+
+    conn.execute(text(f"""
+        INSERT INTO claim_scheme_eligibility (scheme_id, doc_id)
+        {" UNION ALL ".join(selects)}
+        ON CONFLICT DO NOTHING
+    """), params)
+
+
+# -------------------------
+# Lookup
+# -------------------------
+def ensure_materialized(scheme):
+    """Schemes never evaluated yet are materialized before the first lookup."""
+    if not scheme.get("eligibility_materialized_at"):
+        materialized_at = materialize_scheme_now(scheme["id"], scheme.get("eligibility"))
+        mark_scheme_materialized(scheme["id"], materialized_at)
+
+
+def _claim_columns():
+    return ", ".join(f"d.{c.strip()}" for c in SEARCH_COLUMNS.split(","))
+
+
+def find_eligible_claims(scheme, village=None, district=None, state=None):
+    """
+    Eligible claims for a scheme from the materialized table, filtered by
+    location.
+    """
+    ensure_materialized(scheme)
+
+    query = f"""
+        SELECT {_claim_columns()}
+        FROM claim_scheme_eligibility e
+        JOIN fra_documents d ON d.id = e.doc_id
+        WHERE e.scheme_id = :scheme_id
+    """
+    params = {"scheme_id": scheme["id"]}
+
+    if state:
+        query += " AND LOWER(d.state) LIKE :state"
+        params["state"] = like_pattern(state.strip())
+
+    if district:
+        query += " AND LOWER(d.district) LIKE :district"
+        params["district"] = like_pattern(district.strip())
+
+    if village:
+        query += " AND LOWER(d.village_name) LIKE :village"
+        params["village"] = like_pattern(village.strip())
+
+    query += " ORDER BY d.created_at DESC"
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(query), params).mappings().all()
+
+    return [dict(r) for r in rows]
+
+
+def _location_pattern(value) -> str:
+    return like_pattern(value.strip()) if value else ""
+
+
+def find_eligible_claims_many(lookups):
+    """
+    find_eligible_claims() for many (scheme, village, district, state)
+    lookups in one grouped query. Returns one result list per lookup, in order.
+    """
+    if not lookups:
+        return []
+    for scheme in {s["id"]: s for s, _, _, _ in lookups}.values():
+        ensure_materialized(scheme)
+
+    # empty filter = no filter, as in find_eligible_claims
+    params = {
+        "idx": list(range(len(lookups))),
+        "scheme_ids": [s["id"] for s, _, _, _ in lookups],
+        "villages": [_location_pattern(v) for _, v, _, _ in lookups],
+        "districts": [_location_pattern(d) for _, _, d, _ in lookups],
+        "states": [_location_pattern(st) for _, _, _, st in lookups],
+    }
+    query = f"""
+        SELECT q.idx AS lookup_idx, {_claim_columns()}
+        FROM unnest(
+            CAST(:idx AS int[]),
+            CAST(:scheme_ids AS int[]),
+            CAST(:villages AS text[]),
+            CAST(:districts AS text[]),
+            CAST(:states AS text[])
+        ) AS q(idx, scheme_id, village, district, state)
+        JOIN claim_scheme_eligibility e ON e.scheme_id = q.scheme_id
+        JOIN fra_documents d ON d.id = e.doc_id
+        WHERE (q.state = '' OR LOWER(d.state) LIKE q.state)
+          AND (q.district = '' OR LOWER(d.district) LIKE q.district)
+          AND (q.village = '' OR LOWER(d.village_name) LIKE q.village)
+        ORDER BY q.idx, d.created_at DESC
+    """
+
+    results = [[] for _ in lookups]
+    with engine.connect() as conn:
+        for row in conn.execute(text(query), params).mappings():
+            row = dict(row)
+            results[row.pop("lookup_idx")].append(row)
+    return results
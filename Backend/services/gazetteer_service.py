@@ -0,0 +1,183 @@
+import asyncio
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from db import engine
+from services.change_service import current_watermark, fetch_changes
+from services.scheme_registry import get_scheme_registry, scheme_aliases
+from utils.aho_corasick import AhoCorasick, leftmost_longest, tokenize
+
+
+# -------------------------
+# Gazetteer config
+# -------------------------
+GAZETTEER_REFRESH_SECONDS = 60
+
+# every state and union territory, so a state is never mistaken for a district
+INDIAN_STATES = [
+    "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh", "Goa",
+    "Gujarat", "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka", "Kerala",
+    "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya", "Mizoram", "Nagaland",
+    "Odisha", "Punjab", "Rajasthan", "Sikkim", "Tamil Nadu", "Telangana", "Tripura",
+    "Uttar Pradesh", "Uttarakhand", "West Bengal",
+    "Andaman and Nicobar Islands", "Chandigarh", "Dadra and Nagar Haveli and Daman and Diu",
+    "Delhi", "Jammu and Kashmir", "Ladakh", "Lakshadweep", "Puducherry",
+]
+
+# public field -> fra_documents column, most to least general
+LOCATION_FIELDS = {
+    "state": "state",
+    "district": "district",
+    "village": "village_name",
+}
+
+MIN_NAME_LENGTH = 3
+# question words that should never be read as a place, even if a village is called that
+STOPWORDS = {
+    "who", "what", "which", "the", "for", "and", "all", "are", "is", "in", "of",
+    "eligible", "eligibility", "scheme", "schemes", "people", "list", "show", "find",
+    "district", "village", "state", "block",
+}
+
+_scheme_keywords = {}   # keyword -> scheme name, registered by the query parser
+
+
+def register_scheme_keywords(mapping: dict):
+    _scheme_keywords.update(mapping)
+
+
+# -------------------------
+# Gazetteer
+# -------------------------
+class Gazetteer:
+    """
+    Scheme aliases and every known state / district / village compiled into
+    one Aho-Corasick automaton; a question is resolved in a single pass.
+    """
+
+    def __init__(self, version=None, watermark=None):
+        self.version = version          # scheme registry version
+        self.watermark = watermark      # fra_documents delta-sync watermark of the place names
+        self._automaton = AhoCorasick()
+        self._entries = {}          # token tuple -> {kind: canonical value}
+        self.sizes = {kind: 0 for kind in ("scheme",) + tuple(LOCATION_FIELDS)}
+
+    @staticmethod
+    def _tokens(name: str):
+        """Token tuple a name is matched by, or None if it is too short / a stopword."""
+        tokens = tuple(tokenize(name or ""))
+        phrase = " ".join(tokens)
+        if not tokens or len(phrase) < MIN_NAME_LENGTH or phrase in STOPWORDS:
+            return None
+        return tokens
+
+    def add(self, kind: str, name: str, value: str = None):
+        tokens = self._tokens(name)
+        if tokens is None:
+            return
+        entry = self._entries.get(tokens)
+        if entry is None:
+            entry = self._entries[tokens] = {}
+            self._automaton.add(tokens, tokens)
+        if kind not in entry:
+            entry[kind] = value or name.strip()
+            self.sizes[kind] += 1
+
+    def build(self):
+        self._automaton.build()
+        return self
+
+    def knows(self, kind: str, name: str) -> bool:
+        """False if adding this name would change the gazetteer."""
+        tokens = self._tokens(name)
+        return tokens is None or kind in self._entries.get(tokens, ())
+
+    def parse(self, question: str) -> dict:
+        result = {"scheme": None, "village": None, "district": None, "state": None}
+        for _, _, tokens in leftmost_longest(self._automaton.search(tokenize(question))):
+            entry = self._entries[tokens]
+            if "scheme" in entry and result["scheme"] is None:
+                result["scheme"] = entry["scheme"]
+                continue
+            # a name that is both a district and a village fills the broader slot first
+            for kind in LOCATION_FIELDS:
+                if kind in entry and result[kind] is None:
+                    result[kind] = entry[kind]
+                    break
+        return result
+
+
+def build_gazetteer() -> Gazetteer:
+    registry = get_scheme_registry()
+    gazetteer = Gazetteer(registry.version)
+
+    for scheme in registry.all():
+        for alias in scheme_aliases(scheme["name"]):
+            gazetteer.add("scheme", alias, scheme["name"])
+    for keyword, scheme_name in _scheme_keywords.items():
+        gazetteer.add("scheme", keyword, scheme_name)
+
+    for state in INDIAN_STATES:
+        gazetteer.add("state", state)
+
+    with engine.connect() as conn:
+        gazetteer.watermark = current_watermark(conn)
+        for kind, column in LOCATION_FIELDS.items():
+            rows = conn.execute(text(f"""
+                SELECT {column} AS value
+                FROM fra_documents
+                WHERE {column} IS NOT NULL AND {column} <> ''
+                GROUP BY {column}
+                ORDER BY COUNT(*) DESC
+            """))
+            for (value,) in rows:
+                gazetteer.add(kind, value)  # most common spelling wins
+
+    return gazetteer.build()
+
+
+_gazetteer = Gazetteer().build()
+_gazetteer_lock = threading.Lock()
+
+
+def load_gazetteer():
+    global _gazetteer
+    gazetteer = build_gazetteer()
+    with _gazetteer_lock:
+        _gazetteer = gazetteer
+    print("✅ Gazetteer loaded:", gazetteer.sizes)
+
+
+def refresh_gazetteer():
+    """
+    Rebuild when schemes changed, or when claims written since the last
+    build carry a place name the gazetteer does not know yet. Other writes
+    only move the watermark: no scan of fra_documents. Places whose last
+    claim was deleted stay until the next rebuild.
+    """
+    gazetteer = get_gazetteer()
+    if gazetteer.watermark is None or gazetteer.version != get_scheme_registry().version:
+        load_gazetteer()
+        return
+
+    rows, _, watermark = fetch_changes(", ".join(LOCATION_FIELDS.values()), gazetteer.watermark)
+    if all(gazetteer.knows(kind, row[column]) for row in rows for kind, column in LOCATION_FIELDS.items()):
+        gazetteer.watermark = watermark
+    else:
+        load_gazetteer()
+
+
+async def run_gazetteer_refresh_loop():
+    while True:
+        await asyncio.sleep(GAZETTEER_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(refresh_gazetteer)
+        except Exception as e:
+            print("⚠️ Gazetteer refresh failed:", e)
+
+
+def get_gazetteer() -> Gazetteer:
+    with _gazetteer_lock:
+        return _gazetteer
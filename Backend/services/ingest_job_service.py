@@ -0,0 +1,336 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from db import engine
+from services.ingest_service import (
+    DUPLICATE_ACTION,
+    document_params,
+    find_duplicate,
+    insert_documents,
+    publish_documents,
+)
+from utils.llm_utils import clean_with_llm
+from utils.metrics import register_metrics
+from utils.ocr_utils import ocr_document
+
+
+# -------------------------
+# Job queue config
+# -------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INGEST_SPOOL_DIR = os.getenv("INGEST_SPOOL_DIR", os.path.join(BASE_DIR, "..", "ingest_spool"))
+
+# In-process workers; 0 = use jobs.ingest_worker. Documents stored there reach
+# this process's caches through the refresh loops instead of publish_documents():
+# DSS answers within DSS_CACHE_REFRESH_SECONDS, typeahead within
+# SUGGEST_REFRESH_SECONDS. Map tiles are dropped on disk, so TILE_CACHE_DIR
+# must be shared with the worker.
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+INGEST_RETRY_SECONDS = float(os.getenv("INGEST_RETRY_SECONDS", "30"))  # doubled after every failed attempt
+INGEST_JOB_TIMEOUT = float(os.getenv("INGEST_JOB_TIMEOUT", "600"))     # running longer = worker died, reclaim
+INGEST_POLL_SECONDS = float(os.getenv("INGEST_POLL_SECONDS", "2"))
+
+THROUGHPUT_WINDOW_SECONDS = 60
+
+# status: queued | running | done | duplicate (doc_id already held the file) | failed
+JOB_COLUMNS = "id, filename, status, attempts, doc_id, error, created_at, started_at, finished_at"
+
+CLAIM_SQL = text("""
+    UPDATE ingest_jobs
+    SET status = 'running', attempts = attempts + 1, started_at = now(), error = NULL
+    WHERE id = (
+        SELECT id FROM ingest_jobs
+        WHERE (status = 'queued' AND run_after <= now())
+           OR (status = 'running'
+               AND started_at < now() - make_interval(secs => :timeout)
+               AND attempts < :max_attempts)
+        ORDER BY id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, filename, spool_path, attempts
+""")
+
+# finish / fail updates only apply while the job is still ours: a job
+# reclaimed after INGEST_JOB_TIMEOUT has a higher attempts count
+OWNED_SQL = "id = :id AND status = 'running' AND attempts = :attempts"
+
+_loop = None
+_wake = None
+_stats_lock = threading.Lock()
+_completed_at = deque()           # finish times inside the throughput window
+
+_stats = {
+    "enqueued": 0,
+    "completed": 0,
+    "retried": 0,
+    "failed": 0,
+    "processing_seconds": 0.0,
+}
+
+
+# -------------------------
+# Producer side (upload requests)
+# -------------------------
+def enqueue_ingest_jobs(entries: list) -> list:
+    """
+    Spool each (filename, load) upload to disk and queue a job for it.
+    Returns [{"filename", "job_id"}] in input order.
+    """
+    os.makedirs(INGEST_SPOOL_DIR, exist_ok=True)
+    spooled = []
+    try:
+        for name, load in entries:
+            path = os.path.join(INGEST_SPOOL_DIR, uuid.uuid4().hex)
+            with open(path, "wb") as f:
+                f.write(load())
+            spooled.append((name, path))
+
+        with engine.begin() as conn:
+            job_ids = [
+                conn.execute(
+                    text("INSERT INTO ingest_jobs (filename, spool_path) VALUES (:filename, :path) RETURNING id"),
+                    {"filename": name, "path": path},
+                ).scalar()
+                for name, path in spooled
+            ]
+    except Exception:
+        for _, path in spooled:
+            _remove_spool_file(path)
+        raise
+
+    with _stats_lock:
+        _stats["enqueued"] += len(job_ids)
+    if _loop is not None:
+        _loop.call_soon_threadsafe(_wake.set)
+    return [{"filename": name, "job_id": job_id} for (name, _), job_id in zip(spooled, job_ids)]
+
+
+def get_ingest_job(job_id: int):
+    with engine.connect() as conn:
+        row = conn.execute(
+            text(f"SELECT {JOB_COLUMNS} FROM ingest_jobs WHERE id = :id"),
+            {"id": job_id},
+        ).mappings().first()
+    return dict(row) if row else None
+
+
+# -------------------------
+# Worker side
+# -------------------------
+class JobReclaimed(Exception):
+    """The job timed out and another worker claimed it while this one was still processing."""
+
+
+def _remove_spool_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def claim_ingest_job():
+    """Lock the next runnable job (queued, or abandoned by a dead worker)."""
+    with engine.begin() as conn:
+        # abandoned jobs out of attempts are failed instead of retried
+        abandoned = conn.execute(
+            text("""
+                UPDATE ingest_jobs
+                SET status = 'failed', error = 'worker timed out', finished_at = now()
+                WHERE status = 'running'
+                  AND started_at < now() - make_interval(secs => :timeout)
+                  AND attempts >= :max_attempts
+                RETURNING spool_path
+            """),
+            {"timeout": INGEST_JOB_TIMEOUT, "max_attempts": INGEST_MAX_ATTEMPTS},
+        ).scalars().all()
+        row = conn.execute(
+            CLAIM_SQL,
+            {"timeout": INGEST_JOB_TIMEOUT, "max_attempts": INGEST_MAX_ATTEMPTS},
+        ).mappings().first()
+    for path in abandoned:
+        _remove_spool_file(path)
+    return dict(row) if row else None
+
+
+def process_ingest_job(job: dict):
+    """OCR, extract and store one claimed job; retry with backoff on failure."""
+    started = time.perf_counter()
+    try:
+        with open(job["spool_path"], "rb") as f:
+            file_bytes = f.read()
+
+        # 1️⃣ Same scan uploaded before? (content hash → cached OCR / fields)
+        digest, action, cached = find_duplicate(file_bytes)
+        if action in ("process", "reuse"):
+            if action == "reuse":
+                data = cached["fields"]
+                source = (digest, cached["ocr_text"], data)
+            else:
+                # 2️⃣ OCR, pages spread over the shared worker process pool
+                ocr_text = ocr_document(file_bytes)
+
+                # 3️⃣ Extract fields / geocode
+                data = clean_with_llm(ocr_text)
+                source = (digest, ocr_text, data)
+            params = document_params(data)
+
+            # 4️⃣ Store the claim and finish the job in one transaction, so a
+            #    crash in between (or losing the job to a reclaim) never
+            #    stores the same file twice
+            duplicates = {}
+            with engine.begin() as conn:
+                doc_id = insert_documents(conn, [params], [source], duplicates)[0]
+                if not duplicates:
+                    _finish_job(job, "done", doc_id, conn)
+            if duplicates:
+                # a concurrent upload of the same bytes was stored first
+                action, cached = DUPLICATE_ACTION, {"doc_id": doc_id}
+            else:
+                publish_documents([doc_id], [params])
+
+        if action == "reject":
+            _fail_job(job, f"duplicate of document {cached['doc_id']}", retry=False)
+            return
+        if action == "existing":
+            _finish_job(job, "duplicate", cached["doc_id"])
+
+    except JobReclaimed:
+        # the new owner stores the file and removes the spool copy
+        print(f"⚠️ Ingest job {job['id']} was reclaimed by another worker; result dropped")
+        return
+    except Exception as e:
+        _fail_job(job, e)
+        return
+
+    _remove_spool_file(job["spool_path"])
+    with _stats_lock:
+        _stats["completed"] += 1
+        _stats["processing_seconds"] += time.perf_counter() - started
+        _completed_at.append(time.time())
+
+
+def _finish_job(job: dict, status: str, doc_id: int, conn=None):
+    """
+    status: 'done' (stored as doc_id) or 'duplicate' (doc_id already had it).
+    Raises JobReclaimed, rolling back conn's transaction, if the job is no longer ours.
+    """
+    if conn is None:
+        with engine.begin() as conn:
+            return _finish_job(job, status, doc_id, conn)
+    result = conn.execute(
+        text(f"""
+            UPDATE ingest_jobs
+            SET status = :status, doc_id = :doc_id, finished_at = now()
+            WHERE {OWNED_SQL}
+        """),
+        {"id": job["id"], "attempts": job["attempts"], "status": status, "doc_id": doc_id},
+    )
+    if result.rowcount == 0:
+        raise JobReclaimed(job["id"])
+
+
+def _fail_job(job: dict, error, retry: bool = None) -> bool:
+    """
+    Requeue the job, or fail it and remove its spool file; False if it was
+    reclaimed and is no longer ours.
+    """
+    if retry is None:
+        retry = job["attempts"] < INGEST_MAX_ATTEMPTS
+    with engine.begin() as conn:
+        result = conn.execute(
+            text(f"""
+                UPDATE ingest_jobs
+                SET status = :status,
+                    error = :error,
+                    run_after = now() + make_interval(secs => :delay),
+                    finished_at = CASE WHEN :status = 'failed' THEN now() END
+                WHERE {OWNED_SQL}
+            """),
+            {
+                "id": job["id"],
+                "attempts": job["attempts"],
+                "status": "queued" if retry else "failed",
+                "error": str(error),
+                "delay": INGEST_RETRY_SECONDS * 2 ** (job["attempts"] - 1),
+            },
+        )
+    if result.rowcount == 0:
+        return False
+    with _stats_lock:
+        _stats["retried" if retry else "failed"] += 1
+    if not retry:
+        _remove_spool_file(job["spool_path"])
+        print(f"⚠️ Ingest job {job['id']} ({job['filename']}) failed:", error)
+    return True
+
+
+async def run_ingest_worker():
+    """Claim and process jobs until cancelled; idle workers poll or wait for an enqueue."""
+    global _loop, _wake
+    if _wake is None:
+        _loop = asyncio.get_running_loop()
+        _wake = asyncio.Event()
+    while True:
+        try:
+            job = await run_in_threadpool(claim_ingest_job)
+        except Exception as e:
+            print("⚠️ Ingest job claim failed:", e)
+            job = None
+
+        if job is None:
+            try:
+                await asyncio.wait_for(_wake.wait(), INGEST_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            _wake.clear()
+            continue
+
+        try:
+            await run_in_threadpool(process_ingest_job, job)
+        except Exception as e:
+            # left 'running'; reclaimed after INGEST_JOB_TIMEOUT
+            print(f"⚠️ Ingest job {job['id']} could not be recorded:", e)
+
+
+# -------------------------
+# Metrics
+# -------------------------
+def ingest_job_metrics():
+    with engine.connect() as conn:
+        depth = dict(conn.execute(text("""
+            SELECT status, COUNT(*) FROM ingest_jobs
+            WHERE status IN ('queued', 'running')
+            GROUP BY status
+        """)).all())
+
+    now = time.time()
+    with _stats_lock:
+        while _completed_at and now - _completed_at[0] > THROUGHPUT_WINDOW_SECONDS:
+            _completed_at.popleft()
+        stats = dict(_stats)
+        recent = len(_completed_at)
+
+    return {
+        "queued": depth.get("queued", 0),
+        "running": depth.get("running", 0),
+        "workers": INGEST_WORKERS,
+        "enqueued": stats["enqueued"],
+        "completed": stats["completed"],
+        "retried": stats["retried"],
+        "failed": stats["failed"],
+        "completed_per_minute": recent * 60 / THROUGHPUT_WINDOW_SECONDS,
+        "avg_processing_ms": round(stats["processing_seconds"] * 1000 / stats["completed"], 1)
+        if stats["completed"] else None,
+    }
+
+
+register_metrics("ingest_jobs", ingest_job_metrics)
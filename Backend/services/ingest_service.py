@@ -0,0 +1,434 @@
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import xxhash
+from sqlalchemy import text
+
+from db import engine
+from services.dss_cache_service import invalidate_claim_location
+from services.eligibility_service import add_claim_eligibility
+from services.rollup_service import add_to_rollups
+from services.suggest_service import add_document_to_suggest_index
+from services.tile_service import invalidate_claim_tiles
+from utils.geo_utils import location_columns
+from utils.llm_utils import clean_with_llm
+from utils.metrics import register_metrics
+from utils.ocr_utils import OCR_WORKERS, extract_text_from_file, get_ocr_pool
+from utils.units import unit_columns
+
+
+# -------------------------
+# Ingest config
+# -------------------------
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "200"))       # rows per multi-row INSERT
+GEOCODE_WORKERS = int(os.getenv("GEOCODE_WORKERS", "4"))              # extraction + geocoding threads
+OCR_IN_FLIGHT = OCR_WORKERS * 2                                       # files buffered for the OCR pool
+
+# What a re-upload of already seen bytes does:
+#   return - answer with the existing document, store nothing (default)
+#   reuse  - store a new document from the cached OCR text / fields
+#   reject - refuse it as a duplicate
+DUPLICATE_POLICIES = ("return", "reuse", "reject")
+UPLOAD_DUPLICATE_POLICY = os.getenv("UPLOAD_DUPLICATE_POLICY", "return")
+if UPLOAD_DUPLICATE_POLICY not in DUPLICATE_POLICIES:
+    print(f"⚠️ Unknown UPLOAD_DUPLICATE_POLICY {UPLOAD_DUPLICATE_POLICY!r}, using 'return'")
+    UPLOAD_DUPLICATE_POLICY = "return"
+# what an upload of bytes already stored gets when the policy does not reuse them
+DUPLICATE_ACTION = "reject" if UPLOAD_DUPLICATE_POLICY == "reject" else "existing"
+
+_dedup_lock = threading.Lock()
+_dedup_stats = {"lookups": 0, "process": 0, "existing": 0, "reuse": 0, "reject": 0, "late": 0}
+
+DOCUMENT_COLUMNS = [
+    "patta_holder_name",
+    "father_or_husband_name",
+    "age",
+    "gender",
+    "address",
+    "village_name",
+    "block",
+    "district",
+    "state",
+    "total_area_claimed",
+    "age_years",
+    "area_acres",
+    "coordinates",
+    "lat",
+    "lon",
+    "geohash",
+    "land_use",
+    "claim_id",
+    "claim_type",
+    "date_of_application",
+    "water_bodies",
+    "forest_cover",
+    "homestead",
+]
+
+# Postgres allows 65535 bind parameters per statement: id + DOCUMENT_COLUMNS per row
+MAX_INSERT_ROWS = 65535 // (len(DOCUMENT_COLUMNS) + 1)
+INGEST_CHUNK_SIZE = min(INGEST_CHUNK_SIZE, MAX_INSERT_ROWS)
+
+
+def document_params(data: dict) -> dict:
+    """fra_documents column values for fields extracted by clean_with_llm."""
+    params = {
+        "patta_holder_name": data.get("Patta-Holder Name", ""),
+        "father_or_husband_name": data.get("Father/Husband Name", ""),
+        "age": int(data.get("Age")) if data.get("Age") else None,
+        "gender": data.get("Gender", ""),
+        "address": data.get("Address", ""),
+        "village_name": data.get("Village Name", ""),
+        "block": data.get("Block", ""),
+        "district": data.get("District", ""),
+        "state": data.get("State", ""),
+        "total_area_claimed": data.get("Total Area Claimed", ""),
+        "coordinates": data.get("Coordinates", ""),
+        "land_use": data.get("Land Use", ""),
+        "claim_id": data.get("Claim ID", ""),
+        "claim_type": data.get("Type of Claim", ""),
+        "date_of_application": data.get("Date of Application", ""),
+        "water_bodies": data.get("Water bodies", ""),
+        "forest_cover": data.get("Forest cover", ""),
+        "homestead": data.get("Homestead", "")
+    }
+    # Parse coordinates, age and area once into typed, indexed columns
+    params.update(location_columns(params["coordinates"]))
+    params.update(unit_columns(params["age"], params["total_area_claimed"]))
+    return params
+
+
+# -------------------------
+# Duplicate detection
+# -------------------------
+def content_hash(file_bytes: bytes) -> str:
+    return xxhash.xxh3_128_hexdigest(file_bytes)
+
+
+def find_duplicate(file_bytes: bytes):
+    """
+    (content hash, action, cached entry) for uploaded bytes. action is
+    'process' for new content, else what UPLOAD_DUPLICATE_POLICY says:
+    'existing', 'reuse' or 'reject'.
+    """
+    digest = content_hash(file_bytes)
+    with engine.begin() as conn:
+        cached = conn.execute(
+            text("""
+                UPDATE document_hashes
+                SET hits = hits + 1, last_seen_at = now()
+                WHERE content_hash = :hash
+                RETURNING ocr_text, fields, doc_id
+            """),
+            {"hash": digest},
+        ).mappings().first()
+
+    if cached is None:
+        action = "process"
+    elif cached["doc_id"] is None:
+        action = "reuse"     # the original document was deleted
+    elif UPLOAD_DUPLICATE_POLICY == "reject":
+        action = "reject"
+    elif UPLOAD_DUPLICATE_POLICY == "return":
+        action = "existing"
+    else:
+        action = "reuse"
+
+    with _dedup_lock:
+        _dedup_stats["lookups"] += 1
+        _dedup_stats[action] += 1
+    return digest, action, dict(cached) if cached else None
+
+
+def _late_duplicates(conn, sources: list) -> dict:
+    """
+    {index: doc id} for sources whose bytes a concurrent upload stored after
+    find_duplicate() looked. Holds a per-hash advisory lock until commit, so
+    of two uploads of the same new bytes only the first is stored.
+    """
+    if UPLOAD_DUPLICATE_POLICY == "reuse":
+        return {}
+    hashes = sorted({source[0] for source in sources if source is not None})
+    if not hashes:
+        return {}
+    # sorted, so two transactions never wait on each other's locks
+    conn.execute(
+        text("""
+            SELECT pg_advisory_xact_lock(hashtext(h))
+            FROM (SELECT h FROM unnest(CAST(:hashes AS TEXT[])) AS h ORDER BY h) AS ordered
+        """),
+        {"hashes": hashes},
+    )
+    stored = dict(conn.execute(
+        text("""
+            SELECT content_hash, doc_id FROM document_hashes
+            WHERE content_hash = ANY(:hashes) AND doc_id IS NOT NULL
+        """),
+        {"hashes": hashes},
+    ).all())
+    late = {
+        i: stored[source[0]]
+        for i, source in enumerate(sources)
+        if source is not None and source[0] in stored
+    }
+    if late:
+        with _dedup_lock:
+            _dedup_stats["late"] += len(late)
+    return late
+
+
+def _remember_sources(conn, doc_ids: list, sources: list):
+    rows = [
+        {"hash": source[0], "ocr_text": source[1], "fields": json.dumps(source[2]), "doc_id": doc_id}
+        for doc_id, source in zip(doc_ids, sources)
+        if source is not None
+    ]
+    if rows:
+        conn.execute(
+            text("""
+                INSERT INTO document_hashes (content_hash, ocr_text, fields, doc_id)
+                VALUES (:hash, :ocr_text, :fields, :doc_id)
+                ON CONFLICT (content_hash)
+                DO UPDATE SET doc_id = COALESCE(document_hashes.doc_id, EXCLUDED.doc_id)
+            """),
+            rows,
+        )
+
+
+def dedup_metrics():
+    with _dedup_lock:
+        stats = dict(_dedup_stats)
+    stats["policy"] = UPLOAD_DUPLICATE_POLICY
+    stats["ocr_skipped"] = stats["existing"] + stats["reuse"]
+    return stats
+
+
+register_metrics("upload_dedup", dedup_metrics)
+
+
+# -------------------------
+# Storage
+# -------------------------
+def _insert_sql(n: int):
+    rows = ", ".join(
+        f"(:id_{i}, " + ", ".join(f":{c}_{i}" for c in DOCUMENT_COLUMNS) + ", 'pending')"
+        for i in range(n)
+    )
+    return text(f"""
+        INSERT INTO fra_documents (id, {", ".join(DOCUMENT_COLUMNS)}, status)
+        OVERRIDING SYSTEM VALUE
+        VALUES {rows}
+        RETURNING id, created_at
+    """)
+
+
+def _insert_rows(conn, params_list: list) -> list:
+    """[(doc id, created_at)] in input order, for at most MAX_INSERT_ROWS documents."""
+    # ids are drawn up front: RETURNING order is not guaranteed to follow VALUES
+    doc_ids = conn.execute(
+        text("SELECT nextval(pg_get_serial_sequence('fra_documents', 'id')) FROM generate_series(1, :n)"),
+        {"n": len(params_list)},
+    ).scalars().all()
+    bind = {}
+    for i, (doc_id, params) in enumerate(zip(doc_ids, params_list)):
+        bind[f"id_{i}"] = doc_id
+        bind.update({f"{c}_{i}": params[c] for c in DOCUMENT_COLUMNS})
+    created = dict(conn.execute(_insert_sql(len(params_list)), bind).all())
+    return [(doc_id, created[doc_id]) for doc_id in doc_ids]
+
+
+def insert_documents(conn, params_list: list, sources: list = None, duplicates: dict = None) -> list:
+    """
+    Insert documents with multi-row INSERTs and update rollups and
+    scheme eligibility, all on the caller's transaction. sources holds a
+    (content hash, ocr text, fields) tuple per document, or None, for the
+    duplicate cache. Returns doc ids in input order.
+
+    A document whose bytes a concurrent upload stored first is skipped: its
+    slot holds that document's id, and its index is added to duplicates.
+    """
+    late = _late_duplicates(conn, sources) if sources else {}
+    if duplicates is not None:
+        duplicates.update(late)
+    new = [i for i in range(len(params_list)) if i not in late]
+    new_params = [params_list[i] for i in new]
+
+    inserted = []
+    for start in range(0, len(new_params), MAX_INSERT_ROWS):
+        inserted += _insert_rows(conn, new_params[start:start + MAX_INSERT_ROWS])
+    new_ids = [doc_id for doc_id, _ in inserted]
+    if new_ids:
+        # count them into the dashboard rollups in the same transaction
+        add_to_rollups(conn, [
+            {**params, "status": "pending", "created_at": created_at}
+            for params, (_, created_at) in zip(new_params, inserted)
+        ])
+        # evaluate the new claims against every scheme for /dss/check
+        add_claim_eligibility(conn, new_ids)
+        if sources:
+            _remember_sources(conn, new_ids, [sources[i] for i in new])
+
+    doc_ids = dict(late)
+    doc_ids.update(zip(new, new_ids))
+    return [doc_ids[i] for i in range(len(params_list))]
+
+
+def store_documents(params_list: list, sources: list = None, duplicates: dict = None) -> list:
+    """insert_documents() in its own transaction, then publish_documents()."""
+    if not params_list:
+        return []
+    if duplicates is None:
+        duplicates = {}
+    with engine.begin() as conn:
+        doc_ids = insert_documents(conn, params_list, sources, duplicates)
+    new = [i for i in range(len(params_list)) if i not in duplicates]
+    publish_documents([doc_ids[i] for i in new], [params_list[i] for i in new])
+    return doc_ids
+
+
+def publish_documents(doc_ids: list, params_list: list):
+    """Refresh in-process caches after committed inserts."""
+    for doc_id, params in zip(doc_ids, params_list):
+        # Drop cached map tiles that now show this claim
+        try:
+            invalidate_claim_tiles(params["lat"], params["lon"], params["total_area_claimed"])
+        except Exception as e:
+            print("⚠️ Tile invalidation failed:", e)
+
+        # Make the new names available to typeahead
+        add_document_to_suggest_index(doc_id, params)
+
+        # Cached /dss/check answers covering this location are now stale
+        invalidate_claim_location(params["village_name"], params["district"], params["state"])
+
+
+# -------------------------
+# Batch pipeline
+# -------------------------
+def _fail(entry: dict, error: Exception):
+    entry["status"] = "error"
+    entry["error"] = str(error)
+
+
+def _duplicate(entry: dict, action: str, doc_id: int):
+    entry["doc_id"] = doc_id
+    if action == "reject":
+        entry["status"] = "rejected"
+        entry["error"] = f"duplicate of document {doc_id}"
+    else:
+        entry["status"] = "duplicate"
+
+
+def _flush(pending: list, report: list):
+    """Write buffered (report index, params, source) entries as one chunk."""
+    if not pending:
+        return
+    duplicates = {}
+    try:
+        doc_ids = store_documents(
+            [params for _, params, _ in pending],
+            [source for _, _, source in pending],
+            duplicates,
+        )
+    except Exception as e:
+        for i, _, _ in pending:
+            _fail(report[i], e)
+    else:
+        for n, ((i, _, _), doc_id) in enumerate(zip(pending, doc_ids)):
+            if n in duplicates:
+                # stored by a concurrent upload while this one was in OCR
+                _duplicate(report[i], DUPLICATE_ACTION, doc_id)
+                continue
+            report[i]["status"] = "success"
+            report[i]["doc_id"] = doc_id
+    pending.clear()
+
+
+def ingest_files(files: list) -> list:
+    """
+    OCR, extract and store many files. files is a list of (filename,
+    load) pairs where load() returns the file bytes.
+
+    Already seen content is handled per UPLOAD_DUPLICATE_POLICY without
+    OCR. The rest fans out over the OCR process pool; extraction and
+    geocoding run on a thread pool as each OCR result arrives, and
+    finished documents are written INGEST_CHUNK_SIZE at a time. Returns
+    one report entry per file, in input order.
+    """
+    report = [{"filename": name, "status": "pending"} for name, _ in files]
+    todo = iter(enumerate(files))
+    ocr_pool = get_ocr_pool()
+    ocr_futures = {}
+    extract_futures = {}
+    pending = []
+    stored_params = {}        # report index -> params, for in-batch copies
+    batch_hashes = {}         # content hash -> first report index in this batch
+    copies = {}               # first report index -> later indexes with the same bytes
+
+    def buffer(i, params, source):
+        stored_params[i] = params
+        pending.append((i, params, source))
+        if len(pending) >= INGEST_CHUNK_SIZE:
+            _flush(pending, report)
+
+    def submit_next_ocr():
+        for i, (_, load) in todo:
+            try:
+                file_bytes = load()
+                digest, action, cached = find_duplicate(file_bytes)
+                if action == "process" and digest in batch_hashes:
+                    copies.setdefault(batch_hashes[digest], []).append(i)
+                elif action in ("existing", "reject"):
+                    _duplicate(report[i], action, cached["doc_id"])
+                elif action == "reuse":
+                    # the source re-points the hash at the new document if the old one was deleted
+                    buffer(i, document_params(cached["fields"]), (digest, cached["ocr_text"], cached["fields"]))
+                else:
+                    batch_hashes[digest] = i
+                    ocr_futures[ocr_pool.submit(extract_text_from_file, file_bytes)] = (i, digest)
+                    return
+            except Exception as e:
+                _fail(report[i], e)
+
+    with ThreadPoolExecutor(max_workers=GEOCODE_WORKERS) as extract_pool:
+        for _ in range(OCR_IN_FLIGHT):
+            submit_next_ocr()
+
+        while ocr_futures or extract_futures:
+            done, _ = wait(list(ocr_futures) + list(extract_futures), return_when=FIRST_COMPLETED)
+            for future in done:
+                # 1️⃣ OCR finished → extract fields / geocode on a thread
+                if future in ocr_futures:
+                    i, digest = ocr_futures.pop(future)
+                    submit_next_ocr()
+                    try:
+                        ocr_text = future.result()
+                        extract_futures[extract_pool.submit(clean_with_llm, ocr_text)] = (i, digest, ocr_text)
+                    except Exception as e:
+                        _fail(report[i], e)
+                    continue
+
+                # 2️⃣ Extraction finished → buffer for the next chunk insert
+                i, digest, ocr_text = extract_futures.pop(future)
+                try:
+                    data = future.result()
+                    buffer(i, document_params(data), (digest, ocr_text, data))
+                except Exception as e:
+                    _fail(report[i], e)
+
+        _flush(pending, report)
+
+    # 3️⃣ Same bytes more than once in this batch: follow the first copy
+    for first, later in copies.items():
+        for i in later:
+            if report[first]["status"] != "success":
+                report[i].update({k: v for k, v in report[first].items() if k != "filename"})
+            elif UPLOAD_DUPLICATE_POLICY == "reuse":
+                pending.append((i, stored_params[first], None))
+            else:
+                _duplicate(report[i], DUPLICATE_ACTION, report[first]["doc_id"])
+    _flush(pending, report)
+
+    return report
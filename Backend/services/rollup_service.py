@@ -0,0 +1,152 @@
+from collections import defaultdict
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from db import engine
+from utils.units import parse_area_to_acres
+
+
+# -------------------------
+# Rollup config
+# -------------------------
+# drill-down level -> grouping columns
+ROLLUP_LEVELS = {
+    "state": ["state"],
+    "district": ["state", "district"],
+    "village": ["state", "district", "village_name"],
+}
+ROLLUP_BREAKDOWNS = ("status", "claim_type", "land_use")
+ROLLUP_KEY = ("state", "district", "village_name", "day") + ROLLUP_BREAKDOWNS
+
+UPSERT_ROLLUP_SQL = text("""
+    INSERT INTO claim_rollups (
+        state, district, village_name, day, status, claim_type, land_use, claims, total_acres
+    )
+    VALUES (
+        :state, :district, :village_name, :day, :status, :claim_type, :land_use, :claims, :total_acres
+    )
+    ON CONFLICT (state, district, village_name, day, status, claim_type, land_use)
+    DO UPDATE SET
+        claims = claim_rollups.claims + EXCLUDED.claims,
+        total_acres = claim_rollups.total_acres + EXCLUDED.total_acres
+""")
+
+
+def claim_acres(doc: dict) -> float:
+    # typed column when present (not yet backfilled rows fall back to the text)
+    acres = doc.get("area_acres")
+    if acres is None:
+        acres = parse_area_to_acres(doc.get("total_area_claimed"))
+    return float(acres or 0.0)
+
+
+def _key(doc: dict):
+    day = doc.get("created_at") or date.today()
+    if isinstance(day, datetime):
+        day = day.date()
+    return tuple(day if col == "day" else (doc.get(col) or "").strip() for col in ROLLUP_KEY)
+
+
+def aggregate_documents(docs) -> list:
+    """Collapse documents into rollup deltas (one row per distinct key)."""
+    deltas = defaultdict(lambda: [0, 0.0])
+    for doc in docs:
+        delta = deltas[_key(doc)]
+        delta[0] += 1
+        delta[1] += claim_acres(doc)
+
+    rows = []
+    for key, (claims, acres) in deltas.items():
+        row = dict(zip(ROLLUP_KEY, key))
+        row["claims"] = claims
+        row["total_acres"] = round(acres, 4)
+        rows.append(row)
+    return rows
+
+
+# -------------------------
+# Maintenance
+# -------------------------
+def add_to_rollups(conn, docs):
+    """
+    Count just-inserted documents into claim_rollups. Call inside the
+    inserting transaction so the rollups never drift from fra_documents.
+    Each doc needs created_at plus the key columns.
+    """
+    rows = aggregate_documents(docs)
+    if rows:
+        conn.execute(UPSERT_ROLLUP_SQL, rows)
+
+
+def rebuild_rollups(chunk_size: int = 5000):
+    """Recompute claim_rollups from every document, atomically."""
+    columns = ", ".join(["created_at", "total_area_claimed", "area_acres"] + [c for c in ROLLUP_KEY if c != "day"])
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        # uploads wait for the rebuild, so none is counted twice or lost
+        conn.execute(text("LOCK TABLE claim_rollups IN EXCLUSIVE MODE"))
+        result = conn.execute(
+            text(f"SELECT {columns} FROM fra_documents"),
+            execution_options={"stream_results": True, "yield_per": chunk_size},
+        )
+        rows = aggregate_documents(dict(r) for r in result.mappings())
+        conn.execute(text("DELETE FROM claim_rollups"))
+        if rows:
+            conn.execute(UPSERT_ROLLUP_SQL, rows)
+    return len(rows)
+
+
+# -------------------------
+# Drill-down
+# -------------------------
+def fetch_rollups(level: str, state=None, district=None, village=None,
+                  since: date = None, until: date = None, by_day: bool = False):
+    """
+    Totals per level (optionally per day) with status / claim_type / land_use
+    breakdowns, read from claim_rollups only.
+    """
+    group_cols = list(ROLLUP_LEVELS[level]) + (["day"] if by_day else [])
+
+    where = []
+    params = {}
+    for column, value in (("state", state), ("district", district), ("village_name", village)):
+        if value:
+            where.append(f"{column} = :{column}")
+            params[column] = value
+    if since:
+        where.append("day >= :since")
+        params["since"] = since
+    if until:
+        where.append("day <= :until")
+        params["until"] = until
+    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+
+    select_cols = ", ".join(group_cols + list(ROLLUP_BREAKDOWNS))
+    query = text(f"""
+        SELECT {select_cols}, SUM(claims) AS claims, SUM(total_acres) AS total_acres
+        FROM claim_rollups
+        {where_sql}
+        GROUP BY {select_cols}
+    """)
+    with engine.connect() as conn:
+        rows = conn.execute(query, params).mappings().all()
+
+    groups = {}
+    for r in rows:
+        key = tuple(r[c] for c in group_cols)
+        g = groups.get(key)
+        if g is None:
+            g = dict(zip(group_cols, key))
+            g.update({"claims": 0, "total_acres": 0.0})
+            g.update({b: {} for b in ROLLUP_BREAKDOWNS})
+            groups[key] = g
+        g["claims"] += r["claims"]
+        g["total_acres"] += float(r["total_acres"])
+        for b in ROLLUP_BREAKDOWNS:
+            g[b][r[b]] = g[b].get(r[b], 0) + r["claims"]
+
+    results = sorted(groups.values(), key=lambda g: -g["claims"])
+    for g in results:
+        g["total_acres"] = round(g["total_acres"], 2)
+    return results
@@ -0,0 +1,139 @@
+import asyncio
+import re
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from db import engine
+from services.change_service import get_table_version
+from services.scheme_service import parse_eligibility
+
+
+# -------------------------
+# Registry config
+# -------------------------
+SCHEME_REFRESH_SECONDS = 10     # poll for scheme changes made by other workers
+
+# trailing words dropped to form a short alias ("Farm Support Scheme" -> "farm support")
+_GENERIC_SUFFIXES = ("scheme", "system", "yojana", "programme", "program")
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    return _SPACE_RE.sub(" ", (name or "").casefold()).strip()
+
+
+def scheme_aliases(name: str):
+    norm = normalize_name(name)
+    aliases = [norm]
+    words = norm.split(" ")
+    if len(words) > 1 and words[-1] in _GENERIC_SUFFIXES:
+        aliases.append(" ".join(words[:-1]))
+    return aliases
+
+
+# -------------------------
+# Registry snapshot
+# -------------------------
+class SchemeRegistry:
+    """
+    Snapshot of the schemes table at one version, with a name / alias
+    index and eligibility already parsed into dicts.
+    """
+
+    def __init__(self, schemes, version):
+        self.version = version
+        self.by_id = {s["id"]: s for s in schemes}
+        self._names = {}    # normalized name -> id (exact names win over aliases)
+        self._aliases = {}  # normalized alias -> id
+        for s in schemes:
+            self._names.setdefault(normalize_name(s["name"]), s["id"])
+            for alias in scheme_aliases(s["name"]):
+                self._aliases.setdefault(alias, s["id"])
+        # longest first, so "minor forest produce scheme" beats "forest"
+        self._text_keys = sorted(self._aliases, key=len, reverse=True)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def all(self):
+        return list(self.by_id.values())
+
+    def get(self, name: str):
+        """Scheme by exact (case-insensitive) name, then by alias."""
+        norm = normalize_name(name)
+        scheme_id = self._names.get(norm, self._aliases.get(norm))
+        return self.by_id.get(scheme_id)
+
+    def find_in_text(self, sentence: str):
+        """First scheme whose name or alias appears in free text."""
+        q = normalize_name(sentence)
+        for key in self._text_keys:
+            if key and key in q:
+                return self.by_id[self._aliases[key]]
+        return None
+
+
+_registry = SchemeRegistry([], None)
+_registry_lock = threading.Lock()
+
+
+# -------------------------
+# Load / refresh
+# -------------------------
+def load_scheme_registry():
+    """Read every scheme (run at startup and after scheme writes)."""
+    global _registry
+    query = text("""
+        SELECT id, name, description, eligibility, eligibility_materialized_at
+        FROM schemes
+        ORDER BY id
+    """)
+    version = get_table_version("schemes")[0]
+    with engine.connect() as conn:
+        rows = conn.execute(query).mappings().all()
+
+    schemes = []
+    for r in rows:
+        scheme = dict(r)
+        scheme["eligibility"] = parse_eligibility(r["eligibility"])
+        schemes.append(scheme)
+
+    registry = SchemeRegistry(schemes, version)
+    with _registry_lock:
+        _registry = registry
+    return registry
+
+
+def refresh_scheme_registry():
+    """Reload only if another worker bumped the schemes version."""
+    if get_table_version("schemes")[0] != _registry.version:
+        load_scheme_registry()
+
+
+async def run_scheme_registry_refresh_loop():
+    while True:
+        await asyncio.sleep(SCHEME_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(refresh_scheme_registry)
+        except Exception as e:
+            print("⚠️ Scheme registry refresh failed:", e)
+
+
+def get_scheme_registry() -> SchemeRegistry:
+    with _registry_lock:
+        return _registry
+
+
+def get_scheme(name: str):
+    return get_scheme_registry().get(name)
+
+
+def mark_scheme_materialized(scheme_id: int, materialized_at):
+    """Record a lazy materialization without waiting for the next reload."""
+    with _registry_lock:
+        scheme = _registry.by_id.get(scheme_id)
+        if scheme is not None:
+            scheme["eligibility_materialized_at"] = materialized_at
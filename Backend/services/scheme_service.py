@@ -1,6 +1,9 @@
-import re
+import ast
+import json
 from sqlalchemy import text
 from db import engine
+from services.search_service import SEARCH_COLUMNS, like_pattern
+from utils.units import parse_age, parse_area_to_acres
 
 
 # -------------------------
@@ -8,10 +11,7 @@ from db import engine
 # -------------------------
 
 def parse_acres_from_text(area_text: str) -> float:
-    if not area_text:
-        return 0.0
-    m = re.search(r"([\d\.]+)", str(area_text))
-    return float(m.group(1)) if m else 0.0
+    return parse_area_to_acres(area_text) or 0.0
 
 
 def normalize_gender(g: str) -> str:
@@ -36,12 +36,7 @@ def matches_criteria(record: dict, criteria: dict) -> bool:
             return False
 
     # --- Age ---
-    age = None
-    if record.get("age"):
-        try:
-            age = int(re.search(r"\d+", str(record["age"])).group(0))
-        except Exception:
-            age = None
+    age = parse_age(record.get("age"))
 
     if criteria.get("min_age") is not None:
         if age is None or age < int(criteria["min_age"]):
@@ -75,30 +70,104 @@ def matches_criteria(record: dict, criteria: dict) -> bool:
     return True
 
 
+# -------------------------
+# Eligibility -> SQL compiler
+# -------------------------
+# Age and area are read from the typed age_years / area_acres columns
+# (utils/units, filled at upload). GENDER_SQL is the SQL twin of
+# normalize_gender; migration 007 indexes that exact expression.
+GENDER_SQL = r"""(CASE
+        WHEN lower(btrim(coalesce(gender, ''), E' \t\r\n')) LIKE 'm%' THEN 'male'
+        WHEN lower(btrim(coalesce(gender, ''), E' \t\r\n')) LIKE 'f%' THEN 'female'
+        WHEN lower(btrim(coalesce(gender, ''), E' \t\r\n')) LIKE 'o%' THEN 'other'
+        ELSE lower(btrim(coalesce(gender, ''), E' \t\r\n'))
+    END)"""
+
+def parse_eligibility(raw) -> dict:
+    """Scheme eligibility as a dict, whether stored as JSON, a JSON string or a Python repr."""
+    if isinstance(raw, dict):
+        return raw
+    if not raw:
+        return {}
+    try:
+        parsed = json.loads(raw)
+    except (TypeError, ValueError):
+        try:
+            parsed = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def compile_eligibility(criteria: dict, prefix: str = "elig_"):
+    """
+    Compile eligibility criteria into (where_sql, params) selecting exactly
+    the rows matches_criteria() accepts. Unknown keys are ignored, as there.
+    """
+    clauses = []
+    params = {}
+
+    if criteria.get("land_use"):
+        clauses.append(f"land_use ILIKE :{prefix}land_use")
+        params[f"{prefix}land_use"] = like_pattern(criteria["land_use"])
+
+    if criteria.get("min_age") is not None:
+        clauses.append(f"age_years >= :{prefix}min_age")
+        params[f"{prefix}min_age"] = int(criteria["min_age"])
+
+    if criteria.get("max_age") is not None:
+        clauses.append(f"age_years <= :{prefix}max_age")
+        params[f"{prefix}max_age"] = int(criteria["max_age"])
+
+    if criteria.get("state"):
+        clauses.append(f"lower(state) = :{prefix}state")
+        params[f"{prefix}state"] = criteria["state"].lower()
+
+    if criteria.get("gender"):
+        clauses.append(f"{GENDER_SQL} = :{prefix}gender")
+        params[f"{prefix}gender"] = normalize_gender(criteria["gender"])
+
+    # an unknown area counts as 0 acres, as in matches_criteria
+    if criteria.get("min_land_acres") is not None:
+        clauses.append(
+            f"(area_acres >= :{prefix}min_land_acres"
+            f" OR (area_acres IS NULL AND :{prefix}min_land_acres <= 0))"
+        )
+        params[f"{prefix}min_land_acres"] = float(criteria["min_land_acres"])
+
+    if criteria.get("max_land_acres") is not None:
+        clauses.append(
+            f"(area_acres <= :{prefix}max_land_acres"
+            f" OR (area_acres IS NULL AND :{prefix}max_land_acres >= 0))"
+        )
+        params[f"{prefix}max_land_acres"] = float(criteria["max_land_acres"])
+
+    return (" AND ".join(clauses) or "TRUE"), params
+
+
 # -------------------------
 # MAIN DSS FUNCTION
 # -------------------------
 
 def find_eligible_people_by_scheme(scheme, village=None, district=None, state=None):
-    base_query = """
-        SELECT *
+    where, params = compile_eligibility(parse_eligibility(scheme.get("eligibility")))
+    base_query = f"""
+        SELECT {SEARCH_COLUMNS}
         FROM fra_documents
-        WHERE land_use ILIKE '%Homestead%'
+        WHERE {where}
     """
 
-    params = {}
-
     if state:
-        base_query += " AND LOWER(state) LIKE LOWER(:state)"
-        params["state"] = f"%{state.strip().lower()}%"
+        base_query += " AND LOWER(state) LIKE :state"
+        params["state"] = like_pattern(state.strip())
 
     if district:
-        base_query += " AND LOWER(district) LIKE LOWER(:district)"
-        params["district"] = f"%{district.strip().lower()}%"
+        base_query += " AND LOWER(district) LIKE :district"
+        params["district"] = like_pattern(district.strip())
 
     if village:
-        base_query += " AND LOWER(village_name) LIKE LOWER(:village)"
-        params["village"] = f"%{village.strip().lower()}%"
+        base_query += " AND LOWER(village_name) LIKE :village"
+        params["village"] = like_pattern(village.strip())
 
     base_query += " ORDER BY created_at DESC"
 
@@ -0,0 +1,117 @@
+import re
+from sqlalchemy import text
+from db import engine
+
+
+# -------------------------
+# Search config
+# -------------------------
+DEFAULT_SEARCH_RESULTS = 20
+MAX_SEARCH_RESULTS = 100        # hard cap, ranked results only
+
+SEARCH_COLUMNS = """
+        id,
+        patta_holder_name,
+        father_or_husband_name,
+        age,
+        gender,
+        address,
+        village_name,
+        block,
+        district,
+        state,
+        total_area_claimed,
+        coordinates,
+        lat,
+        lon,
+        land_use,
+        claim_id,
+        claim_type,
+        date_of_application,
+        water_bodies,
+        forest_cover,
+        homestead,
+        status,
+        created_at
+"""
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# -------------------------
+# Helpers
+# -------------------------
+
+def prefix_tsquery(q: str) -> str:
+    """'ram kumar' -> 'ram:* & kumar:*' (every word as a prefix)."""
+    tokens = _TOKEN_RE.findall(q.lower())
+    return " & ".join(f"{t}:*" for t in tokens)
+
+
+def like_pattern(q: str) -> str:
+    escaped = q.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def filter_clause(status=None, state=None, district=None):
+    """Extra ILIKE filters shared by ranked search and plain listing."""
+    clause = ""
+    params = {}
+    if status:
+        clause += " AND status ILIKE :status"
+        params["status"] = f"%{status}%"
+    if state:
+        clause += " AND state ILIKE :state"
+        params["state"] = f"%{state}%"
+    if district:
+        clause += " AND district ILIKE :district"
+        params["district"] = f"%{district}%"
+    return clause, params
+
+
+# -------------------------
+# Ranked search
+# -------------------------
+
+def search_documents(q: str, status=None, state=None, district=None, limit: int = DEFAULT_SEARCH_RESULTS):
+    """
+    Ranked search over the per-claim search document (name, village,
+    district, state, claim_id). Candidates come from three indexed paths:
+      - prefix full-text match on search_tsv (GIN)
+      - trigram word similarity on search_text, tolerant of typos (GIN trgm)
+      - substring match on search_text, e.g. partial claim ids (GIN trgm)
+    Results are ordered by combined score and capped at MAX_SEARCH_RESULTS.
+    """
+    q = q.strip()
+    tsq = prefix_tsquery(q)
+    if not tsq:
+        return []
+
+    limit = min(limit, MAX_SEARCH_RESULTS)
+    filters, params = filter_clause(status, state, district)
+
+    query = text(f"""
+        SELECT {SEARCH_COLUMNS},
+            ts_rank(search_tsv, query)
+            + word_similarity(:q, search_text)
+            + CASE WHEN search_text LIKE :like THEN 1 ELSE 0 END AS score
+        FROM fra_documents, to_tsquery('simple', :tsq) AS query
+        WHERE (
+            search_tsv @@ query
+            OR :q <% search_text
+            OR search_text LIKE :like
+        )
+        {filters}
+        ORDER BY score DESC, id
+        LIMIT :limit
+    """)
+    params.update({
+        "q": q.lower(),
+        "tsq": tsq,
+        "like": like_pattern(q),
+        "limit": limit,
+    })
+
+    with engine.connect() as conn:
+        rows = conn.execute(query, params).mappings().all()
+    return [dict(r) for r in rows]
@@ -0,0 +1,259 @@
+import asyncio
+import heapq
+import re
+import threading
+from bisect import bisect_left
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from db import engine
+from services.change_service import current_watermark, fetch_changes
+
+
+# -------------------------
+# Suggest config
+# -------------------------
+# public field name -> fra_documents column
+SUGGEST_FIELDS = {
+    "state": "state",
+    "district": "district",
+    "village": "village_name",
+    "holder": "patta_holder_name",
+}
+
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+MAX_SCAN = 2000                 # wider prefix ranges are ranked once and cached
+SUGGEST_REFRESH_SECONDS = 30    # catch-up with rows written by other workers
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_key(value: str) -> str:
+    return _SPACE_RE.sub(" ", value.casefold()).strip()
+
+
+def _word_suffixes(norm: str):
+    words = norm.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+# -------------------------
+# Prefix index
+# -------------------------
+class PrefixIndex:
+    """
+    Sorted array of normalized keys with a parallel array of value ids.
+    Every value is indexed from each of its word starts, so "kumar" finds
+    "Ram Kumar". Lookups are two bisects plus a bounded scan.
+    """
+
+    def __init__(self):
+        self._keys = []          # sorted normalized keys
+        self._key_values = []    # value id per key
+        self._value_ids = {}     # normalized value -> value id
+        self._display = []       # value id -> display text
+        self._counts = []        # value id -> documents carrying it
+        self._wide = {}          # prefix -> top MAX_SUGGESTIONS value ids, for ranges over MAX_SCAN
+
+    def __len__(self):
+        return len(self._display)
+
+    def add(self, value: str, count: int = 1):
+        if not value or not value.strip():
+            return
+        norm = normalize_key(value)
+        self._wide.clear()
+        vid = self._value_ids.get(norm)
+        if vid is not None:
+            self._counts[vid] += count
+            return
+
+        vid = len(self._display)
+        self._value_ids[norm] = vid
+        self._display.append(value.strip())
+        self._counts.append(count)
+
+        for key in _word_suffixes(norm):
+            pos = bisect_left(self._keys, key)
+            self._keys.insert(pos, key)
+            self._key_values.insert(pos, vid)
+
+    def load(self, values):
+        """Bulk add of (value, count) pairs: keys are sorted once, not inserted one by one."""
+        self._wide.clear()
+        pairs = []
+        for value, count in values:
+            if not value or not value.strip():
+                continue
+            norm = normalize_key(value)
+            vid = self._value_ids.get(norm)
+            if vid is not None:
+                self._counts[vid] += count
+                continue
+            vid = len(self._display)
+            self._value_ids[norm] = vid
+            self._display.append(value.strip())
+            self._counts.append(count)
+            pairs.extend((key, vid) for key in _word_suffixes(norm))
+
+        pairs.extend(zip(self._keys, self._key_values))
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._key_values = [vid for _, vid in pairs]
+
+    def search(self, prefix: str, limit: int):
+        """[(display, count)] for values with a word starting with prefix, most common first."""
+        prefix = normalize_key(prefix)
+        if not prefix:
+            return []
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\uffff", lo)
+
+        if hi - lo > MAX_SCAN:
+            # short prefixes: rank the whole range once, until the next add
+            best = self._wide.get(prefix)
+            if best is None:
+                best = self._rank(lo, hi, MAX_SUGGESTIONS)
+                self._wide[prefix] = best
+            best = best[:limit]
+        else:
+            best = self._rank(lo, hi, limit)
+        return [(self._display[v], self._counts[v]) for v in best]
+
+    def _rank(self, lo: int, hi: int, limit: int):
+        vids = set(self._key_values[lo:hi])
+        return heapq.nlargest(limit, vids, key=lambda v: (self._counts[v], -v))
+
+
+_indexes = {field: PrefixIndex() for field in SUGGEST_FIELDS}
+_index_lock = threading.Lock()
+_watermark = None
+_indexed = bytearray()  # 1 per document id already counted in the indexes
+_local_ids = set()      # docs this worker indexed at upload, not yet seen by a refresh
+_seen_txids = {}        # doc id -> change_txid from the last refresh, which the next one may resend
+
+
+# -------------------------
+# Build / incremental updates
+# -------------------------
+
+def _mark_indexed(indexed: bytearray, doc_id: int):
+    if doc_id >= len(indexed):
+        indexed.extend(bytes(max(doc_id + 1 - len(indexed), len(indexed) // 2)))
+    indexed[doc_id] = 1
+
+
+def _is_indexed(doc_id: int) -> bool:
+    return doc_id < len(_indexed) and _indexed[doc_id] == 1
+
+
+def load_suggest_index():
+    """Build every prefix index from fra_documents (at startup, and after updates / deletes)."""
+    global _indexes, _watermark, _indexed, _seen_txids
+
+    fresh = {field: PrefixIndex() for field in SUGGEST_FIELDS}
+    # one snapshot for the counts, the id bitmap and the watermark; set through
+    # execution_options since pool_pre_ping has already begun a transaction
+    with engine.connect().execution_options(isolation_level="REPEATABLE READ") as conn:
+        watermark = current_watermark(conn)
+        for field, column in SUGGEST_FIELDS.items():
+            rows = conn.execute(text(f"""
+                SELECT {column} AS value, COUNT(*) AS n
+                FROM fra_documents
+                WHERE {column} IS NOT NULL AND {column} <> ''
+                GROUP BY {column}
+            """))
+            fresh[field].load(rows)
+
+        # ids counted above, so a later refresh can tell a new row from an edited one
+        indexed = bytearray((conn.execute(text("SELECT MAX(id) FROM fra_documents")).scalar() or 0) + 1)
+        for doc_id in conn.execute(text("SELECT id FROM fra_documents")).scalars():
+            indexed[doc_id] = 1
+
+    with _index_lock:
+        _indexes = fresh
+        _watermark = watermark
+        _indexed = indexed
+        _local_ids.clear()
+        _seen_txids = {}
+
+    print("✅ Suggest index loaded:", {f: len(i) for f, i in fresh.items()})
+
+
+def add_document_to_suggest_index(doc_id: int, params: dict):
+    """Index the names of a just-inserted document."""
+    with _index_lock:
+        if _is_indexed(doc_id):
+            return      # a refresh already picked it up
+        for field, column in SUGGEST_FIELDS.items():
+            _indexes[field].add(params.get(column) or "")
+        _mark_indexed(_indexed, doc_id)
+        _local_ids.add(doc_id)
+
+
+def refresh_suggest_index():
+    """
+    Add documents inserted by other workers since the last refresh. Counts
+    cannot be diffed for an edited or deleted document (its old values are
+    not kept), so any of those rebuilds the whole index instead.
+    """
+    global _watermark, _seen_txids
+    if _watermark is None:
+        return
+
+    columns = "id, change_txid, " + ", ".join(SUGGEST_FIELDS.values())
+    rows, deleted, watermark = fetch_changes(columns, _watermark)
+
+    with _index_lock:
+        new_rows = []
+        for row in rows:
+            doc_id = row["id"]
+            if doc_id in _local_ids or _seen_txids.get(doc_id) == row["change_txid"]:
+                continue    # indexed at upload, or resent by delta sync
+            if _is_indexed(doc_id):
+                break       # an edited document
+            new_rows.append(row)
+        else:
+            if not any(_is_indexed(doc_id) for doc_id in deleted):
+                for row in new_rows:
+                    for field, column in SUGGEST_FIELDS.items():
+                        _indexes[field].add(row[column] or "")
+                    _mark_indexed(_indexed, row["id"])
+
+                # delta sync may resend rows at or above the new watermark; remember them
+                _local_ids.difference_update(row["id"] for row in rows)
+                _seen_txids = {
+                    row["id"]: row["change_txid"] for row in rows if row["change_txid"] >= watermark
+                }
+                _watermark = watermark
+                return
+
+    load_suggest_index()
+
+
+async def run_suggest_refresh_loop():
+    while True:
+        await asyncio.sleep(SUGGEST_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(refresh_suggest_index)
+        except Exception as e:
+            print("⚠️ Suggest index refresh failed:", e)
+
+
+# -------------------------
+# Lookup
+# -------------------------
+
+def suggest(q: str, field: str = None, limit: int = DEFAULT_SUGGESTIONS):
+    """Top suggestions for a prefix, from one field or across all of them."""
+    fields = [field] if field else list(SUGGEST_FIELDS)
+    results = []
+    with _index_lock:
+        for f in fields:
+            for value, count in _indexes[f].search(q, limit):
+                results.append({"field": f, "value": value, "count": count})
+    if len(fields) > 1:
+        results = heapq.nlargest(limit, results, key=lambda r: r["count"])
+    return results
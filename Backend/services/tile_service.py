@@ -0,0 +1,197 @@
+import os
+import threading
+from cachetools import LRUCache
+
+from services.atlas_service import fetch_tile_claims
+from utils.geo_utils import (
+    make_square_polygon,
+    lonlat_to_world,
+    tile_bounds,
+)
+from utils.units import parse_area_to_m2
+from utils.mvt_utils import encode_tile, POINT, POLYGON
+
+
+# -------------------------
+# Tile config
+# -------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TILE_CACHE_DIR = os.getenv("TILE_CACHE_DIR", os.path.join(BASE_DIR, "..", "tile_cache"))
+TILE_MEMORY_CACHE_SIZE = int(os.getenv("TILE_MEMORY_CACHE_SIZE", "2048"))
+
+MAX_TILE_ZOOM = 18
+POLYGON_MIN_ZOOM = 12          # claim squares are sub-pixel below this
+MAX_FEATURES_PER_TILE = 5000
+TILE_BUFFER = 1 / 16           # fraction of a tile rendered past each edge
+
+POINTS_LAYER = "claims"
+POLYGONS_LAYER = "claim_polygons"
+
+# (z, x, y) -> (tile bytes, mtime of the on-disk copy it was read/written as)
+_memory_cache = LRUCache(maxsize=TILE_MEMORY_CACHE_SIZE)
+_cache_lock = threading.Lock()
+
+
+# -------------------------
+# Rendering
+# -------------------------
+def _buffered_bounds(z, x, y):
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y)
+    pad_lon = (max_lon - min_lon) * TILE_BUFFER
+    pad_lat = (max_lat - min_lat) * TILE_BUFFER
+    return (min_lon - pad_lon, min_lat - pad_lat, max_lon + pad_lon, max_lat + pad_lat)
+
+
+def render_tile(z: int, x: int, y: int) -> bytes:
+    """Encode the claims of one tile as an MVT with point and polygon layers."""
+    rows = fetch_tile_claims(_buffered_bounds(z, x, y), MAX_FEATURES_PER_TILE)
+
+    points, polygons = [], []
+    for r in rows:
+        props = {
+            "claim_id": r["claim_id"],
+            "patta_holder_name": r["patta_holder_name"],
+            "village_name": r["village_name"],
+            "district": r["district"],
+            "state": r["state"],
+            "status": r["status"],
+            "land_use": r["land_use"],
+            "total_area_claimed": r["total_area_claimed"],
+        }
+        props = {k: v for k, v in props.items() if v not in (None, "")}
+
+        points.append({
+            "id": r["id"],
+            "type": POINT,
+            "geometry": (r["lon"], r["lat"]),
+            "properties": props,
+        })
+
+        if z >= POLYGON_MIN_ZOOM:
+            area_m2 = parse_area_to_m2(r["total_area_claimed"] or "")
+            polygons.append({
+                "id": r["id"],
+                "type": POLYGON,
+                "geometry": make_square_polygon(r["lat"], r["lon"], area_m2),
+                "properties": {"claim_id": r["claim_id"]} if r["claim_id"] else {},
+            })
+
+    return encode_tile({POINTS_LAYER: points, POLYGONS_LAYER: polygons}, z, x, y)
+
+
+# -------------------------
+# Two-level cache (memory LRU + disk)
+# -------------------------
+def _tile_path(z, x, y):
+    return os.path.join(TILE_CACHE_DIR, str(z), str(x), f"{y}.pbf")
+
+
+def _stale_path(z, x, y):
+    # rewritten by every invalidation; a render that saw another value is outdated
+    return os.path.join(TILE_CACHE_DIR, str(z), str(x), f"{y}.stale")
+
+
+def _stale_marker(z, x, y):
+    try:
+        with open(_stale_path(z, x, y), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _disk_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def get_tile(z: int, x: int, y: int) -> bytes:
+    """
+    Serve a tile from memory, then disk, rendering it on a miss.
+    Memory entries are only trusted while the disk copy they came from is
+    unchanged, so invalidations made by other workers are respected.
+    """
+    key = (z, x, y)
+    path = _tile_path(z, x, y)
+    mtime = _disk_mtime(path)
+
+    with _cache_lock:
+        entry = _memory_cache.get(key)
+    if entry and mtime is not None and entry[1] == mtime:
+        return entry[0]
+
+    if mtime is not None:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            with _cache_lock:
+                _memory_cache[key] = (data, mtime)
+            return data
+        except FileNotFoundError:
+            pass
+
+    marker = _stale_marker(z, x, y)
+    data = render_tile(z, x, y)
+    if _stale_marker(z, x, y) != marker:
+        return data     # a claim landed mid-render: serve it, but don't cache it
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    # an invalidation between the check above and the replace must still win
+    if _stale_marker(z, x, y) != marker:
+        _remove_file(path)
+        return data
+
+    with _cache_lock:
+        _memory_cache[key] = (data, _disk_mtime(path))
+    return data
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _drop_tile(z, x, y):
+    # marker first: renders already running (in any worker) then skip their write
+    marker = _stale_path(z, x, y)
+    os.makedirs(os.path.dirname(marker), exist_ok=True)
+    with open(marker, "wb") as f:
+        f.write(os.urandom(8))
+    with _cache_lock:
+        _memory_cache.pop((z, x, y), None)
+    _remove_file(_tile_path(z, x, y))
+
+
+def invalidate_claim_tiles(lat, lon, total_area_claimed: str = ""):
+    """Drop every cached tile (all zooms) that renders a claim at lat/lon."""
+    if lat is None or lon is None:
+        return 0
+
+    ring = make_square_polygon(lat, lon, parse_area_to_m2(total_area_claimed or ""))
+    min_lon = min(p[0] for p in ring)
+    max_lon = max(p[0] for p in ring)
+    min_lat = min(p[1] for p in ring)
+    max_lat = max(p[1] for p in ring)
+
+    dropped = 0
+    for z in range(MAX_TILE_ZOOM + 1):
+        n = 2 ** z
+        x0, y0 = lonlat_to_world(min_lon, max_lat, z)
+        x1, y1 = lonlat_to_world(max_lon, min_lat, z)
+        # neighbouring tiles render this claim too if it falls in their buffer
+        tx0 = max(int(x0 - TILE_BUFFER), 0)
+        ty0 = max(int(y0 - TILE_BUFFER), 0)
+        tx1 = min(int(x1 + TILE_BUFFER), n - 1)
+        ty1 = min(int(y1 + TILE_BUFFER), n - 1)
+        for tx in range(tx0, tx1 + 1):
+            for ty in range(ty0, ty1 + 1):
+                _drop_tile(z, tx, ty)
+                dropped += 1
+    return dropped
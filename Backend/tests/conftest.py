@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+# tests import the app modules the way main.py does (run from Backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# state of every claim the DB-backed tests store; removed again by test_claims
+TEST_STATE = "Pytest State"
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """The app engine on a migrated database; skips when DATABASE_URL is unset or unreachable."""
+    if not os.getenv("DATABASE_URL"):
+        pytest.skip("DATABASE_URL is not set")
+    from sqlalchemy import exc
+    from db import apply_migrations, engine
+
+    try:
+        apply_migrations()
+    except exc.OperationalError:
+        pytest.skip("Postgres at DATABASE_URL is not reachable")
+    return engine
+
+
+@pytest.fixture
+def test_claims(db_engine):
+    """Deletes the TEST_STATE claims, their rollups and content hashes after the test."""
+    from sqlalchemy import text
+
+    yield TEST_STATE
+    with db_engine.begin() as conn:
+        conn.execute(
+            text("""
+                DELETE FROM document_hashes
+                WHERE doc_id IN (SELECT id FROM fra_documents WHERE state = :state)
+                   OR (doc_id IS NULL AND fields ->> 'State' = :state)
+            """),
+            {"state": TEST_STATE},
+        )
+        conn.execute(text("DELETE FROM fra_documents WHERE state = :state"), {"state": TEST_STATE})
+        conn.execute(text("DELETE FROM claim_rollups WHERE state = :state"), {"state": TEST_STATE})
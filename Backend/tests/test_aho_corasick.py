@@ -0,0 +1,41 @@
+from utils.aho_corasick import AhoCorasick, leftmost_longest, tokenize
+
+
+def automaton(*names):
+    ac = AhoCorasick()
+    for name in names:
+        ac.add(tuple(tokenize(name)), name)
+    return ac
+
+
+def test_tokenize():
+    assert tokenize("Who's eligible in  MANDLA, M.P.?") == ["who", "s", "eligible", "in", "mandla", "m", "p"]
+    assert tokenize(None) == []
+
+
+def test_search_finds_every_occurrence_on_word_boundaries():
+    ac = automaton("west bengal", "bengal", "ram")
+    tokens = tokenize("West Bengal and Bengal, not Ramesh; Ram")
+    assert ac.search(tokens) == [
+        (0, 2, "west bengal"),
+        (1, 2, "bengal"),
+        (3, 4, "bengal"),
+        (6, 7, "ram"),
+    ]
+
+
+def test_failure_links_recover_partial_matches():
+    ac = automaton("a b c", "b c d", "c")
+    assert sorted(ac.search(["a", "b", "c", "d"])) == [(0, 3, "a b c"), (1, 4, "b c d"), (2, 3, "c")]
+
+
+def test_patterns_added_after_a_search_are_found():
+    ac = automaton("odisha")
+    assert ac.search(["koraput"]) == []
+    ac.add(("koraput",), "koraput")
+    assert ac.search(["koraput", "odisha"]) == [(0, 1, "koraput"), (1, 2, "odisha")]
+
+
+def test_leftmost_longest():
+    matches = [(1, 2, "bengal"), (0, 2, "west bengal"), (0, 1, "west"), (2, 3, "odisha"), (2, 4, "odisha x")]
+    assert leftmost_longest(matches) == [(0, 2, "west bengal"), (2, 4, "odisha x")]
@@ -0,0 +1,98 @@
+"""
+Content-hash dedup against the Postgres at DATABASE_URL; skipped without one.
+"""
+import threading
+import time
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+import services.ingest_service as ingest
+
+
+@pytest.fixture
+def scan(test_claims):
+    """Fresh upload bytes plus the (params, source) storing them would use."""
+    def make():
+        file_bytes = uuid.uuid4().bytes
+        fields = {"Patta-Holder Name": f"Holder {file_bytes.hex()}", "State": test_claims}
+        source = (ingest.content_hash(file_bytes), "ocr text", fields)
+        return file_bytes, ingest.document_params(fields), source
+    return make
+
+
+@pytest.mark.parametrize("policy, action", [
+    ("return", "existing"),
+    ("reject", "reject"),
+    ("reuse", "reuse"),
+])
+def test_seen_bytes_follow_the_policy(scan, monkeypatch, policy, action):
+    monkeypatch.setattr(ingest, "UPLOAD_DUPLICATE_POLICY", policy)
+    file_bytes, params, source = scan()
+    assert ingest.find_duplicate(file_bytes)[1] == "process"
+    doc_id = ingest.store_documents([params], [source])[0]
+
+    digest, found, cached = ingest.find_duplicate(file_bytes)
+    assert (digest, found) == (source[0], action)
+    assert cached["doc_id"] == doc_id
+    assert (cached["ocr_text"], cached["fields"]) == source[1:]
+
+
+def test_reuse_after_delete_repoints_the_hash(db_engine, scan):
+    file_bytes, params, source = scan()
+    first = ingest.store_documents([params], [source])[0]
+    with db_engine.begin() as conn:
+        conn.execute(text("DELETE FROM fra_documents WHERE id = :id"), {"id": first})
+
+    digest, action, cached = ingest.find_duplicate(file_bytes)
+    assert action == "reuse" and cached["doc_id"] is None
+    second = ingest.store_documents(
+        [ingest.document_params(cached["fields"])],
+        [(digest, cached["ocr_text"], cached["fields"])],
+    )[0]
+    assert ingest.find_duplicate(file_bytes)[2]["doc_id"] == second
+
+
+@pytest.mark.parametrize("policy", ["return", "reject"])
+def test_late_duplicate_is_not_stored(scan, monkeypatch, policy):
+    monkeypatch.setattr(ingest, "UPLOAD_DUPLICATE_POLICY", policy)
+    _, params, source = scan()
+    _, other_params, other_source = scan()
+    first = ingest.store_documents([params], [source])[0]
+
+    # both uploads missed in find_duplicate; the second reaches the insert later
+    duplicates = {}
+    doc_ids = ingest.store_documents([other_params, params], [other_source, source], duplicates)
+    assert duplicates == {1: first}
+    assert doc_ids[1] == first and doc_ids[0] != first
+
+
+def test_reuse_policy_stores_every_copy(scan, monkeypatch):
+    monkeypatch.setattr(ingest, "UPLOAD_DUPLICATE_POLICY", "reuse")
+    _, params, source = scan()
+    first = ingest.store_documents([params], [source])[0]
+    duplicates = {}
+    assert ingest.store_documents([params], [source], duplicates)[0] != first
+    assert duplicates == {}
+
+
+def test_concurrent_insert_waits_for_the_hash_lock(db_engine, scan):
+    _, params, source = scan()
+    results = {}
+
+    def second_upload():
+        duplicates = {}
+        results["doc_ids"] = ingest.store_documents([params], [source], duplicates)
+        results["duplicates"] = duplicates
+
+    with db_engine.connect() as conn:
+        first = ingest.insert_documents(conn, [params], [source])[0]
+        other = threading.Thread(target=second_upload)
+        other.start()
+        time.sleep(0.3)
+        assert other.is_alive()          # blocked on the advisory lock
+        conn.commit()
+    other.join(10)
+
+    assert results == {"doc_ids": [first], "duplicates": {0: first}}
@@ -0,0 +1,41 @@
+import pytest
+
+import services.gazetteer_service as gazetteer_service
+from services.gazetteer_service import INDIAN_STATES, Gazetteer
+from utils.llm_utils import SCHEME_KEYWORDS, parse_dss_query
+
+
+@pytest.fixture(autouse=True)
+def gazetteer(monkeypatch):
+    gazetteer = Gazetteer()
+    for keyword, scheme in SCHEME_KEYWORDS.items():
+        gazetteer.add("scheme", keyword, scheme)
+    for state in INDIAN_STATES:
+        gazetteer.add("state", state)
+    gazetteer.add("district", "Mandla")
+    gazetteer.add("village", "Bhimganga")
+    monkeypatch.setattr(gazetteer_service, "_gazetteer", gazetteer.build())
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("Who is eligible for housing in Mandla?",
+     {"scheme": "Housing Support Scheme", "district": "Mandla"}),
+    ("Who is eligible for Farm Support in Bhimganga?",
+     {"scheme": "Farm Support Scheme", "village": "Bhimganga"}),
+    ("List PDS people in Odisha",
+     {"scheme": "Public Distribution System", "state": "Odisha"}),
+    # district missing from the gazetteer: kept from the "in X" phrase
+    ("Who is eligible for housing in Sundargarh, Odisha?",
+     {"scheme": "Housing Support Scheme", "district": "Sundargarh", "state": "Odisha"}),
+    ("Who is eligible for housing in Sundargarh Odisha?",
+     {"scheme": "Housing Support Scheme", "district": "Sundargarh", "state": "Odisha"}),
+    ("Show ration eligibility in the district of Koraput",
+     {"scheme": "Public Distribution System", "district": "Koraput"}),
+    ("Who is eligible for housing in Bhimganga",
+     {"scheme": "Housing Support Scheme", "village": "Bhimganga"}),
+    ("Who is eligible in housing",
+     {"scheme": "Housing Support Scheme"}),
+])
+def test_parse_dss_query(question, expected):
+    result = parse_dss_query(question)
+    assert result == {"scheme": None, "village": None, "district": None, "state": None, **expected}
@@ -0,0 +1,46 @@
+import pytest
+
+from utils.geo_utils import (
+    geohash_encode,
+    location_columns,
+    lonlat_to_tile,
+    normalize_coordinates,
+    tile_bounds,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("20.2961, 85.8245", (20.2961, 85.8245)),
+    ("85.8245, 20.2961", (20.2961, 85.8245)),       # lon, lat: swapped back into India
+    ("20.2961 N 85.8245 E", (20.2961, 85.8245)),
+    ("Lat: 23.5 / Lon: 80.1", (23.5, 80.1)),
+    ("-33.86, 151.2", (-33.86, 151.2)),             # valid, just not in India
+    ("151.2, -33.86", (-33.86, 151.2)),
+])
+def test_normalize_coordinates(text, expected):
+    assert normalize_coordinates(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["", None, "20.3", "1, 2, 3", "0, 0", "200, 300", "n/a"])
+def test_unusable_coordinates_give_none(text):
+    assert normalize_coordinates(text) is None
+
+
+def test_geohash_encode():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash_encode(20.2961, 85.8245) == geohash_encode(20.2961, 85.8245, 9)[:7]
+
+
+def test_location_columns():
+    assert location_columns("85.8245, 20.2961") == {
+        "lat": pytest.approx(20.2961), "lon": pytest.approx(85.8245), "geohash": geohash_encode(20.2961, 85.8245),
+    }
+    assert location_columns("unknown") == {"lat": None, "lon": None, "geohash": None}
+
+
+def test_tile_math_round_trips():
+    z = 10
+    x, y = lonlat_to_tile(85.8245, 20.2961, z)
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y)
+    assert min_lon <= 85.8245 < max_lon and min_lat < 20.2961 <= max_lat
+    assert lonlat_to_tile(180.0, -90.0, 0) == (0, 0)
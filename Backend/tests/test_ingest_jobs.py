@@ -0,0 +1,123 @@
+"""
+Ingest job claim / finish / retry against the Postgres at DATABASE_URL;
+skipped without one, or when the queue has jobs these tests could claim.
+"""
+import os
+import time
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+import services.ingest_job_service as jobs
+
+
+@pytest.fixture
+def queue(db_engine, test_claims, tmp_path, monkeypatch):
+    with db_engine.connect() as conn:
+        pending = conn.execute(
+            text("SELECT COUNT(*) FROM ingest_jobs WHERE status IN ('queued', 'running')")
+        ).scalar()
+    if pending:
+        pytest.skip("ingest_jobs has unfinished jobs")
+
+    monkeypatch.setattr(jobs, "INGEST_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(jobs, "ocr_document", lambda file_bytes: file_bytes.decode())
+    monkeypatch.setattr(jobs, "clean_with_llm", lambda ocr_text: {
+        "Patta-Holder Name": ocr_text, "State": test_claims,
+    })
+
+    job_ids = []
+
+    def enqueue():
+        holder = f"Holder {uuid.uuid4().hex}"
+        job_id = jobs.enqueue_ingest_jobs([("scan.png", holder.encode)])[0]["job_id"]
+        job_ids.append(job_id)
+        return job_id, holder
+
+    yield enqueue
+    with db_engine.begin() as conn:
+        conn.execute(text("DELETE FROM ingest_jobs WHERE id = ANY(:ids)"), {"ids": job_ids})
+
+
+def stored_count(db_engine, holder):
+    with db_engine.connect() as conn:
+        return conn.execute(
+            text("SELECT COUNT(*) FROM fra_documents WHERE patta_holder_name = :holder"),
+            {"holder": holder},
+        ).scalar()
+
+
+def expire_claims(monkeypatch):
+    """Every running job counts as abandoned from now on."""
+    monkeypatch.setattr(jobs, "INGEST_JOB_TIMEOUT", 0)
+    time.sleep(0.01)
+
+
+def test_job_is_stored_and_its_spool_file_removed(db_engine, queue):
+    job_id, holder = queue()
+    job = jobs.claim_ingest_job()
+    assert (job["id"], job["attempts"]) == (job_id, 1)
+    assert jobs.claim_ingest_job() is None       # locked by the first claim
+
+    jobs.process_ingest_job(job)
+    row = jobs.get_ingest_job(job_id)
+    assert row["status"] == "done" and row["doc_id"] is not None
+    assert stored_count(db_engine, holder) == 1
+    assert not os.path.exists(job["spool_path"])
+
+
+def test_reclaimed_job_is_stored_once(db_engine, queue, monkeypatch):
+    job_id, holder = queue()
+    stale = jobs.claim_ingest_job()
+    expire_claims(monkeypatch)
+    owner = jobs.claim_ingest_job()
+    assert (owner["id"], owner["attempts"]) == (job_id, 2)
+
+    # the slow first worker finishes after the reclaim: its insert is rolled back
+    jobs.process_ingest_job(stale)
+    assert stored_count(db_engine, holder) == 0
+    assert jobs.get_ingest_job(job_id)["status"] == "running"
+    assert os.path.exists(owner["spool_path"])
+    assert jobs._fail_job(stale, "late failure") is False
+
+    jobs.process_ingest_job(owner)
+    assert jobs.get_ingest_job(job_id)["status"] == "done"
+    assert stored_count(db_engine, holder) == 1
+
+
+def test_failed_job_backs_off_then_fails_after_max_attempts(db_engine, queue, monkeypatch):
+    monkeypatch.setattr(jobs, "INGEST_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(jobs, "INGEST_RETRY_SECONDS", 60)
+    job_id, _ = queue()
+
+    job = jobs.claim_ingest_job()
+    assert jobs._fail_job(job, "boom") is True
+    with db_engine.begin() as conn:
+        status, delay = conn.execute(
+            text("SELECT status, EXTRACT(EPOCH FROM run_after - now()) FROM ingest_jobs WHERE id = :id"),
+            {"id": job_id},
+        ).one()
+        assert status == "queued" and 50 < delay <= 60
+        assert jobs.claim_ingest_job() is None   # still backing off
+        conn.execute(text("UPDATE ingest_jobs SET run_after = now() WHERE id = :id"), {"id": job_id})
+
+    job = jobs.claim_ingest_job()
+    assert job["attempts"] == 2
+    assert jobs._fail_job(job, "boom again") is True
+    row = jobs.get_ingest_job(job_id)
+    assert (row["status"], row["error"]) == ("failed", "boom again")
+    assert row["finished_at"] is not None
+    assert not os.path.exists(job["spool_path"])
+
+
+def test_abandoned_job_out_of_attempts_is_failed(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "INGEST_MAX_ATTEMPTS", 1)
+    job_id, _ = queue()
+    job = jobs.claim_ingest_job()
+    expire_claims(monkeypatch)
+
+    assert jobs.claim_ingest_job() is None
+    row = jobs.get_ingest_job(job_id)
+    assert (row["status"], row["error"]) == ("failed", "worker timed out")
+    assert not os.path.exists(job["spool_path"])
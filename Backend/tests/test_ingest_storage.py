@@ -0,0 +1,34 @@
+"""
+insert_documents() against the Postgres at DATABASE_URL; skipped without one.
+"""
+from sqlalchemy import text
+
+from services.ingest_service import (
+    INGEST_CHUNK_SIZE,
+    MAX_INSERT_ROWS,
+    document_params,
+    insert_documents,
+)
+
+
+def test_chunk_size_fits_one_statement():
+    assert INGEST_CHUNK_SIZE <= MAX_INSERT_ROWS
+
+
+def test_ids_follow_input_order_across_statements(db_engine, test_claims):
+    names = [f"Holder {i:05d}" for i in range(MAX_INSERT_ROWS + 7)]
+    params_list = [
+        document_params({"Patta-Holder Name": name, "State": test_claims, "Age": "40"})
+        for name in reversed(names)
+    ]
+
+    with db_engine.connect() as conn:
+        doc_ids = insert_documents(conn, params_list)
+        stored = dict(conn.execute(
+            text("SELECT id, patta_holder_name FROM fra_documents WHERE id = ANY(:ids)"),
+            {"ids": doc_ids},
+        ).all())
+        conn.rollback()
+
+    assert len(set(doc_ids)) == len(params_list)
+    assert [stored[doc_id] for doc_id in doc_ids] == [p["patta_holder_name"] for p in params_list]
@@ -0,0 +1,67 @@
+import pytest
+
+from utils.geo_utils import lonlat_to_tile, tile_bounds
+from utils.mvt_utils import POINT, POLYGON, _varint, _zigzag, encode_tile
+
+mvt = pytest.importorskip("mapbox_vector_tile")
+
+Z = 12
+X, Y = lonlat_to_tile(85.0, 20.0, Z)
+MIN_LON, MIN_LAT, MAX_LON, MAX_LAT = tile_bounds(Z, X, Y)
+
+
+def test_varint_and_zigzag():
+    assert _varint(0) == b"\x00"
+    assert _varint(300) == b"\xac\x02"
+    assert [_zigzag(n) for n in (0, -1, 1, -2, 2)] == [0, 1, 2, 3, 4]
+
+
+def test_points_and_properties_round_trip():
+    tile = encode_tile({"claims": [
+        {"id": 7, "type": POINT, "geometry": (MIN_LON, MAX_LAT),
+         "properties": {"status": "verified", "acres": 2.5, "count": 3, "flag": True, "skip": None}},
+        {"id": 8, "type": POINT, "geometry": (MAX_LON, MIN_LAT), "properties": {"status": "verified"}},
+    ]}, Z, X, Y)
+
+    layer = mvt.decode(tile, default_options={"y_coord_down": True})["claims"]
+    assert layer["extent"] == 4096
+    first, second = layer["features"]
+    assert first["id"] == 7
+    assert first["properties"] == {"status": "verified", "acres": 2.5, "count": 3, "flag": True}
+    assert first["geometry"]["coordinates"] == [0, 0]        # top-left corner
+    assert second["geometry"]["coordinates"] == [4096, 4096]  # bottom-right corner
+
+
+def test_polygon_ring_snaps_to_the_tile_grid():
+    west, east = MIN_LON + (MAX_LON - MIN_LON) / 4, MAX_LON - (MAX_LON - MIN_LON) / 4
+    south, north = MIN_LAT + (MAX_LAT - MIN_LAT) / 4, MAX_LAT - (MAX_LAT - MIN_LAT) / 4
+    ring = [(west, south), (east, south), (east, north), (west, north), (west, south)]
+    tile = encode_tile({"polys": [{"id": 1, "type": POLYGON, "geometry": ring}]}, Z, X, Y)
+
+    feature = mvt.decode(tile, default_options={"y_coord_down": True})["polys"]["features"][0]
+    assert feature["geometry"]["type"] == "Polygon"
+    coords = feature["geometry"]["coordinates"][0]
+    assert coords[0] == coords[-1]
+    assert sorted({tuple(c) for c in coords}) == [(1024, 1024), (1024, 3072), (3072, 1024), (3072, 3072)]
+
+
+def _ring_winding(ring):
+    """Sign of the first ring's area as encoded (positive = exterior in y-down tile space)."""
+    tile = encode_tile({"polys": [{"type": POLYGON, "geometry": ring}]}, Z, X, Y)
+    coords = mvt.decode(tile, default_options={"y_coord_down": True})["polys"]["features"][0]
+    pts = coords["geometry"]["coordinates"][0]
+    return sum(a[0] * b[1] - b[0] * a[1] for a, b in zip(pts, pts[1:])) > 0
+
+
+def test_either_input_winding_encodes_an_exterior_ring():
+    west, east = MIN_LON + 0.001, MAX_LON - 0.001
+    south, north = MIN_LAT + 0.001, MAX_LAT - 0.001
+    ring = [(west, south), (east, south), (east, north), (west, north), (west, south)]
+    assert _ring_winding(ring) == _ring_winding(ring[::-1])
+
+
+def test_degenerate_polygons_and_empty_layers_are_dropped():
+    tiny = [(MIN_LON, MAX_LAT)] * 5
+    tile = encode_tile({"polys": [{"type": POLYGON, "geometry": tiny}], "empty": []}, Z, X, Y)
+    assert mvt.decode(tile).get("polys", {"features": []})["features"] == []
+    assert "empty" not in mvt.decode(tile)
@@ -0,0 +1,37 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from utils.pagination import decode_cursor, encode_cursor, ndjson_line, split_page
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2024-01-02T03:04:05", 42)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor, 2) == ["2024-01-02T03:04:05", 42]
+
+
+def test_cursor_encodes_dates_and_decimals():
+    cursor = encode_cursor(datetime(2024, 1, 2, 3, 4, 5), Decimal("2.5"))
+    assert decode_cursor(cursor, 2) == ["2024-01-02T03:04:05", 2.5]
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", encode_cursor(1), "eyJhIjogMX0"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+def test_split_page():
+    rows = [{"id": i} for i in range(1, 5)]
+    page, cursor = split_page(rows, 3, key=lambda r: (r["id"],))
+    assert page == rows[:3]
+    assert decode_cursor(cursor, 1) == [3]
+
+    assert split_page(rows, 4, key=lambda r: (r["id"],)) == (rows, None)
+    assert split_page([], 4, key=lambda r: (r["id"],)) == ([], None)
+
+
+def test_ndjson_line():
+    assert ndjson_line({"id": 1, "at": datetime(2024, 1, 2)}) == b'{"id": 1, "at": "2024-01-02T00:00:00"}\n'
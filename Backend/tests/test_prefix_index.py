@@ -0,0 +1,44 @@
+from services.suggest_service import MAX_SCAN, PrefixIndex, normalize_key
+
+
+def test_normalize_key():
+    assert normalize_key("  Ram   KUMAR ") == "ram kumar"
+
+
+def test_search_matches_every_word_start():
+    index = PrefixIndex()
+    index.add("Ram Kumar")
+    index.add("Kumari Devi")
+    index.add("Sita")
+    assert sorted(v for v, _ in index.search("kum", 10)) == ["Kumari Devi", "Ram Kumar"]
+    assert index.search("umar", 10) == []
+    assert index.search("  ", 10) == []
+
+
+def test_counts_merge_case_insensitively_and_rank_first():
+    index = PrefixIndex()
+    index.add("Odisha")
+    index.add("ODISHA", 2)
+    index.add("Orissa Road")
+    assert len(index) == 2
+    assert index.search("o", 10) == [("Odisha", 3), ("Orissa Road", 1)]
+
+
+def test_load_matches_add():
+    values = [("Ram Kumar", 2), ("Ram  kumar", 1), ("Sita Devi", 1), ("", 5), (None, 1)]
+    loaded, added = PrefixIndex(), PrefixIndex()
+    loaded.load(values)
+    for value, count in values:
+        added.add(value, count)
+    for prefix in ("r", "ram k", "kumar", "d", "x"):
+        assert loaded.search(prefix, 10) == added.search(prefix, 10)
+
+
+def test_popular_value_past_the_scan_window_is_ranked():
+    index = PrefixIndex()
+    index.load((f"aa{i:05d}", 1) for i in range(MAX_SCAN * 2))
+    index.add("az popular", 50)
+    assert index.search("a", 3)[0] == ("az popular", 50)
+    # the cached ranking of a wide range sees later adds
+    index.add("ay newer", 80)
+    assert index.search("a", 3)[:2] == [("ay newer", 80), ("az popular", 50)]
@@ -0,0 +1,83 @@
+"""
+compile_eligibility() must select exactly the claims matches_criteria()
+accepts. Needs the Postgres at DATABASE_URL; skipped without one.
+"""
+import itertools
+
+import pytest
+from sqlalchemy import text
+
+from services.scheme_service import compile_eligibility, matches_criteria, parse_eligibility
+from utils.units import unit_columns
+
+AGES = ["34", " 60 years", "17", "61", "abc", "", None]
+GENDERS = ["Male", "f", "Other", "M ", "", None]
+STATES = ["Odisha", "odisha", "Jharkhand", None]
+AREAS = ["2.5 acres", "1 ha", "0.5", "0 acres", "500 sq yd", "10 meters", "abc", "", None]
+LAND_USES = ["Agriculture", "homestead", None]
+
+CRITERIA = [
+    {},
+    {"min_age": 18},
+    {"max_age": 60},
+    {"min_age": 18, "max_age": 60},
+    {"state": "Odisha"},
+    {"state": "ODISHA"},
+    {"gender": "female"},
+    {"gender": "M"},
+    {"gender": "other"},
+    {"min_land_acres": 1},
+    {"max_land_acres": 2.5},
+    {"min_land_acres": 0},
+    {"max_land_acres": 0},
+    {"min_land_acres": 0.5, "max_land_acres": 2.5},
+    {"land_use": "agri"},
+    {"min_age": 18, "gender": "male", "state": "odisha", "max_land_acres": 2.5},
+]
+
+
+@pytest.fixture(scope="module")
+def conn(db_engine):
+    connection = db_engine.connect()
+
+    records = [
+        {"id": i, "age": age, "gender": gender, "state": state,
+         "total_area_claimed": area, "land_use": land_use}
+        for i, (age, gender, state, area, land_use)
+        in enumerate(itertools.product(AGES, GENDERS, STATES, AREAS, LAND_USES))
+    ]
+    connection.execute(text("""
+        CREATE TEMP TABLE eligibility_cases (
+            id INTEGER, age TEXT, gender TEXT, state TEXT,
+            total_area_claimed TEXT, land_use TEXT,
+            age_years INTEGER, area_acres DOUBLE PRECISION
+        )
+    """))
+    connection.execute(
+        text("""
+            INSERT INTO eligibility_cases
+            VALUES (:id, :age, :gender, :state, :total_area_claimed, :land_use, :age_years, :area_acres)
+        """),
+        [{**r, **unit_columns(r["age"], r["total_area_claimed"])} for r in records],
+    )
+    connection.records = records
+    yield connection
+    connection.rollback()
+    connection.close()
+
+
+@pytest.mark.parametrize("criteria", CRITERIA, ids=lambda c: ",".join(f"{k}={v}" for k, v in c.items()) or "none")
+def test_sql_predicate_matches_python(conn, criteria):
+    where, params = compile_eligibility(criteria)
+    selected = {r[0] for r in conn.execute(text(f"SELECT id FROM eligibility_cases WHERE {where}"), params)}
+    expected = {r["id"] for r in conn.records if matches_criteria(r, criteria)}
+    assert selected == expected
+
+
+def test_parse_eligibility_formats():
+    expected = {"min_age": 18, "state": "Odisha"}
+    assert parse_eligibility(expected) == expected
+    assert parse_eligibility('{"min_age": 18, "state": "Odisha"}') == expected
+    assert parse_eligibility("{'min_age': 18, 'state': 'Odisha'}") == expected
+    assert parse_eligibility("not a dict") == {}
+    assert parse_eligibility(None) == {}
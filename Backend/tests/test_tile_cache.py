@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+import services.tile_service as tiles
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tiles, "TILE_CACHE_DIR", str(tmp_path))
+    tiles._memory_cache.clear()
+    yield tmp_path
+    tiles._memory_cache.clear()
+
+
+def test_rendered_tile_is_cached_until_dropped(cache_dir, monkeypatch):
+    renders = []
+    monkeypatch.setattr(tiles, "render_tile", lambda z, x, y: renders.append(1) or b"v%d" % len(renders))
+
+    assert tiles.get_tile(3, 1, 2) == b"v1"
+    assert tiles.get_tile(3, 1, 2) == b"v1"
+    assert os.path.exists(tiles._tile_path(3, 1, 2))
+
+    tiles._drop_tile(3, 1, 2)
+    assert not os.path.exists(tiles._tile_path(3, 1, 2))
+    assert tiles.get_tile(3, 1, 2) == b"v2"
+
+
+def test_render_overtaken_by_invalidation_is_not_cached(cache_dir, monkeypatch):
+    def render_then_invalidate(z, x, y):
+        tiles._drop_tile(z, x, y)   # an upload commits while this render runs
+        return b"stale"
+
+    monkeypatch.setattr(tiles, "render_tile", render_then_invalidate)
+    assert tiles.get_tile(5, 3, 4) == b"stale"
+    assert not os.path.exists(tiles._tile_path(5, 3, 4))
+
+    monkeypatch.setattr(tiles, "render_tile", lambda z, x, y: b"fresh")
+    assert tiles.get_tile(5, 3, 4) == b"fresh"
+
+
+def test_invalidation_after_the_write_check_removes_the_tile(cache_dir, monkeypatch):
+    monkeypatch.setattr(tiles, "render_tile", lambda z, x, y: b"stale")
+    read_marker = tiles._stale_marker
+    reads = []
+
+    def invalidate_before_last_check(z, x, y):
+        reads.append((z, x, y))
+        if len(reads) == 3:     # before, after render, after replace
+            tiles._drop_tile(z, x, y)
+        return read_marker(z, x, y)
+
+    monkeypatch.setattr(tiles, "_stale_marker", invalidate_before_last_check)
+    assert tiles.get_tile(6, 1, 1) == b"stale"
+    assert not os.path.exists(tiles._tile_path(6, 1, 1))
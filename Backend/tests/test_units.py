@@ -0,0 +1,79 @@
+import pytest
+
+from utils.units import (
+    SQ_M_PER_ACRE,
+    format_acres,
+    parse_age,
+    parse_area_to_acres,
+    parse_area_to_m2,
+    unit_columns,
+)
+
+
+@pytest.mark.parametrize("text, acres", [
+    ("1.5 acres", 1.5),
+    ("2 Acre", 2.0),
+    ("3 ac", 3.0),
+    ("12", 12.0),                   # no unit: acres
+    ("2.5 (acres)", 2.5),
+    ("1 hectare", 2.47105),
+    ("0.5 ha", 1.235525),
+    ("2 hectares", 4.9421),
+    ("4046.8564224 sq m", 1.0),
+    ("4046.8564224 sq. mtr", 1.0),
+    ("4046.8564224 square metres", 1.0),
+    ("4046.8564224 m²", 1.0),
+    ("43560 sq ft", 1.0),
+    ("43560 sq.ft.", 1.0),
+    ("1,200 sq ft", 1200 / 43560),
+    ("4840 sq yd", 1.0),
+    ("4840 sq yds", 1.0),
+    ("4840 gaj", 1.0),
+    ("100 cents", 1.0),
+    ("100 decimals", 1.0),
+    ("40 guntha", 1.0),
+    ("8 kanal", 1.0),
+    ("160 marla", 1.0),
+    ("100 ares", 2.47105),
+    ("1 sq km", 247.105),
+])
+def test_known_units(text, acres):
+    assert parse_area_to_acres(text) == pytest.approx(acres)
+
+
+@pytest.mark.parametrize("text", [
+    "500 meters",       # a length, not an area
+    "3 units",
+    "1 hand",           # "ha" must match a whole word
+    "10 area",          # nor "are"
+    "abc",
+    "",
+    None,
+])
+def test_unknown_units_and_missing_numbers_give_none(text):
+    assert parse_area_to_acres(text) is None
+    assert parse_area_to_m2(text) is None
+
+
+def test_area_to_m2():
+    assert parse_area_to_m2("1 acre") == pytest.approx(SQ_M_PER_ACRE)
+
+
+def test_format_acres():
+    assert format_acres(2.5) == "2.50 acres"
+    assert parse_area_to_acres(format_acres(0.1033)) == pytest.approx(0.10)
+
+
+@pytest.mark.parametrize("value, years", [
+    ("52", 52), (52, 52), ("52 yrs", 52), (" Age: 41 ", 41),
+    ("abc", None), ("", None), (None, None),
+])
+def test_parse_age(value, years):
+    assert parse_age(value) == years
+
+
+def test_unit_columns():
+    assert unit_columns("34 years", "500 sq yd") == {
+        "age_years": 34, "area_acres": pytest.approx(500 / 4840),
+    }
+    assert unit_columns(None, "500 meters") == {"age_years": None, "area_acres": None}
@@ -0,0 +1,84 @@
+import re
+from collections import deque
+
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str):
+    """Casefolded word tokens; the alphabet of the automaton."""
+    return _WORD_RE.findall((text or "").casefold())
+
+
+class AhoCorasick:
+    """
+    Word-level Aho-Corasick automaton. Patterns are token sequences, so
+    matches always fall on word boundaries and the trie stays small even
+    with many long names. search() is one pass over the input tokens.
+    """
+
+    def __init__(self):
+        self._goto = [{}]       # node -> {token: node}
+        self._fail = [0]
+        self._out = [[]]        # node -> [(pattern length, value)]
+        self._built = False
+
+    def __len__(self):
+        return len(self._goto)
+
+    def add(self, tokens, value):
+        if not tokens:
+            return
+        node = 0
+        for tok in tokens:
+            nxt = self._goto[node].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(tokens), value))
+        self._built = False
+
+    def build(self):
+        """Compute failure links (BFS) and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for tok, child in self._goto[node].items():
+                f = self._fail[node]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(tok, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+        self._built = True
+
+    def search(self, tokens):
+        """[(start, end, value)] for every pattern occurrence, end exclusive."""
+        if not self._built:
+            self.build()
+        matches = []
+        node = 0
+        for i, tok in enumerate(tokens):
+            while node and tok not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(tok, 0)
+            for length, value in self._out[node]:
+                matches.append((i + 1 - length, i + 1, value))
+        return matches
+
+
+def leftmost_longest(matches):
+    """Non-overlapping matches, preferring earlier then longer ones."""
+    chosen = []
+    last_end = 0
+    for start, end, value in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+        if start >= last_end:
+            chosen.append((start, end, value))
+            last_end = end
+    return chosen
@@ -0,0 +1,169 @@
+import math
+import re
+
+
+# -------------------------
+# Coordinate parsing
+# -------------------------
+def parse_coordinate(coord_str: str):
+    """Parse 'lat, lon' or 'lon, lat' string into floats and detect order.
+       Returns (lat, lon)."""
+    try:
+        parts = [p.strip() for p in coord_str.replace(',', ' ').split()]
+        if len(parts) < 2:
+            raise ValueError("coordinate string must have two numeric values")
+        a, b = float(parts[0]), float(parts[1])
+        # Heuristic: lat in [-90, 90], lon in [-180, 180]; if first value outside [-90,90], treat as lon,lat
+        if -90 <= a <= 90 and -180 <= b <= 180:
+            # assume a is lat, b is lon
+            lat, lon = a, b
+        elif -90 <= b <= 90 and -180 <= a <= 180:
+            # swapped
+            lat, lon = b, a
+        else:
+            # fallback: assume first is lat
+            lat, lon = a, b
+        return lat, lon
+    except Exception as e:
+        raise ValueError(f"Could not parse coordinates: {e}")
+
+
+def make_square_polygon(lat, lon, area_m2):
+    """Create a simple axis-aligned square polygon (lon,lat order) around (lat,lon) with given area in m2."""
+    if area_m2 is None or area_m2 <= 0:
+        # default small square (100m)
+        half_side = 50.0
+    else:
+        side = math.sqrt(area_m2)
+        half_side = side / 2.0  # meters
+    # degrees per meter approx (lat)
+    delta_lat = half_side / 111000.0
+    # degrees per meter for lon depends on latitude
+    delta_lon = half_side / (111000.0 * math.cos(math.radians(lat)) + 1e-9)
+    # corners in lon, lat order for EE / shapely polygon
+    p1 = (lon - delta_lon, lat - delta_lat)
+    p2 = (lon + delta_lon, lat - delta_lat)
+    p3 = (lon + delta_lon, lat + delta_lat)
+    p4 = (lon - delta_lon, lat + delta_lat)
+    return [p1, p2, p3, p4, p1]
+
+
+# -------------------------
+# Ingest-time normalization
+# -------------------------
+# Rough bounding box of India, used to resolve "lon, lat" strings
+INDIA_BOUNDS = (68.0, 6.0, 98.0, 38.0)  # min_lon, min_lat, max_lon, max_lat
+
+GEOHASH_PRECISION = 7  # ~150m cells
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _in_india(lat, lon):
+    min_lon, min_lat, max_lon, max_lat = INDIA_BOUNDS
+    return min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+
+
+def normalize_coordinates(coord_str: str):
+    """
+    Parse and validate a free-text coordinate pair once at ingest.
+    Returns (lat, lon) or None when the text is not a usable location.
+    Swapped "lon, lat" input is detected by checking which order falls in India.
+    """
+    if not coord_str:
+        return None
+    nums = _NUMBER_RE.findall(str(coord_str))
+    if len(nums) != 2:
+        return None
+    a, b = float(nums[0]), float(nums[1])
+
+    for lat, lon in ((a, b), (b, a)):
+        if _in_india(lat, lon):
+            return lat, lon
+
+    for lat, lon in ((a, b), (b, a)):
+        if -90 <= lat <= 90 and -180 <= lon <= 180 and (lat, lon) != (0.0, 0.0):
+            return lat, lon
+    return None
+
+
+def geohash_encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base32 geohash of a point."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def location_columns(coord_str: str) -> dict:
+    """lat / lon / geohash column values for a raw coordinate string."""
+    parsed = normalize_coordinates(coord_str)
+    if not parsed:
+        return {"lat": None, "lon": None, "geohash": None}
+    lat, lon = parsed
+    return {"lat": lat, "lon": lon, "geohash": geohash_encode(lat, lon)}
+
+
+# -------------------------
+# Web-mercator tile math
+# -------------------------
+MAX_MERCATOR_LAT = 85.0511287798
+
+
+def lonlat_to_world(lon: float, lat: float, zoom: int):
+    """Project lon/lat to fractional tile coordinates at zoom (y grows southwards)."""
+    lat = max(min(lat, MAX_MERCATOR_LAT), -MAX_MERCATOR_LAT)
+    n = 2 ** zoom
+    x = (lon + 180.0) / 360.0 * n
+    lat_rad = math.radians(lat)
+    y = (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n
+    return x, y
+
+
+def lonlat_to_tile(lon: float, lat: float, zoom: int):
+    """Tile (x, y) containing lon/lat at zoom."""
+    n = 2 ** zoom
+    x, y = lonlat_to_world(lon, lat, zoom)
+    return min(int(x), n - 1), min(int(y), n - 1)
+
+
+def tile_bounds(z: int, x: int, y: int):
+    """(min_lon, min_lat, max_lon, max_lat) of a tile."""
+    n = 2 ** z
+
+    def lat_of(ty):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return (
+        x / n * 360.0 - 180.0,
+        lat_of(y + 1),
+        (x + 1) / n * 360.0 - 180.0,
+        lat_of(y),
+    )
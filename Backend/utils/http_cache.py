@@ -0,0 +1,50 @@
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import xxhash
+from fastapi import Request, Response
+
+
+# -------------------------
+# Conditional GET helpers
+# -------------------------
+
+def validator_headers(request: Request, version: int, changed_at) -> dict:
+    """
+    ETag / Last-Modified for a listing derived from a table change counter.
+    The query string is folded into the ETag so different filters of the
+    same table don't share a validator.
+    """
+    query_hash = xxhash.xxh64_hexdigest(str(request.url.query))
+    headers = {
+        "ETag": f'W/"{version}-{query_hash}"',
+        "Cache-Control": "no-cache",
+    }
+    if changed_at is not None:
+        headers["Last-Modified"] = format_datetime(
+            changed_at.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(request: Request, headers: dict, changed_at) -> bool:
+    """True when the client's cached copy (If-None-Match / If-Modified-Since) is current."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or headers["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and changed_at is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return changed_at.replace(microsecond=0) <= since
+
+    return False
+
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -5,17 +5,14 @@ import requests
 from dotenv import load_dotenv
 # from langchain_google_genai import ChatGoogleGenerativeAI
 
-from db import fetch_schemes
+from services.gazetteer_service import STOPWORDS, get_gazetteer, register_scheme_keywords
+from utils.aho_corasick import tokenize
+from utils.units import format_acres, parse_area_to_acres
 from typing import Dict, Any
 from datetime import datetime
 
 chain = None
 dss_chain = None
-INDIAN_STATES = {
-    "jharkhand",
-    "odisha",
-    "chhattisgarh"
-}
 
 
 # -------------------------
@@ -37,18 +34,6 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 #         print("⚠️ LLM init failed:", e)
 
 
-# -------------------------
-# Conversion factors to acres
-# -------------------------
-UNIT_TO_ACRE = {
-    "acre": 1.0, "acres": 1.0,
-    "hectare": 2.47105, "hectares": 2.47105, "ha": 2.47105,
-    "sq m": 0.000247105, "sqm": 0.000247105,
-    "square meter": 0.000247105, "square meters": 0.000247105,
-    "sq ft": 2.2957e-5, "sqft": 2.2957e-5, "square feet": 2.2957e-5,
-    "bigha": 0.619, "cent": 0.0247, "guntha": 0.0247
-}
-
 # -------------------------
 # Prompt Template (OCR → JSON Schema)
 # -------------------------
@@ -157,16 +142,10 @@ def fallback_extract(data: dict, text: str) -> dict:
 def convert_area_to_acres(area_str: str) -> str:
     if not area_str:
         return ""
-    match = re.search(r"([\d\.]+)\s*([a-zA-Z ]+)?", area_str)
-    if not match:
+    acres = parse_area_to_acres(area_str)
+    if acres is None:
         return area_str
-    value = float(match.group(1))
-    unit = (match.group(2) or "acre").strip().lower()
-    for key, factor in UNIT_TO_ACRE.items():
-        if key in unit:
-            acres = value * factor
-            return f"{acres:.2f} acres"
-    return f"{value:.2f} acres"
+    return format_acres(acres)
 
 # -------------------------
 # Coordinate Helpers
@@ -206,20 +185,10 @@ def clean_with_llm(text: str) -> dict:
         if data.get(key):
             data[key] = data[key].replace("Name:", "").strip()
 
-    if data.get("Land Use"):
-        # 🔒 FORCE Land Use normalization
-   
     # 🔒 FORCE Land Use normalization
     lu = (data.get("Land Use") or "").lower()
 
     if any(k in lu for k in ["house", "home", "residential", "hut", "dwelling", "homestead"]):
-      data["Land Use"] = "Homestead"
-
-
-
-
-
-    elif "homestead" in lu:
         data["Land Use"] = "Homestead"
 
 
@@ -307,42 +276,22 @@ SCHEME_KEYWORDS = {
     "pds": "Public Distribution System",
     "ration": "Public Distribution System",
 }
+register_scheme_keywords(SCHEME_KEYWORDS)
 
 def parse_dss_query(user_query: str) -> Dict[str, Any]:
-    result = {
-        "scheme": None,
-        "village": None,
-        "district": None,
-        "state": None
-    }
-
-    q = user_query.lower()
-
-    # 1️⃣ Detect scheme
-    for keyword, scheme_name in SCHEME_KEYWORDS.items():
-        if keyword in q:
-            result["scheme"] = scheme_name
-            break
-
-    # 2️⃣ Detect location
-    # 2️⃣ Detect location
-    m = re.search(r"in ([A-Za-z ]+)", user_query, re.IGNORECASE)
-    if m:
-    location = m.group(1).strip()
-
-    location_l = location.lower()
-
-    if location_l in INDIAN_STATES:
-        result["state"] = location
-    else:
-        result["district"] = location
-
-    # 3️⃣ Fallback scheme lookup from DB
-    if not result["scheme"]:
-        schemes = fetch_schemes()
-        for s in schemes:
-            if s["name"].lower() in q:
-                result["scheme"] = s["name"]
+    # 1️⃣ One pass over the question: schemes, states, districts and villages
+    result = get_gazetteer().parse(user_query)
+
+    # 2️⃣ District not in the gazetteer yet → keep the "in X" place as a district
+    #    filter, minus words already matched as the state, village or scheme
+    if result["district"] is None:
+        matched = set(STOPWORDS)
+        for field in ("state", "village", "scheme"):
+            matched.update(tokenize(result[field]))
+        for m in re.finditer(r"\bin ([A-Za-z ]+)", user_query, re.IGNORECASE):
+            words = [w for w in m.group(1).split() if w.casefold() not in matched]
+            if words:
+                result["district"] = " ".join(words)
                 break
 
     return result
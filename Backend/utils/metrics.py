@@ -0,0 +1,27 @@
+import threading
+
+
+# -------------------------
+# In-process metrics registry
+# -------------------------
+# name -> zero-arg callable returning a JSON-serializable dict
+_collectors = {}
+_collectors_lock = threading.Lock()
+
+
+def register_metrics(name: str, collector):
+    """Expose collector() under name in /metrics."""
+    with _collectors_lock:
+        _collectors[name] = collector
+
+
+def collect_metrics() -> dict:
+    with _collectors_lock:
+        collectors = dict(_collectors)
+    metrics = {}
+    for name, collector in collectors.items():
+        try:
+            metrics[name] = collector()
+        except Exception as e:
+            metrics[name] = {"error": str(e)}
+    return metrics
@@ -0,0 +1,170 @@
+# Minimal Mapbox Vector Tile (v2.1) encoder: points and simple polygons with
+# scalar properties, written straight to protobuf wire format so no generated
+# protobuf classes are needed.
+import struct
+from utils.geo_utils import lonlat_to_world
+
+EXTENT = 4096
+
+POINT = 1
+POLYGON = 3
+
+CMD_MOVE_TO = 1
+CMD_LINE_TO = 2
+CMD_CLOSE_PATH = 7
+
+
+# -------------------------
+# Protobuf wire helpers
+# -------------------------
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        bits = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _len_field(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field: int, values) -> bytes:
+    return _len_field(field, b"".join(_varint(v) for v in values))
+
+
+def _command(cmd: int, count: int) -> int:
+    return (cmd & 0x7) | (count << 3)
+
+
+def _encode_value(value) -> bytes:
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        if value >= 0:
+            return _key(5, 0) + _varint(value)
+        return _key(6, 0) + _varint(_zigzag(value))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _len_field(1, str(value).encode("utf-8"))
+
+
+# -------------------------
+# Geometry encoding
+# -------------------------
+def _to_tile_xy(lon, lat, z, x, y, extent):
+    wx, wy = lonlat_to_world(lon, lat, z)
+    return round((wx - x) * extent), round((wy - y) * extent)
+
+
+def _encode_point(coord, z, x, y, extent):
+    px, py = _to_tile_xy(coord[0], coord[1], z, x, y, extent)
+    return [_command(CMD_MOVE_TO, 1), _zigzag(px), _zigzag(py)]
+
+
+def _encode_ring(ring, z, x, y, extent):
+    pts = [_to_tile_xy(lon, lat, z, x, y, extent) for lon, lat in ring]
+    if len(pts) > 1 and pts[0] == pts[-1]:
+        pts = pts[:-1]
+    # drop consecutive duplicates left over after snapping to the grid
+    deduped = [pts[0]] if pts else []
+    for p in pts[1:]:
+        if p != deduped[-1]:
+            deduped.append(p)
+    if len(deduped) < 3:
+        return []
+
+    # exterior rings must have positive area in tile (y-down) space
+    area = sum(
+        deduped[i][0] * deduped[(i + 1) % len(deduped)][1]
+        - deduped[(i + 1) % len(deduped)][0] * deduped[i][1]
+        for i in range(len(deduped))
+    )
+    if area < 0:
+        deduped.reverse()
+
+    geom = []
+    cx = cy = 0
+    for i, (px, py) in enumerate(deduped):
+        if i == 0:
+            geom.append(_command(CMD_MOVE_TO, 1))
+        elif i == 1:
+            geom.append(_command(CMD_LINE_TO, len(deduped) - 1))
+        geom.extend((_zigzag(px - cx), _zigzag(py - cy)))
+        cx, cy = px, py
+    geom.append(_command(CMD_CLOSE_PATH, 1))
+    return geom
+
+
+# -------------------------
+# Public API
+# -------------------------
+def encode_layer(name, features, z, x, y, extent=EXTENT):
+    """
+    Encode one layer. Each feature is a dict with
+      id: int, type: POINT | POLYGON,
+      geometry: (lon, lat) for points or a [(lon, lat), ...] ring for polygons,
+      properties: {str: scalar}
+    """
+    keys, key_index = [], {}
+    values, value_index = [], {}
+    encoded_features = []
+
+    for feat in features:
+        if feat["type"] == POINT:
+            geom = _encode_point(feat["geometry"], z, x, y, extent)
+        else:
+            geom = _encode_ring(feat["geometry"], z, x, y, extent)
+        if not geom:
+            continue
+
+        tags = []
+        for k, v in feat.get("properties", {}).items():
+            if v is None:
+                continue
+            if k not in key_index:
+                key_index[k] = len(keys)
+                keys.append(k)
+            vkey = (type(v).__name__, v)
+            if vkey not in value_index:
+                value_index[vkey] = len(values)
+                values.append(v)
+            tags.extend((key_index[k], value_index[vkey]))
+
+        body = b""
+        if feat.get("id") is not None:
+            body += _key(1, 0) + _varint(int(feat["id"]))
+        if tags:
+            body += _packed(2, tags)
+        body += _key(3, 0) + _varint(feat["type"])
+        body += _packed(4, geom)
+        encoded_features.append(_len_field(2, body))
+
+    layer = _key(15, 0) + _varint(2)
+    layer += _len_field(1, name.encode("utf-8"))
+    layer += b"".join(encoded_features)
+    layer += b"".join(_len_field(3, k.encode("utf-8")) for k in keys)
+    layer += b"".join(_len_field(4, _encode_value(v)) for v in values)
+    layer += _key(5, 0) + _varint(extent)
+    return layer
+
+
+def encode_tile(layers, z, x, y, extent=EXTENT) -> bytes:
+    """layers: {layer_name: [feature, ...]} -> MVT bytes."""
+    return b"".join(
+        _len_field(3, encode_layer(name, feats, z, x, y, extent))
+        for name, feats in layers.items()
+        if feats
+    )
@@ -1,27 +1,227 @@
-from PIL import Image
+from PIL import Image, ImageOps
+import numpy as np
 import pytesseract
 import io
+import multiprocessing
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+try:
+    from pdf2image import convert_from_bytes, pdfinfo_from_bytes
+except ImportError:  # optional: PDF input (needs poppler)
+    convert_from_bytes = pdfinfo_from_bytes = None
 
-# ✅ Explicitly tell pytesseract where Tesseract is installed (Windows fix)
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
+# -------------------------
+# Tesseract binary
+# -------------------------
+WINDOWS_TESSERACT = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
-def extract_text_from_file(file_bytes: bytes) -> str:
+
+def find_tesseract():
+    """TESSERACT_CMD, else tesseract on PATH, else the default Windows install."""
+    for candidate in (os.getenv("TESSERACT_CMD"), shutil.which("tesseract"), WINDOWS_TESSERACT):
+        if candidate and (os.path.isfile(candidate) or shutil.which(candidate)):
+            return candidate
+    return None
+
+
+TESSERACT_CMD = find_tesseract()
+if TESSERACT_CMD:
+    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+else:
+    print("⚠️ Tesseract not found; install it or set TESSERACT_CMD")
+
+
+# -------------------------
+# OCR config
+# -------------------------
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+OCR_TESSERACT_CONFIG = os.getenv("OCR_TESSERACT_CONFIG", "")
+OCR_TARGET_DPI = int(os.getenv("OCR_TARGET_DPI", "300"))   # Tesseract is most accurate around 300 DPI
+OCR_MAX_UPSCALE = 2.0
+OCR_BINARIZE = os.getenv("OCR_BINARIZE", "1") == "1"
+OCR_CROP = os.getenv("OCR_CROP", "1") == "1"
+OCR_CROP_MARGIN = 0.02            # of the page's shorter side, kept around the text
+PAGE_SHORT_SIDE_INCHES = 8.27     # A4 / letter-ish forms, for scans without DPI metadata
+
+# Batch OCR runs in worker processes, one per core by default
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+
+# -------------------------
+# Pages
+# -------------------------
+def _is_pdf(file_bytes: bytes) -> bool:
+    return file_bytes[:5] == b"%PDF-"
+
+
+def page_count(file_bytes: bytes) -> int:
+    if _is_pdf(file_bytes):
+        if pdfinfo_from_bytes is None:
+            raise RuntimeError("PDF input needs pdf2image (and poppler) installed")
+        return int(pdfinfo_from_bytes(file_bytes)["Pages"])
+    return getattr(Image.open(io.BytesIO(file_bytes)), "n_frames", 1)
+
+
+def load_page(file_bytes: bytes, index: int) -> Image.Image:
+    """One page of a PDF / multi-frame TIFF, or the image itself."""
+    if _is_pdf(file_bytes):
+        if convert_from_bytes is None:
+            raise RuntimeError("PDF input needs pdf2image (and poppler) installed")
+        page = convert_from_bytes(
+            file_bytes, dpi=OCR_TARGET_DPI, first_page=index + 1, last_page=index + 1, grayscale=True
+        )[0]
+        page.info["dpi"] = (OCR_TARGET_DPI, OCR_TARGET_DPI)
+        return page
+
+    image = Image.open(io.BytesIO(file_bytes))
+    if index:
+        image.seek(index)
+    return image
+
+
+# -------------------------
+# Preprocessing
+# -------------------------
+def _source_dpi(image: Image.Image) -> float:
+    short_side = min(image.size)
+    dpi = image.info.get("dpi")
+    if dpi and dpi[0] > 1:
+        # trust the metadata only if it gives a plausible page size
+        if 3 <= short_side / float(dpi[0]) <= 17:
+            return float(dpi[0])
+    return short_side / PAGE_SHORT_SIDE_INCHES
+
+
+def _otsu_threshold(gray: np.ndarray) -> int:
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight_bg = np.cumsum(hist)
+    weight_fg = weight_bg[-1] - weight_bg
+    sum_bg = np.cumsum(hist * levels)
+    mean_bg = sum_bg / np.maximum(weight_bg, 1)
+    mean_fg = (sum_bg[-1] - sum_bg) / np.maximum(weight_fg, 1)
+    between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    return int(np.argmax(between))
+
+
+def _text_bounds(ink: np.ndarray):
+    """(top, bottom, left, right) of the text-like ink, or None."""
+    # solid scan borders / ruling lines are not text
+    ink = ink.copy()
+    ink[:, ink.mean(axis=0) > 0.6] = False
+    ink[ink.mean(axis=1) > 0.6, :] = False
+
+    rows = np.flatnonzero(ink.mean(axis=1) > 0.002)     # ignore specks
+    if not len(rows):
+        return None
+    top, bottom = rows[0], rows[-1] + 1
+    cols = np.flatnonzero(ink[top:bottom].mean(axis=0) > 0.002)
+    if not len(cols):
+        return None
+    return top, bottom, cols[0], cols[-1] + 1
+
+
+def preprocess_page(image: Image.Image) -> Image.Image:
+    """Grayscale, rescale to OCR_TARGET_DPI, binarize and crop to the text."""
+    image = ImageOps.exif_transpose(image).convert("L")
+
+    scale = min(OCR_TARGET_DPI / _source_dpi(image), OCR_MAX_UPSCALE)
+    if abs(scale - 1) > 0.05:
+        image = image.resize(
+            (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+            Image.LANCZOS,
+        )
+
+    pixels = np.asarray(image)
+    if OCR_BINARIZE:
+        pixels = np.where(pixels > _otsu_threshold(pixels), 255, 0).astype(np.uint8)
+
+    if OCR_CROP:
+        bounds = _text_bounds(pixels < 128)
+        if bounds:
+            top, bottom, left, right = bounds
+            margin = int(min(pixels.shape) * OCR_CROP_MARGIN)
+            pixels = pixels[
+                max(0, top - margin):bottom + margin,
+                max(0, left - margin):right + margin,
+            ]
+
+    page = Image.fromarray(pixels)
+    page.info["dpi"] = (OCR_TARGET_DPI, OCR_TARGET_DPI)
+    return page
+
+
+# -------------------------
+# OCR
+# -------------------------
+def ocr_pages(file_bytes: bytes, indexes, preprocess: bool = True) -> list:
+    """Text of the given pages, OCR'd one after another in this process."""
+    texts = []
+    for index in indexes:
+        page = load_page(file_bytes, index)
+        page = preprocess_page(page) if preprocess else page
+        config = f"--dpi {OCR_TARGET_DPI} {OCR_TESSERACT_CONFIG}" if preprocess else OCR_TESSERACT_CONFIG
+        texts.append(pytesseract.image_to_string(page, lang=OCR_LANG, config=config.strip()).strip())
+    return texts
+
+
+def _join_pages(texts) -> str:
+    return "\n\n".join(t for t in texts if t)
+
+
+def extract_text_from_file(file_bytes: bytes, preprocess: bool = True) -> str:
     """
-    Extract text from an uploaded image file (bytes) using Tesseract OCR.
-    Supports PNG, JPG, JPEG, etc.
+    Extract text from an uploaded image / multi-page TIFF / PDF (bytes)
+    using Tesseract OCR, every page in this process. Used inside OCR
+    worker processes; see ocr_document() for page-parallel OCR.
     """
     try:
-        # Open the uploaded file as an image
-        image = Image.open(io.BytesIO(file_bytes))
-
-        # Perform OCR with English language
-        text = pytesseract.image_to_string(image, lang="eng")
+        return _join_pages(ocr_pages(file_bytes, range(page_count(file_bytes)), preprocess))
+    except Exception as e:
+        # Return clean error message if OCR fails
+        raise RuntimeError(f"OCR extraction failed: {str(e)}")
 
-        return text.strip()
 
+def ocr_document(file_bytes: bytes) -> str:
+    """
+    extract_text_from_file() with pages split across the OCR process pool:
+    one contiguous run of pages per worker.
+    """
+    try:
+        n = page_count(file_bytes)
+        workers = max(1, min(OCR_WORKERS, n))
+        runs = [range(n * w // workers, n * (w + 1) // workers) for w in range(workers)]
+        pool = get_ocr_pool()
+        futures = [pool.submit(ocr_pages, file_bytes, run) for run in runs]
+        return _join_pages(text for future in futures for text in future.result())
     except Exception as e:
-        # Return clean error message if OCR fails
         raise RuntimeError(f"OCR extraction failed: {str(e)}")
+
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    """Shared OCR process pool, started on first use."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            # spawn: forking the threaded server process is not safe
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _ocr_pool
+
+
+def shutdown_ocr_pool():
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is not None:
+            _ocr_pool.shutdown(wait=False, cancel_futures=True)
+            _ocr_pool = None
@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+
+from db import engine
+
+
+# -------------------------
+# Paging config
+# -------------------------
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 1000  # rows pulled per round trip from a server-side cursor
+
+
+# -------------------------
+# Opaque keyset cursors
+# -------------------------
+def encode_cursor(*values) -> str:
+    """Encode the sort key of the last row of a page."""
+    payload = json.dumps(list(values), default=_json_default)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor into its sort-key values; raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("invalid cursor")
+    return values
+
+
+def split_page(rows, limit: int, key):
+    """
+    rows were fetched with LIMIT limit + 1. Returns (page, next_cursor);
+    next_cursor is None on the last page.
+    """
+    page = rows[:limit]
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*key(page[-1]))
+
+
+# -------------------------
+# NDJSON streaming
+# -------------------------
+def _json_default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+
+def ndjson_line(row) -> bytes:
+    return (json.dumps(dict(row), default=_json_default) + "\n").encode("utf-8")
+
+
+def stream_query(query, params=None, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Yield NDJSON lines for a query, reading from a server-side cursor
+    chunk_size rows at a time so memory stays bounded by one chunk.
+    """
+    if isinstance(query, str):
+        query = text(query)
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=chunk_size
+        ).execute(query, params or {})
+        for row in result.mappings():
+            yield ndjson_line(row)
+
+
+def ndjson_response(lines) -> StreamingResponse:
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -0,0 +1,94 @@
+import re
+
+
+# -------------------------
+# Unit tables
+# -------------------------
+SQ_M_PER_ACRE = 4046.8564224
+SQ_FT_PER_ACRE = 43560
+
+# unit spelling -> acres per unit. A number with no unit is acres (uploads
+# store areas as "<n> acres"); a unit that is not listed gives no area at all.
+# Regional units use their common official sizes (bigha differs by state).
+UNIT_TO_ACRE = {
+    "acre": 1.0, "acres": 1.0, "ac": 1.0,
+    "hectare": 2.47105, "hectares": 2.47105, "ha": 2.47105,
+    "sq km": 247.105, "square kilometre": 247.105, "square kilometer": 247.105, "km2": 247.105,
+    "sq m": 1 / SQ_M_PER_ACRE, "sqm": 1 / SQ_M_PER_ACRE, "m2": 1 / SQ_M_PER_ACRE, "m²": 1 / SQ_M_PER_ACRE,
+    "sq mt": 1 / SQ_M_PER_ACRE, "sq mtr": 1 / SQ_M_PER_ACRE, "sq meter": 1 / SQ_M_PER_ACRE, "sq metre": 1 / SQ_M_PER_ACRE,
+    "square meter": 1 / SQ_M_PER_ACRE, "square metre": 1 / SQ_M_PER_ACRE,
+    "sq ft": 1 / SQ_FT_PER_ACRE, "sqft": 1 / SQ_FT_PER_ACRE, "sft": 1 / SQ_FT_PER_ACRE, "sq feet": 1 / SQ_FT_PER_ACRE,
+    "square feet": 1 / SQ_FT_PER_ACRE, "square foot": 1 / SQ_FT_PER_ACRE,
+    "sq yd": 1 / 4840, "sqyd": 1 / 4840, "sq yard": 1 / 4840, "square yard": 1 / 4840, "gaj": 1 / 4840,
+    "are": 0.0247105, "ares": 0.0247105,
+    "cent": 0.01, "decimal": 0.01, "dismil": 0.01,
+    "guntha": 0.025, "gunta": 0.025,
+    "kanal": 0.125, "marla": 1 / 160,
+    "bigha": 0.619,
+}
+# longest spelling first, so "square meters" wins over "sq m" and "ha" never eats "hectare";
+# a spelling also matches its plural / abbreviation tail ("cents", "sq yds", "decimals")
+_UNITS_BY_LENGTH = sorted(UNIT_TO_ACRE, key=len, reverse=True)
+
+_NUMBER = re.compile(r"(\d+(?:\.\d*)?|\.\d+)")
+_DIGITS = re.compile(r"\d+")
+
+
+# -------------------------
+# Parsing
+# -------------------------
+def _unit_factor(unit_text: str):
+    """Acres per unit for the text after the number; None for an unknown unit."""
+    unit = " ".join(unit_text.replace(".", " ").split()).lower().lstrip("([")
+    if not unit or not (unit[0].isalpha() or unit[0] == "²"):
+        return 1.0      # no unit word
+    for spelling in _UNITS_BY_LENGTH:
+        if unit.startswith(spelling) and _ends_word(unit, spelling):
+            return UNIT_TO_ACRE[spelling]
+    return None
+
+
+def _ends_word(unit: str, spelling: str) -> bool:
+    # "ha" must not match "hand", but "acres" / "cents" / "sq yds" still match
+    rest = unit[len(spelling):]
+    return not rest or not rest[0].isalpha() or rest[0] == "s" and not rest[1:2].isalpha()
+
+
+def parse_area_to_acres(area_text):
+    """
+    '1.5 acres', '0.5 ha', '4000 sq m', '12 cents', '12' ... -> acres, or
+    None if there is no number or the unit is not one we know.
+    """
+    if area_text is None:
+        return None
+    s = re.sub(r"(?<=\d),(?=\d)", "", str(area_text))
+    m = _NUMBER.search(s)
+    if not m:
+        return None
+    factor = _unit_factor(s[m.end():])
+    return float(m.group(1)) * factor if factor is not None else None
+
+
+def parse_area_to_m2(area_text):
+    acres = parse_area_to_acres(area_text)
+    return acres * SQ_M_PER_ACRE if acres is not None else None
+
+
+def format_acres(acres: float) -> str:
+    return f"{acres:.2f} acres"
+
+
+def parse_age(age):
+    """First whole number in an age value ('52', 52, '52 yrs'), or None."""
+    if age is None:
+        return None
+    m = _DIGITS.search(str(age))
+    return int(m.group(0)) if m else None
+
+
+def unit_columns(age, total_area_claimed) -> dict:
+    """age_years / area_acres column values for the raw text fields."""
+    return {
+        "age_years": parse_age(age),
+        "area_acres": parse_area_to_acres(total_area_claimed),
+    }